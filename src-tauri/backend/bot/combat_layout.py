@@ -0,0 +1,209 @@
+from typing import Dict, Optional, Tuple
+
+import numpy
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+from utils.image_utils import ImageUtils
+from bot.window import Window
+
+
+class CombatLayoutException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class CombatLayout:
+    """
+    Computes the location of every hotspot on the Combat screen like the Characters, their Skills and targets and the Summons from a few anchors that are located once per
+    battle, instead of matching the "Attack" button again for every click.
+
+    An anchor is only located again when the frame drifted away from it, which is checked by comparing a small patch of the frame at the anchor with the patch that was saved
+    when the anchor was located.
+    """
+
+    # The hotspots of each layout for the second and the first notch. A hotspot is (anchor, x, y, x_inc, y_inc, columns) and its n-th entry starting from 0 is at the anchor
+    # plus (x + x_inc * (n % columns), y + y_inc * (n // columns)). The "window" anchor is the top-left corner of the calibrated window.
+    _layouts: Dict[str, Dict[bool, Dict[str, Tuple[str, int, int, int, int, int]]]] = {
+        # Combat Mode.
+        "combat": {
+            False: {
+                "character": ("attack", -320, 123, 80, 0, 4),
+                "skill": ("attack", -220, 170, 85, 0, 4),
+                "target": ("attack", -225, -55, 95, 140, 3),
+                "enemy": ("attack", -270, -285, 160, 0, 3),
+                "summon": ("attack", -320, 140, 75, 0, 6),
+            },
+            True: {
+                "character": ("attack", -215, 123, 55, 0, 4),
+                "skill": ("attack", -145, 115, 55, 0, 4),
+                "target": ("attack", -150, -35, 60, 220, 3),
+                "enemy": ("attack", -175, -190, 100, 0, 3),
+                "summon": ("attack", -215, 90, 50, 0, 6),
+            },
+        },
+        # Combat Mode V2 where the matches are the top-left corner instead of the center.
+        "v2": {
+            False: {
+                "character": ("attack", -282, 92, 80, 0, 4),
+                "skill": ("window", 138, 546, 84, 0, 4),
+                "target": ("window", 115, 251, 93, 164, 3),
+                "summon": ("window", 15, 468, 77, 0, 6),
+            },
+            True: {
+                "character": ("attack", -217, 92, 55, 0, 4),
+                "skill": ("window", 145, 115, 55, 0, 4),
+                "target": ("window", 115, 251, 93, 164, 3),
+                "summon": ("window", 15, 468, 77, 0, 6),
+            },
+        },
+    }
+
+    # Half of the width and height of the patch that is saved around each anchor.
+    _patch_size: Tuple[int, int] = (16, 8)
+
+    # The frame drifted if the mean gray level difference of the patch is above this or a newly matched anchor moved by more than this many pixels.
+    _drift_threshold: float = 20.0
+    _drift_pixels: int = 3
+
+    _anchors: Dict[str, Tuple[int, int]] = {}
+    _patches: Dict[str, Optional[numpy.ndarray]] = {}
+
+    # Number of times that an anchor was located for the statistics.
+    locate_count: int = 0
+
+    @staticmethod
+    def reset():
+        """Forget the anchors before a new battle.
+
+        Returns:
+            None
+        """
+        CombatLayout._anchors = {}
+        CombatLayout._patches = {}
+        return None
+
+    @staticmethod
+    def _grab_patch(location: Tuple[int, int]) -> Optional[numpy.ndarray]:
+        """Cut out the patch of the current frame around the location.
+
+        Args:
+            location (Tuple[int, int]): The location on the screen.
+
+        Returns:
+            (numpy.ndarray): The patch or None if the patch does not fit inside the frame.
+        """
+        # Without a calibrated window region like in Combat Mode V2, the frame is the whole screen and the location is already inside it.
+        region = ImageUtils._get_window_region()
+        left, top = (region[0], region[1]) if region is not None else (0, 0)
+
+        frame = ImageUtils._capture()
+        half_width, half_height = CombatLayout._patch_size
+        x = location[0] - left
+        y = location[1] - top
+        if x - half_width < 0 or y - half_height < 0 or x + half_width > frame.shape[1] or y + half_height > frame.shape[0]:
+            return None
+
+        return frame[y - half_height:y + half_height, x - half_width:x + half_width].copy()
+
+    @staticmethod
+    def set_anchor(name: str, location: Tuple[int, int]):
+        """Save the location of the anchor that was just found on the screen.
+
+        Args:
+            name (str): Name of the button image file of the anchor.
+            location (Tuple[int, int]): The location of the anchor on the screen.
+
+        Returns:
+            None
+        """
+        CombatLayout._anchors[name] = location
+        CombatLayout._patches[name] = CombatLayout._grab_patch(location)
+        return None
+
+    @staticmethod
+    def observe(name: str, location: Tuple[int, int]):
+        """Move the anchor if it was matched again somewhere else as part of another check, which keeps the layout in place for free.
+
+        Args:
+            name (str): Name of the button image file of the anchor.
+            location (Tuple[int, int]): The location where the anchor was matched.
+
+        Returns:
+            None
+        """
+        anchor = CombatLayout._anchors.get(name)
+        if anchor is not None and max(abs(anchor[0] - location[0]), abs(anchor[1] - location[1])) > CombatLayout._drift_pixels:
+            if Settings.debug_mode:
+                MessageLog.print_message(f"[DEBUG] Combat layout anchor {name.upper()} moved from {anchor} to {location}.")
+            CombatLayout.set_anchor(name, location)
+
+        return None
+
+    @staticmethod
+    def _has_drifted(name: str) -> bool:
+        """Check if the frame at the anchor no longer looks like it did when the anchor was located.
+
+        Args:
+            name (str): Name of the button image file of the anchor.
+
+        Returns:
+            (bool): True if the anchor needs to be located again.
+        """
+        saved = CombatLayout._patches.get(name)
+        if saved is None:
+            return False
+
+        patch = CombatLayout._grab_patch(CombatLayout._anchors[name])
+        if patch is None:
+            return True
+
+        return numpy.mean(numpy.abs(patch.astype(numpy.int16) - saved.astype(numpy.int16))) > CombatLayout._drift_threshold
+
+    @staticmethod
+    def anchor(name: str, verify: bool = False) -> Optional[Tuple[int, int]]:
+        """Get the location of the anchor, locating it only if it is not known yet or the frame drifted away from it.
+
+        Args:
+            name (str): Name of the button image file of the anchor or "window" for the top-left corner of the calibrated window.
+            verify (bool, optional): Check that the frame did not drift first. Only use this when the anchor is expected to be on the screen. Defaults to False.
+
+        Returns:
+            (Tuple[int, int]): The location on the screen or None if the anchor could not be found.
+        """
+        if name == "window":
+            return Window.start, Window.top
+
+        if name not in CombatLayout._anchors or (verify and CombatLayout._has_drifted(name)):
+            if Settings.debug_mode:
+                MessageLog.print_message(f"[DEBUG] Locating the combat layout anchor {name.upper()}.")
+
+            location = ImageUtils.find_button(name, tries = 50, bypass_general_adjustment = True)
+            CombatLayout.locate_count += 1
+            if location is None:
+                CombatLayout._anchors.pop(name, None)
+                return None
+            CombatLayout.set_anchor(name, location)
+
+        return CombatLayout._anchors[name]
+
+    @staticmethod
+    def hotspot(kind: str, number: int, layout: str = "combat", verify: bool = False) -> Tuple[int, int]:
+        """Get the location on the screen of the hotspot.
+
+        Args:
+            kind (str): The kind of hotspot like "character", "skill", "target", "enemy" or "summon".
+            number (int): Which one of them starting from 1.
+            layout (str, optional): The layout of the Combat screen which is "combat" for Combat Mode or "v2" for Combat Mode V2. Defaults to "combat".
+            verify (bool, optional): Check that the frame did not drift from the anchor first. Defaults to False.
+
+        Returns:
+            (Tuple[int, int]): The location on the screen.
+        """
+        anchor_name, x, y, x_inc, y_inc, columns = CombatLayout._layouts[layout][Settings.use_first_notch][kind]
+        anchor = CombatLayout.anchor(anchor_name, verify = verify)
+        if anchor is None:
+            raise CombatLayoutException(f"Unable to locate the {anchor_name} button to find {kind} #{number} on the Combat screen.")
+
+        index = number - 1
+        return anchor[0] + x + x_inc * (index % columns), anchor[1] + y + y_inc * (index // columns)
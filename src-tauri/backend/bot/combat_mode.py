@@ -1,12 +1,14 @@
-import copy
 import os
-from typing import List
+from typing import List, Optional, Tuple
 import time
 
 from utils.settings import Settings
 from utils.message_log import MessageLog
 from utils.image_utils import ImageUtils
 from utils.mouse_utils import MouseUtils
+from utils.script_cache import ScriptCache
+from bot.combat_state import CombatState, CombatStateMachine
+from bot.combat_layout import CombatLayout
 
 
 class CombatModeException(Exception):
@@ -28,7 +30,6 @@ class CombatMode:
     # Save some variables for use throughout the class.
     _semi_auto = False
     _full_auto = False
-    _attack_button_location = None
     _retreat_check = False
     _start_time: float = None
     _list_of_exit_events_for_false = ["Time Exceeded", "No Loot"]
@@ -36,6 +37,13 @@ class CombatMode:
     _command_turn_number = 1
     _turn_number = 1  # Current turn for the script execution.
 
+    # The most seconds to wait for a clicked attack to go through, for Full/Semi Auto to attack on its own, for the "Next" button to go away after clicking it and for a
+    # dialog popup to go away after clicking it.
+    _attack_timeout: float = 10.0
+    _auto_attack_timeout: float = 60.0
+    _next_timeout: float = 2.5
+    _dialog_timeout: int = 3
+
     ######################################################################
     ######################################################################
     # Checks
@@ -108,10 +116,43 @@ class CombatMode:
             dialog_location = ImageUtils.find_button("dialog_vyrn", tries = 1, suppress_error = True, bypass_general_adjustment = True)
 
         if dialog_location is not None:
-            if Settings.use_first_notch is False:
-                MouseUtils.move_and_click_point(dialog_location[0] + 180, dialog_location[1] - 50, "template_dialog")
-            else:
-                MouseUtils.move_and_click_point(dialog_location[0] + 130, dialog_location[1] - 40, "template_dialog")
+            CombatMode._close_dialog(dialog_location)
+
+        return None
+
+    @staticmethod
+    def _close_dialog(dialog_location: Tuple[int, int]):
+        """Click away the dialog popup from either Lyria or Vyrn.
+
+        Args:
+            dialog_location (Tuple[int, int]): The location of the dialog on the screen.
+
+        Returns:
+            None
+        """
+        if Settings.use_first_notch is False:
+            MouseUtils.move_and_click_point(dialog_location[0] + 180, dialog_location[1] - 50, "template_dialog")
+        else:
+            MouseUtils.move_and_click_point(dialog_location[0] + 130, dialog_location[1] - 40, "template_dialog")
+
+        return None
+
+    @staticmethod
+    def _close_dialog_on_frame(state: str):
+        """Click away the dialog popup if the last classified frame showed one while waiting on the combat state and wait for it to vanish before the next frame.
+
+        Args:
+            state (str): The state of the frame.
+
+        Returns:
+            None
+        """
+        for dialog_name in ["dialog_lyria", "dialog_vyrn"]:
+            dialog_location = CombatStateMachine.locations.get(f"buttons/{dialog_name}")
+            if dialog_location is not None:
+                CombatMode._close_dialog(dialog_location)
+                ImageUtils.wait_vanish(dialog_name, timeout = CombatMode._dialog_timeout, suppress_error = True)
+                break
 
         return None
 
@@ -132,14 +173,20 @@ class CombatMode:
             MessageLog.print_message("######################################################################")
             MessageLog.print_message("######################################################################")
             raise CombatModeException("Time Exceeded")
-        elif CombatMode._retreat_check or ImageUtils.confirm_location("no_loot", tries = 1, suppress_error = True, bypass_general_adjustment = True):
+
+        # Classify the current frame which scores every end-of-battle screen against a single screenshot.
+        screen = None
+        if CombatMode._retreat_check is False and CombatStateMachine.update(exp_header) == CombatState.BATTLE_END:
+            screen = CombatStateMachine.end_screen
+
+        if CombatMode._retreat_check or screen == "no_loot":
             MessageLog.print_message("\n######################################################################")
             MessageLog.print_message("######################################################################")
             MessageLog.print_message("[COMBAT] Combat Mode has ended with no loot.")
             MessageLog.print_message("######################################################################")
             MessageLog.print_message("######################################################################")
             raise CombatModeException("No Loot")
-        elif ImageUtils.confirm_location("battle_concluded", tries = 1, suppress_error = True, bypass_general_adjustment = True):
+        elif screen == "battle_concluded":
             MessageLog.print_message("\n[COMBAT] Battle concluded suddenly.")
             MessageLog.print_message("\n######################################################################")
             MessageLog.print_message("######################################################################")
@@ -148,21 +195,21 @@ class CombatMode:
             MessageLog.print_message("######################################################################")
             Game.find_and_click_button("reload")
             raise CombatModeException("Battle Concluded")
-        elif ImageUtils.confirm_location("exp_gained", tries = 1, suppress_error = True, bypass_general_adjustment = True):
+        elif screen == "exp_gained":
             MessageLog.print_message("\n######################################################################")
             MessageLog.print_message("######################################################################")
             MessageLog.print_message("[COMBAT] Ending Combat Mode.")
             MessageLog.print_message("######################################################################")
             MessageLog.print_message("######################################################################")
             raise CombatModeException("Exp Gained")
-        elif ImageUtils.confirm_location("loot_collected", tries = 1, suppress_error = True, bypass_general_adjustment = True):
+        elif screen == "loot_collected":
             MessageLog.print_message("\n######################################################################")
             MessageLog.print_message("######################################################################")
             MessageLog.print_message("[COMBAT] Ending Combat Mode.")
             MessageLog.print_message("######################################################################")
             MessageLog.print_message("######################################################################")
             raise CombatModeException("Loot Collected")
-        elif exp_header and ImageUtils.confirm_location(exp_header, tries = 1, suppress_error = True, bypass_general_adjustment = True):
+        elif exp_header and screen == exp_header:
             MessageLog.print_message("\n######################################################################")
             MessageLog.print_message("######################################################################")
             MessageLog.print_message("[COMBAT] Ending Combat Mode.")
@@ -212,26 +259,8 @@ class CombatMode:
         Returns:
             None
         """
-        if Settings.use_first_notch is False:
-            x_offset = 320
-            x_inc = 80
-        else:
-            x_offset = 215
-            x_inc = 55
-
-        if character_number == 1:
-            x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 0)
-        elif character_number == 2:
-            x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 1)
-        elif character_number == 3:
-            x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 2)
-        elif character_number == 4:
-            x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 3)
-        else:
-            MessageLog.print_message(f"[WARNING] Invalid command received for selecting a Character. User wanted to select Character #{character_number}.")
-            return
-
-        y = CombatMode._attack_button_location[1] + 123
+        # The Attack button is showing before a Character is selected so this is where the layout is checked for drift.
+        x, y = CombatLayout.hotspot("character", character_number, verify = True)
 
         # Double-clicking the character portrait to avoid any non-invasive popups from other Raid participants.
         MouseUtils.move_and_click_point(x, y, "template_character", mouse_clicks=2 if Settings.farming_mode == "Raid" else 1)
@@ -260,6 +289,22 @@ class CombatMode:
 
         return False
 
+    @staticmethod
+    def _click_next() -> bool:
+        """Click the "Next" button if the Turn ended on it and move on as soon as it is gone instead of sleeping through the transition.
+
+        Returns:
+            (bool): True if the "Next" button was clicked.
+        """
+        if CombatStateMachine.update() != CombatState.TURN_END:
+            return False
+
+        next_location = CombatStateMachine.locations["buttons/next"]
+        MouseUtils.move_and_click_point(next_location[0], next_location[1], "next")
+        CombatStateMachine.wait_while((CombatState.TURN_END,), CombatMode._next_timeout)
+
+        return True
+
     @staticmethod
     def _process_incorrect_turn():
         """Processes the current turn manually in order to get the bot to the expected turn number.
@@ -276,15 +321,11 @@ class CombatMode:
         MessageLog.print_message(f"[COMBAT] Ending Turn {CombatMode._turn_number}...")
         if CombatMode._full_auto is False and CombatMode._semi_auto is False:
             Game.find_and_click_button("attack", tries = 30)
-            while ImageUtils.find_button("cancel", suppress_error = True) is not None:
-                if Settings.debug_mode:
-                    MessageLog.print_message("[DEBUG] While waiting for the incorrect turn to process, the \"Cancel\" button has not vanished from the screen yet.")
-                Game.wait(1.0)
+            if not CombatStateMachine.wait_for_attack(CombatMode._attack_timeout) and Settings.debug_mode:
+                MessageLog.print_message("[DEBUG] While waiting for the incorrect turn to process, the \"Cancel\" button has not vanished from the screen yet.")
         else:
-            while ImageUtils.find_button("attack", suppress_error = True) is not None:
-                if Settings.debug_mode:
-                    MessageLog.print_message("[DEBUG] While waiting for the incorrect turn to process, the \"Attack\" button has not vanished from the screen yet.")
-                Game.wait(1.0)
+            if CombatStateMachine.wait_while((CombatState.AWAIT_INPUT,), CombatMode._auto_attack_timeout) == CombatState.AWAIT_INPUT and Settings.debug_mode:
+                MessageLog.print_message("[DEBUG] While waiting for the incorrect turn to process, the \"Attack\" button has not vanished from the screen yet.")
 
         reload_check = False
 
@@ -302,8 +343,6 @@ class CombatMode:
             CombatMode._full_auto = False
             CombatMode._semi_auto = False
 
-        Game.wait(1.0)
-
         # If the bot reloaded the page, determine if bot needs to enable Full/Semi Auto again.
         if reload_check is False:
             reload_check = CombatMode._reload_for_attack()
@@ -314,8 +353,7 @@ class CombatMode:
 
         MessageLog.print_message(f"[COMBAT] Turn {CombatMode._turn_number} has ended.")
 
-        if Game.find_and_click_button("next", tries = 3, suppress_error = True):
-            Game.wait(2.5)
+        CombatMode._click_next()
 
         CombatMode._turn_number += 1
 
@@ -325,30 +363,32 @@ class CombatMode:
 
     @staticmethod
     def _wait_for_attack() -> bool:
-        """Wait for several tries until the bot sees either the Attack or the Next button before starting a new turn.
+        """Wait until the combat state shows the Attack button before starting a new turn. Dialogs and the Next button are clicked away as they show up.
 
         Returns:
             (bool): True if Attack ended into the next Turn. False if Attack ended but combat also ended as well.
         """
         MessageLog.print_message("[COMBAT] Now waiting for attack to end...")
-        if ImageUtils.wait_appear("attack", timeout=5, suppress_error=True):
-            return True
 
+        # The adjustment is the most seconds to wait.
         if Settings.enable_combat_mode_adjustment:
-            tries = Settings.adjust_waiting_for_attack
+            timeout = Settings.adjust_waiting_for_attack
         else:
-            tries = 100
-
-        while tries > 0 and not CombatMode._retreat_check and ImageUtils.find_button("attack", suppress_error = True) is None and \
-                ImageUtils.find_button("next", tries = 1, suppress_error = True) is None:
-            CombatMode._check_for_dialog()
-
-            # Check if the Party wiped after attacking.
-            CombatMode._check_for_wipe()
+            timeout = 100
 
-            CombatMode._check_for_battle_end()
-
-            tries -= 1
+        deadline = time.perf_counter() + timeout
+        while not CombatMode._retreat_check:
+            state = CombatStateMachine.wait_while((CombatState.ANIMATING,), max(0.0, deadline - time.perf_counter()), on_frame = CombatMode._close_dialog_on_frame)
+            if state == CombatState.WIPED:
+                # Check if the Party wiped after attacking.
+                CombatMode._check_for_wipe()
+                break
+            elif state == CombatState.BATTLE_END:
+                CombatMode._check_for_battle_end()
+            elif state == CombatState.TURN_END and time.perf_counter() < deadline:
+                CombatMode._click_next()
+            else:
+                break
 
         MessageLog.print_message("[COMBAT] Attack ended.")
 
@@ -396,11 +436,11 @@ class CombatMode:
     ######################################################################
 
     @staticmethod
-    def _start_turn(command: str):
+    def _start_turn(turn_number: int):
         """Start the Turn based on the read command and move the internal Turn count forward to match the command.
 
         Args:
-            command (str): The command to execute.
+            turn_number (int): The Turn number of the command.
 
         Returns:
             None
@@ -409,8 +449,7 @@ class CombatMode:
         # Clear any detected dialog popups that might obstruct the "Attack" button.
         # CombatMode._check_for_dialog()
 
-        # Parse the Turn's number.
-        CombatMode._command_turn_number = int(command.split(":")[0].split(" ")[1])
+        CombatMode._command_turn_number = turn_number
 
         # If the command is a "Turn #:" and it is currently not the correct Turn, attack until the Turn numbers match.
         if CombatMode._retreat_check is False and CombatMode._turn_number != CombatMode._command_turn_number:
@@ -435,52 +474,36 @@ class CombatMode:
         MessageLog.print_message(f"[COMBAT] Ending Turn {CombatMode._turn_number}...")
 
         if CombatMode._full_auto or CombatMode._semi_auto:
-            while ImageUtils.find_button("attack") is not None:
-                Game.wait(0.25)
+            CombatStateMachine.wait_while((CombatState.AWAIT_INPUT,), CombatMode._auto_attack_timeout)
         else:
             Game.find_and_click_button("attack", tries = 10)
 
             # Wait until the "Cancel" button vanishes from the screen.
-            if ImageUtils.find_button("combat_cancel", tries = 10) is not None:
-                while ImageUtils.wait_vanish("combat_cancel", timeout = 5, suppress_error = True) is False:
-                    if Settings.debug_mode:
-                        MessageLog.print_message("[DEBUG] The \"Cancel\" button has not vanished from the screen yet.")
-                    Game.wait(1.0)
+            if not CombatStateMachine.wait_for_attack(CombatMode._attack_timeout) and Settings.debug_mode:
+                MessageLog.print_message("[DEBUG] The \"Cancel\" button has not vanished from the screen yet.")
 
         # Check for exit conditions.
         CombatMode._check_for_battle_end()
 
-        if Game.find_and_click_button("next", tries = 3, suppress_error = True):
-            Game.wait(2.5)
+        CombatMode._click_next()
 
         return None
 
     @staticmethod
-    def _wait_execute(command_list: List[str], fallback_delay: float = 1.0):
+    def _wait(wait_seconds: float):
         """Execute a wait command.
 
         Args:
-            command_list (List[str]): A split list of the command by its "." delimiter with the "wait" command being the first element.
-            fallback_delay (float): A default delay if the wait command was invalid. Defaults to 1.0 second.
+            wait_seconds (float): Number of seconds to wait.
 
         Returns:
             None
         """
         from bot.game import Game
 
-        # Isolate the seconds inside the command.
-        if command_list[0].__contains__(")"):
-            wait_command: str = command_list[0].split("(")[1].replace(")", "")
-        else:
-            wait_command: str = command_list[0].split("(")[1] + "." + command_list[1].replace(")", "")
-
-        try:
-            wait_seconds: float = float(wait_command)
-            MessageLog.print_message(f"[COMBAT] Now waiting {wait_seconds} second(s).")
-            Game.wait(wait_seconds)
-        except ValueError:
-            MessageLog.print_message(f"[COMBAT] Could not parse out the seconds in the wait command. Waiting {fallback_delay} second(s) as fallback.")
-            Game.wait(fallback_delay)
+        MessageLog.print_message(f"[COMBAT] Now waiting {wait_seconds} second(s).")
+        Game.wait(wait_seconds)
+        return None
 
     @staticmethod
     def _use_combat_healing_item(command: str):
@@ -651,50 +674,32 @@ class CombatMode:
         return None
 
     @staticmethod
-    def _select_enemy_target(command: str):
+    def _select_enemy_target(target: int):
         """Selects the targeted enemy.
 
         Args:
-            command (str): The command to be executed.
+            target (int): The enemy to target from 1 to 3.
 
         Returns:
             None
         """
-        for target in range(1, 3):
-            if command == f"targetenemy({target})":
-                from bot.game import Game
-
-                if Settings.use_first_notch is False:
-                    x_offset = 270
-                    x_inc = 160
-                    y_offset = 285
-                else:
-                    x_offset = 175
-                    x_inc = 100
-                    y_offset = 190
-
-                if target == 1:
-                    x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 0)
-                elif target == 2:
-                    x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 1)
-                else:
-                    x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 2)
+        from bot.game import Game
 
-                y = CombatMode._attack_button_location[1] - y_offset
+        x, y = CombatLayout.hotspot("enemy", target)
 
-                MouseUtils.move_and_click_point(x, y, "template_enemy_target")
-                Game.find_and_click_button("set_target")
-                MessageLog.print_message(f"[COMBAT] Targeted Enemy #{target}.")
+        MouseUtils.move_and_click_point(x, y, "template_enemy_target")
+        Game.find_and_click_button("set_target")
+        MessageLog.print_message(f"[COMBAT] Targeted Enemy #{target}.")
 
         return None
 
     @staticmethod
-    def _use_character_skill(character_selected: int, skill_command_list: List[str]):
+    def _use_character_skill(character_selected: int, steps: Tuple[tuple, ...]):
         """Activate the specified skill(s) for the already selected character.
 
         Args:
             character_selected (int): The selected character whose skill(s) needs to be used.
-            skill_command_list (List[str]): The commands to be executed.
+            steps (Tuple[tuple, ...]): The compiled steps like ("useskill", 1), ("target", 2), ("wait", 1.5) and ("attack",).
 
         Returns:
             (bool): Return True if the Turn will end due to a chained "attack" command. False otherwise.
@@ -702,102 +707,40 @@ class CombatMode:
         from bot.game import Game
 
         # Execute every skill command in the list.
-        while len(skill_command_list) > 0:
+        index = 0
+        while index < len(steps):
             # Stop if the Next button is present.
             if Settings.farming_mode == "Raid" and ImageUtils.find_button("next", tries = 1, suppress_error = True):
                 return False
 
-            if skill_command_list[0].__contains__("wait"):
-                CombatMode._wait_execute(skill_command_list)
-                skill_command_list.pop(0)
-            elif skill_command_list[0].__contains__("attack"):
+            step = steps[index]
+            index += 1
+            if step[0] == "wait":
+                CombatMode._wait(step[1])
+            elif step[0] == "attack":
                 CombatMode._reload()
                 return True
             else:
-                skill = skill_command_list.pop(0)
+                skill = step[1]
 
-                if Settings.use_first_notch is False:
-                    x_offset = 220
-                    x_inc = 85
-                    y_offset = 170
-                else:
-                    x_offset = 145
-                    x_inc = 55
-                    y_offset = 115
-
-                if skill == "useskill(1)":
-                    MessageLog.print_message(f"[COMBAT] Character {character_selected} uses Skill 1.")
-                    x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 0)
-                elif skill == "useskill(2)":
-                    MessageLog.print_message(f"[COMBAT] Character {character_selected} uses Skill 2.")
-                    x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 1)
-                elif skill == "useskill(3)":
-                    MessageLog.print_message(f"[COMBAT] Character {character_selected} uses Skill 3.")
-                    x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 2)
-                elif skill == "useskill(4)":
-                    MessageLog.print_message(f"[COMBAT] Character {character_selected} uses Skill 4.")
-                    x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 3)
-                else:
-                    MessageLog.print_message(f"[WARNING] Invalid command received for using the Character's Skill. User wanted: {skill}.")
-                    Game.find_and_click_button("back")
-                    return False
-
-                y = CombatMode._attack_button_location[1] + y_offset
-
-                MouseUtils.move_and_click_point(x, y, "template_skill")
-                Game.wait(.1)
+                MessageLog.print_message(f"[COMBAT] Character {character_selected} uses Skill {skill}.")
+                x, y = CombatLayout.hotspot("skill", skill)
 
                 # Check if the skill requires a target.
-                if len(skill_command_list) > 0 and "target" in skill_command_list[0]:
+                if index < len(steps) and steps[index][0] == "target":
+                    target = steps[index][1]
+                    index += 1
+
+                    # Characters 1 to 3 are on the first row of the target popup and Characters 4 to 6 on the second.
+                    target_x, target_y = CombatLayout.hotspot("target", target)
                     MessageLog.print_message(f"[COMBAT] Skill is awaiting a target...")
-                    target = skill_command_list.pop(0)
-
-                    if Settings.use_first_notch is False:
-                        x_offset = 225
-                        x_inc = 95
-                        y_offset = 55
-                        y_inc = 140
-                    else:
-                        x_offset = 150
-                        x_inc = 60
-                        y_offset = 35
-                        y_inc = 220
-
-                    if target == "target(1)":
-                        x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 0)
-                        y = CombatMode._attack_button_location[1] - y_offset + (y_inc * 0)
-                        MessageLog.print_message("[COMBAT] Targeting Character 1 for Skill.")
-                        MouseUtils.move_and_click_point(x, y, "template_target")
-                    elif "target(2)" in target:
-                        x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 1)
-                        y = CombatMode._attack_button_location[1] - y_offset + (y_inc * 0)
-                        MessageLog.print_message("[COMBAT] Targeting Character 2 for Skill.")
-                        MouseUtils.move_and_click_point(x, y, "template_target")
-                    elif "target(3)" in target:
-                        x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 2)
-                        y = CombatMode._attack_button_location[1] - y_offset + (y_inc * 0)
-                        MessageLog.print_message("[COMBAT] Targeting Character 3 for Skill.")
-                        MouseUtils.move_and_click_point(x, y, "template_target")
-                    elif "target(4)" in target:
-                        x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 0)
-                        y = CombatMode._attack_button_location[1] - y_offset + (y_inc * 1)
-                        MessageLog.print_message("[COMBAT] Targeting Character 4 for Skill.")
-                        MouseUtils.move_and_click_point(x, y, "template_target")
-                    elif "target(5)" in target:
-                        x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 1)
-                        y = CombatMode._attack_button_location[1] - y_offset + (y_inc * 1)
-                        MessageLog.print_message("[COMBAT] Targeting Character 5 for Skill.")
-                        MouseUtils.move_and_click_point(x, y, "template_target")
-                    elif "target(6)" in target:
-                        x = CombatMode._attack_button_location[0] - x_offset + (x_inc * 2)
-                        y = CombatMode._attack_button_location[1] - y_offset + (y_inc * 1)
-                        MessageLog.print_message("[COMBAT] Targeting Character 6 for Skill.")
-                        MouseUtils.move_and_click_point(x, y, "template_target")
-                    elif "wait" in target:
-                        CombatMode._wait_execute(list(target))
-                    else:
-                        MessageLog.print_message("[WARNING] Invalid command received for Skill targeting.")
-                        Game.find_and_click_button("cancel")
+                    MessageLog.print_message(f"[COMBAT] Targeting Character {target} for Skill.")
+
+                    # Click the Skill and its target as one input sequence.
+                    MouseUtils.move_and_click_chain([(x, y, "template_skill"), (target_x, target_y, "template_target")])
+                else:
+                    MouseUtils.move_and_click_point(x, y, "template_skill")
+                    Game.wait(.1)
 
                 # TODO: Add back this skill sealed check if needed
                 # Else, check if the character is skill-sealed.
@@ -812,82 +755,63 @@ class CombatMode:
         return False
 
     @staticmethod
-    def _use_summon(command: str):
-        from bot.game import Game
+    def _use_summon(summons: Tuple[int, ...], wait_seconds: Optional[float] = None, attack: bool = False):
         """Activate the specified Summon.
 
         Args:
-            command (str): The command to be executed.
+            summons (Tuple[int, ...]): The Summons to invoke from 1 to 6 in order.
+            wait_seconds (float, optional): Seconds to wait after invoking the Summons. Defaults to None.
+            attack (bool, optional): End the Turn after invoking the Summons. Defaults to False.
 
         Returns:
             (bool): Return True if the Turn will end due to a chained "attack" command. False otherwise.
         """
+        from bot.game import Game
+
         _navigated_to_summons = False
-        for summon_index in range(1, 7):
-            if f"summon({summon_index})" in command:
-                MessageLog.print_message(f"[COMBAT] Invoking Summon #{summon_index}.")
-                from bot.game import Game
-
-                if not _navigated_to_summons:
-                    # Click the "Summon" button to bring up the available Summons.
-                    if not Game.find_and_click_button("summon"):
-                        MessageLog.print_message(f"[COMBAT] Summon #{summon_index} cannot be invoked due to current restrictions.")
-                        break
-                    _navigated_to_summons = True
-
-                if Settings.use_first_notch is False:
-                    x_offset = 320
-                    x_inc = 75
-                    y_offset = 140
-                else:
-                    x_offset = 215
-                    x_inc = 50
-                    y_offset = 90
-
-                # Click on the specified Summon.
-                tries = 3
-                while ImageUtils.confirm_location("summon_details") is False:
-                    if summon_index == 1:
-                        MouseUtils.move_and_click_point(CombatMode._attack_button_location[0] - x_offset + (x_inc * 0), CombatMode._attack_button_location[1] + y_offset, "template_summon")
-                    elif summon_index == 2:
-                        MouseUtils.move_and_click_point(CombatMode._attack_button_location[0] - x_offset + (x_inc * 1), CombatMode._attack_button_location[1] + y_offset, "template_summon")
-                    elif summon_index == 3:
-                        MouseUtils.move_and_click_point(CombatMode._attack_button_location[0] - x_offset + (x_inc * 2), CombatMode._attack_button_location[1] + y_offset, "template_summon")
-                    elif summon_index == 4:
-                        MouseUtils.move_and_click_point(CombatMode._attack_button_location[0] - x_offset + (x_inc * 3), CombatMode._attack_button_location[1] + y_offset, "template_summon")
-                    elif summon_index == 5:
-                        MouseUtils.move_and_click_point(CombatMode._attack_button_location[0] - x_offset + (x_inc * 4), CombatMode._attack_button_location[1] + y_offset, "template_summon")
-                    else:
-                        MouseUtils.move_and_click_point(CombatMode._attack_button_location[0] - x_offset + (x_inc * 5), CombatMode._attack_button_location[1] + y_offset, "template_summon")
-
-                    tries -= 1
-
-                # Check if it is able to be summoned.
-                if ImageUtils.confirm_location("summon_details", bypass_general_adjustment = True):
-                    if Game.find_and_click_button("ok") is False:
-                        MessageLog.print_message(f"[COMBAT] Summon #{summon_index} cannot be invoked due to current restrictions.")
-                        Game.find_and_click_button("cancel")
+        for summon_index in summons:
+            MessageLog.print_message(f"[COMBAT] Invoking Summon #{summon_index}.")
+
+            if not _navigated_to_summons:
+                # Click the "Summon" button to bring up the available Summons.
+                if not Game.find_and_click_button("summon"):
+                    MessageLog.print_message(f"[COMBAT] Summon #{summon_index} cannot be invoked due to current restrictions.")
+                    break
+                _navigated_to_summons = True
+
+            # Click on the specified Summon.
+            summon_x, summon_y = CombatLayout.hotspot("summon", summon_index)
+            tries = 3
+            while ImageUtils.confirm_location("summon_details") is False:
+                MouseUtils.move_and_click_point(summon_x, summon_y, "template_summon")
+
+                tries -= 1
+
+            # Check if it is able to be summoned.
+            if ImageUtils.confirm_location("summon_details", bypass_general_adjustment = True):
+                if Game.find_and_click_button("ok") is False:
+                    MessageLog.print_message(f"[COMBAT] Summon #{summon_index} cannot be invoked due to current restrictions.")
+                    Game.find_and_click_button("cancel")
 
         # Click the "Back" button to return.
         Game.find_and_click_button("back")
 
-        if "wait" in command:
-            split_command = command.split(".")
-            split_command.pop(0)
-            CombatMode._wait_execute(split_command)
+        if wait_seconds is not None:
+            CombatMode._wait(wait_seconds)
 
-        if "attack" in command:
+        if attack:
             CombatMode._end()
             return True
 
         return False
 
     @staticmethod
-    def _quick_summon(command: str = ""):
+    def _quick_summon(wait_seconds: Optional[float] = None, attack: bool = False):
         """Activate a Quick Summon.
 
         Args:
-            command (str, optional): The command to be executed. Defaults to the regular quick summon command.
+            wait_seconds (float, optional): Seconds to wait after the Quick Summon. Defaults to None.
+            attack (bool, optional): End the Turn after the Quick Summon. Defaults to False.
 
         Returns:
             (bool): Return True if the Turn will end due to a chained "attack" command. False otherwise.
@@ -899,12 +823,10 @@ class CombatMode:
                 (Game.find_and_click_button("quick_summon1", bypass_general_adjustment = True) or Game.find_and_click_button("quick_summon2", bypass_general_adjustment = True)):
             MessageLog.print_message("[COMBAT] Successfully quick summoned!")
 
-            if "wait" in command:
-                split_command = command.split(".")
-                split_command.pop(0)
-                CombatMode._wait_execute(split_command)
+            if wait_seconds is not None:
+                CombatMode._wait(wait_seconds)
 
-            if "attack" in command:
+            if attack:
                 CombatMode._end()
                 return True
         else:
@@ -1006,11 +928,11 @@ class CombatMode:
         return None
 
     @staticmethod
-    def _attack(command: str):
+    def _attack(wait_seconds: Optional[float] = None):
         """Attacks and if there is a wait command attached, execute that as well.
 
         Args:
-            command (str): The command to be executed.
+            wait_seconds (float, optional): Seconds to wait after attacking. Defaults to None.
 
         Returns:
             None
@@ -1025,10 +947,8 @@ class CombatMode:
         else:
             MessageLog.print_message("[WARNING] Failed to execute a manual attack.")
 
-        if "wait" in command:
-            split_command = command.split(".")
-            split_command.pop(0)
-            CombatMode._wait_execute(list(split_command))
+        if wait_seconds is not None:
+            CombatMode._wait(wait_seconds)
 
         return None
 
@@ -1151,13 +1071,13 @@ class CombatMode:
             # Check for exit conditions.
             CombatMode._check_for_battle_end()
 
-            if Game.find_and_click_button("next", tries = 1, suppress_error = True):
-                Game.wait(2.5)
-
-                # Check for exit conditions.
-                CombatMode._check_for_battle_end()
+            # Wait out the animations, clicking past the "Next" button, until the Attack button shows up again.
+            CombatMode._wait_for_attack()
+            if CombatMode._retreat_check:
+                break
 
             Game.find_and_click_button("attack", tries = 10)
+            CombatStateMachine.wait_for_attack(CombatMode._attack_timeout)
             CombatMode._reload_for_attack()
 
         return None
@@ -1169,14 +1089,14 @@ class CombatMode:
     ######################################################################
 
     @staticmethod
-    def start_combat_mode(script_commands: List[str] = None, is_nightmare: bool = False, is_defender: bool = False, use_deep_copy: bool = False,
-                          exp_header: str = "no_loot"):
-        """Start Combat Mode with the given script file path. Start reading through the text file line by line and have the bot proceed with the commands accordingly.
+    def start_combat_mode(script_commands: List[str] = None, is_nightmare: bool = False, is_defender: bool = False, exp_header: str = "no_loot"):
+        """Start Combat Mode with the given script file path. Walk through the compiled commands of the script one by one and have the bot proceed with them accordingly.
 
         Args:
             script_commands (List[str]): List of script commands to use instead of reading from a text file. Defaults to None.
             is_nightmare (bool, optional): If Combat Mode is being used for a Nightmare, determines the method of reading the script file.
             is_defender (bool, optional): If Combat Mode is being used for a Defender, determines the method of reading the script file.
+            exp_header (str, optional): The header to look for when checking for the end of the battle. Defaults to "no_loot".
 
         Returns:
             (bool): Return True if Combat Mode was successful. Else, return False if the Party wiped or backed out without retreating.
@@ -1191,9 +1111,9 @@ class CombatMode:
         CombatMode._full_auto = False
         manual_attack_and_reload = False
         skip_end = False
-        CombatMode._attack_button_location = None
         CombatMode._command_turn_number = 1
         CombatMode._turn_number = 1  # Current turn for the script execution.
+        CombatStateMachine.reset()
 
         MessageLog.print_message("\n######################################################################")
         MessageLog.print_message("######################################################################")
@@ -1201,33 +1121,32 @@ class CombatMode:
         MessageLog.print_message("######################################################################")
         MessageLog.print_message("######################################################################\n")
 
+        # The script is compiled once when it is first used and the same instructions are walked through for every battle after that.
         if script_commands is not None:
-            if use_deep_copy:
-                command_list = copy.deepcopy(script_commands)
-            else:
-                command_list = script_commands
+            instructions = ScriptCache.combat_script(script_commands)
         else:
             if is_nightmare:
                 MessageLog.print_message(f"Name of Nightmare combat script loaded: {Settings.nightmare_combat_script_name}")
-                command_list = copy.deepcopy(Settings.nightmare_combat_script)
+                instructions = ScriptCache.combat_script(Settings.nightmare_combat_script)
             elif is_defender:
                 MessageLog.print_message(f"Name of Defender combat script loaded: {Settings.defender_combat_script_name}")
-                command_list = copy.deepcopy(Settings.defender_combat_script)
+                instructions = ScriptCache.combat_script(Settings.defender_combat_script)
             else:
                 MessageLog.print_message(f"Name of combat script loaded: {Settings.combat_script_name}")
-                command_list = copy.deepcopy(Settings.combat_script)
+                instructions = ScriptCache.combat_script(Settings.combat_script)
 
-        MessageLog.print_message(f"[COMBAT] Size of script commands: {len(command_list)}")
+        MessageLog.print_message(f"[COMBAT] Size of script commands: {len(instructions)}")
 
         # If current Farming Mode is Arcarum, attempt to dismiss potential stage effect popup like "Can't use Charge Attacks".
         if Settings.farming_mode == "Arcarum":
             Game.find_and_click_button("arcarum_stage_effect_active", tries = 10, bypass_general_adjustment = True)
 
-        # Save the position of the Attack button.
-        CombatMode._attack_button_location = ImageUtils.find_button("attack", tries = 50, bypass_general_adjustment = True)
+        # Locate the Attack button that the layout of the Combat screen is anchored to.
+        CombatLayout.reset()
+        attack_button_location = CombatLayout.anchor("attack")
 
         # TODO: Add back this block if running into issues with Raid
-        # if Settings.farming_mode == "Raid" and CombatMode._attack_button_location is None:
+        # if Settings.farming_mode == "Raid" and attack_button_location is None:
         #     MessageLog.print_message(f"\n[ERROR] Cannot find Attack button. Raid must have just ended.")
         #     return False
 
@@ -1235,19 +1154,16 @@ class CombatMode:
         ######################################################################
         # This is where the main workflow of Combat Mode is located.
         try:
-            while len(command_list) > 0 and CombatMode._retreat_check is False:
-                # All the logic that follows assumes that the command string is lowercase to allow case-insensitive commands.
-                command = command_list.pop(0).strip().lower()
-                if command == "" or command[0] == "#" or command[0] == "/":
-                    continue
-                elif command.__contains__("/") or command.__contains__("#"):
-                    # Remove comments in the same line.
-                    command = command[0:command.find("#")][0:command.find("/")].strip()
-
-                MessageLog.print_message(f"\n[COMBAT] Reading command: \"{command}\"")
-
-                if command.__contains__("turn"):
-                    CombatMode._start_turn(command)
+            index = 0
+            while index < len(instructions) and CombatMode._retreat_check is False:
+                instruction = instructions[index]
+                index += 1
+                op, args = instruction.op, instruction.args
+
+                MessageLog.print_message(f"\n[COMBAT] Reading command: \"{instruction.text}\"")
+
+                if op == "turn":
+                    CombatMode._start_turn(args[0])
                 elif CombatMode._turn_number == CombatMode._command_turn_number:
                     # Process all commands here that belong inside a Turn block.
 
@@ -1257,68 +1173,49 @@ class CombatMode:
 
                     CombatMode._wait_for_attack()
 
-                    # Determine which Character to take action.
-                    if "character1." in command:
-                        character_selected = 1
-                    elif "character2." in command:
-                        character_selected = 2
-                    elif "character3." in command:
-                        character_selected = 3
-                    elif "character4." in command:
-                        character_selected = 4
-                    else:
-                        character_selected = 0
-
-                    if character_selected != 0:
-                        # Select the specified Character.
-                        CombatMode._select_character(character_selected)
-
-                        # Now execute each Skill command starting from left to right.
-                        skill_command_list = command.split(".")
-                        skill_command_list.pop(0)  # Remove the "character" portion of the string.
-                        if CombatMode._use_character_skill(character_selected, skill_command_list):
+                    if op == "character":
+                        # Select the specified Character and then execute each Skill command starting from left to right.
+                        CombatMode._select_character(args[0])
+                        if CombatMode._use_character_skill(args[0], args[1]):
                             skip_end = True
-
-                    # Handle any other supported command.
-                    elif command == "requestbackup":
+                    elif op == "requestbackup":
                         CombatMode._request_backup()
-                    elif command == "tweetbackup":
+                    elif op == "tweetbackup":
                         CombatMode._tweet_backup()
-                    elif CombatMode._healing_item_commands.__contains__(command):
-                        CombatMode._use_combat_healing_item(command)
-                    elif command.__contains__("summon") and command.__contains__("quicksummon") is False:
-                        if CombatMode._use_summon(command):
+                    elif op == "healingitem":
+                        CombatMode._use_combat_healing_item(args[0])
+                    elif op == "summon":
+                        if CombatMode._use_summon(*args):
                             skip_end = True
-                    elif command.__contains__("quicksummon"):
-                        if CombatMode._quick_summon(command):
+                    elif op == "quicksummon":
+                        if CombatMode._quick_summon(*args):
                             skip_end = True
-                    elif command == "enablesemiauto":
+                    elif op == "enablesemiauto":
                         CombatMode._enable_semi_auto()
-                    elif command.startswith("enablefullauto"):
-                        CombatMode._enable_full_auto(reload="reload" in command)
-                    elif "targetenemy" in command:
-                        # Select enemy target.
-                        CombatMode._select_enemy_target(command)
-                    elif "attackback" in command:
+                    elif op == "enablefullauto":
+                        CombatMode._enable_full_auto(reload = args[0])
+                    elif op == "targetenemy":
+                        CombatMode._select_enemy_target(args[0])
+                    elif op == "attackback":
                         CombatMode._attack_back()
-                    elif "attack" in command:
-                        CombatMode._attack(command)
-                    elif "back" in command:
+                    elif op == "attack":
+                        CombatMode._attack(args[0])
+                    elif op == "back":
                         CombatMode._back()
-                    elif "reload" in command:
+                    elif op == "reload":
                         CombatMode._reload()
-                    elif "refresh" in command:
+                    elif op == "refresh":
                         CombatMode._instant_reload()
-                    elif command == "repeatmanualattackandreload":
+                    elif op == "repeatmanualattackandreload":
                         MessageLog.print_message("[COMBAT] Enabling manually pressing the Attack button and reloading (if the mission supports it) until battle ends.")
                         manual_attack_and_reload = True
-                    elif CombatMode._semi_auto is False and CombatMode._full_auto is False and command == "end" and skip_end is False:
+                    elif CombatMode._semi_auto is False and CombatMode._full_auto is False and op == "end" and skip_end is False:
                         CombatMode._end()
-                    elif command.find("wait") == 0:
-                        CombatMode._wait_execute(list(command))
-                    elif command == "exit":
+                    elif op == "wait":
+                        CombatMode._wait(args[0])
+                    elif op == "exit":
                         # End Combat Mode by heading back to the Home screen without retreating.
-                        CombatMode._attack(command)
+                        CombatMode._attack()
                         MessageLog.print_message("\n[COMBAT] Leaving this Raid without retreating.")
                         MessageLog.print_message("\n######################################################################")
                         MessageLog.print_message("######################################################################")
@@ -1331,15 +1228,15 @@ class CombatMode:
                 ######################################################################
                 ######################################################################
                 # Handle certain commands that could be present outside a Turn block.
-                if CombatMode._semi_auto is False and CombatMode._full_auto is False and command == "enablesemiauto":
+                elif CombatMode._semi_auto is False and CombatMode._full_auto is False and op == "enablesemiauto":
                     CombatMode._enable_semi_auto()
-                elif CombatMode._semi_auto is False and CombatMode._full_auto is False and command == "enablefullauto":
+                elif CombatMode._semi_auto is False and CombatMode._full_auto is False and op == "enablefullauto" and not args[0]:
                     CombatMode._enable_full_auto()
-                elif command == "repeatmanualattackandreload":
+                elif op == "repeatmanualattackandreload":
                     MessageLog.print_message("[COMBAT] Enabling manually pressing the Attack button and reloading (if the mission supports it) until battle ends.")
                     manual_attack_and_reload = True
-                elif command.find("wait") == 0:
-                    CombatMode._wait_execute(list(command))
+                elif op == "wait":
+                    CombatMode._wait(args[0])
 
             # Deal with the situation where high-profile raids end right when the bot loads in and all it sees is the "Next" button.
             if Settings.farming_mode == "Raid" and Game.find_and_click_button("next", tries = 3):
@@ -1361,8 +1258,7 @@ class CombatMode:
                     CombatMode._enable_full_auto()
 
                 # Counteract slower instances when the battle finished right when the bot finished executing the script.
-                if Game.find_and_click_button("next", tries = 1, suppress_error = True):
-                    Game.wait(2.5)
+                if CombatMode._click_next():
                     CombatMode._check_for_battle_end()
 
                 # Main workflow loop for both Semi Auto and Full Auto. The bot will progress the Quest/Raid until it ends or the Party wipes.
@@ -1379,6 +1275,8 @@ class CombatMode:
                     Settings.combat_elapsed_time = time.time() - CombatMode._start_time
 
                 return True
+        finally:
+            CombatStateMachine.stop()
 
         ######################################################################
         ######################################################################
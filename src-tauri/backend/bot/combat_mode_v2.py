@@ -1,14 +1,15 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from time import sleep
 from numpy import random
-import pyautogui as pya
 
 # from bot.game import Game
 from utils.settings import Settings
 from utils.message_log import MessageLog as Log
 from utils.image_utils import ImageUtils
 from utils.mouse_utils import MouseUtils
+from utils.input_driver import InputDriver
 from bot.combat_mode import CombatMode
+from bot.combat_layout import CombatLayout
 from bot.window import Window
 
 class CombatModeV2:
@@ -56,17 +57,7 @@ class CombatModeV2:
     def _select_char(idx: int):
         """Click on the character on combact screen. Idx start at 0
         """
-        x,y = ImageUtils.find_button("attack", tries = 50, bypass_general_adjustment = True)
-
-        if Settings.use_first_notch is False:
-            x_offset = 280
-            x_inc = 80
-        else:
-            x_offset = 215
-            x_inc = 55
-        
-        x = x - x_offset + (x_inc * idx-2)
-        y = y + 92
+        x, y = CombatLayout.hotspot("character", idx + 1, layout = "v2", verify = True)
         MouseUtils.move_and_click_point(x, y, "template_character")
 
     @staticmethod
@@ -87,18 +78,7 @@ class CombatModeV2:
     @staticmethod
     def _use_skill(idx: int):
 
-        if Settings.use_first_notch is False:
-            # calibrated
-            x_offset = 138
-            x_inc = 84
-            y_offset = 546
-        else:
-            x_offset = 145
-            x_inc = 55
-            y_offset = 115
-
-        x = Window.start + x_offset + (x_inc * idx)
-        y = Window.top + y_offset
+        x, y = CombatLayout.hotspot("skill", idx + 1, layout = "v2")
 
         MouseUtils.move_and_click_point(x, y, "template_skill", custom_wait=random.uniform(0.03, 0.1))
         Log.print_message(f"[COMBAT] Use Skill {idx}.")
@@ -106,13 +86,7 @@ class CombatModeV2:
     @staticmethod
     def _skill_target(idx: int):
 
-        x_offset = 115
-        x_inc = 93
-        y_offset = 251
-        y_inc = 164
-
-        x = Window.start + x_offset + (x_inc * (idx%3))
-        y = Window.top + y_offset + (y_inc * (idx//3))
+        x, y = CombatLayout.hotspot("target", idx + 1, layout = "v2")
 
         Log.print_message(f"[COMBAT] Targeting Character {idx+1} for Skill.")
         MouseUtils.move_and_click_point(x, y, "template_target", custom_wait=random.uniform(0.03, 0.1))
@@ -166,11 +140,7 @@ class CombatModeV2:
         if not Game.find_and_click_button("summon", clicks=2):
             return False
 
-        x_offset = 15
-        x_inc = 77
-        y_offset = 468
-        x = Window.start + x_offset + (x_inc * idx)
-        y = Window.top + y_offset
+        x, y = CombatLayout.hotspot("summon", idx + 1, layout = "v2")
         #animation
         sleep(0.3)
         Log.print_message(f"[COMBAT] Using Summon #{idx+1}.")
@@ -257,10 +227,10 @@ class CombatModeV2:
         sleep(time)
     
     @staticmethod
-    def load_actions(actions):
-        """ Check the string list and load the actions chain into the combat mode
+    def load_actions(actions: Tuple[Tuple[str, tuple], ...]):
+        """ Load the action table from Parser.parse_battles into the combat mode
 
-        actions: list of tuple of function name and parameter
+        actions: tuple of function name and positional parameters
         """
         fun = {
             "quicksummon": CombatModeV2._quick_summon,
@@ -282,11 +252,7 @@ class CombatModeV2:
             "requestbackup": CombatMode._request_backup,
             "tweetbackup": CombatMode._tweet_backup,
         }
-        CombatModeV2.actions = []
-        for action in actions:
-            CombatModeV2.actions.append(
-                (fun[action[0]] , action[1])
-            )
+        CombatModeV2.actions = [(fun[name], args) for name, args in actions]
         Log.print_message(
             f"[COMBAT] Action Loaded: Size {len(CombatModeV2.actions)}")
 
@@ -299,25 +265,11 @@ class CombatModeV2:
         """
         from bot.game import Game
 
-        # Check if the Battle has ended.
-        if ImageUtils.confirm_location("battle_concluded", tries = 1, suppress_error = True, bypass_general_adjustment = True):
-            Log.print_message("\n[COMBAT] Battle concluded suddenly.")
-            Log.print_message("\n######################################################################")
-            Log.print_message("######################################################################")
-            Log.print_message("[COMBAT] Ending Combat Mode.")
-            Log.print_message("######################################################################")
-            Log.print_message("######################################################################")
-            return True
-
-        if ImageUtils.confirm_location("exp_gained", tries = 1, suppress_error = True, bypass_general_adjustment = True):
-            Log.print_message("\n######################################################################")
-            Log.print_message("######################################################################")
-            Log.print_message("[COMBAT] Ending Combat Mode.")
-            Log.print_message("######################################################################")
-            Log.print_message("######################################################################")
-            return True
-
-        if ImageUtils.confirm_location("loot_collected", tries = 1, suppress_error = True, bypass_general_adjustment = True):
+        # Check if the Battle has ended by scoring every end-of-battle screen against a single screenshot.
+        screen, _, _ = ImageUtils.classify_screen(["battle_concluded", "exp_gained", "loot_collected"])
+        if screen is not None:
+            if screen == "battle_concluded":
+                Log.print_message("\n[COMBAT] Battle concluded suddenly.")
             Log.print_message("\n######################################################################")
             Log.print_message("######################################################################")
             Log.print_message("[COMBAT] Ending Combat Mode.")
@@ -347,6 +299,7 @@ class CombatModeV2:
         Log.print_message("######################################################################")
         Log.print_message("######################################################################\n")
 
+        CombatLayout.reset()
         first_action = CombatModeV2.actions[0]
        
         if first_action[0] == CombatModeV2._enable_semi_auto:
@@ -360,9 +313,7 @@ class CombatModeV2:
             Log.print_message(f"[Combat] Entering Ready Page")
 
             if auto_status != 0:
-                pya.mouseDown()
-                sleep(random.uniform(0.02, 0.12))
-                pya.mouseUp()
+                InputDriver.click()
 
                 if ImageUtils.confirm_location("auto_enabled", tries=5):
                     Log.print_message(f"[Combat] Auto enabled")
@@ -377,7 +328,10 @@ class CombatModeV2:
         
         if auto_status != 1 and auto_status != 3:
             # check for attack button if doesn't try to enable semi auto
-            if ImageUtils.find_button("attack", tries=50):
+            attack_location = ImageUtils.find_button("attack", tries=50)
+            if attack_location:
+                # Anchor the layout of the Combat screen to the Attack button that was just found.
+                CombatLayout.set_anchor("attack", attack_location)
                 Log.print_message(f"[Combat] Enemy Animation finish")
             else:
                 return False
@@ -401,7 +355,7 @@ class CombatModeV2:
         action_start_idx = min(auto_status, 1)
         # excute chain actions
         for action in CombatModeV2.actions[action_start_idx:]:
-            action[0](**action[1])
+            action[0](*action[1])
 
         Log.print_message("\n######################################################################")
         Log.print_message("######################################################################")
@@ -0,0 +1,260 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+from utils.image_utils import ImageUtils
+from bot.combat_layout import CombatLayout
+
+
+class CombatState:
+    """
+    The states that a battle can be in as seen on the Combat screen.
+    """
+
+    # The "Attack" button is showing and the game is waiting for the next command.
+    AWAIT_INPUT = "AWAIT_INPUT"
+    # The attack or a Skill is being sent or animated and nothing can be clicked yet.
+    ANIMATING = "ANIMATING"
+    # The Turn ended on the "Next" button like when a Raid moves on to its next phase.
+    TURN_END = "TURN_END"
+    # One of the screens after the battle is showing.
+    BATTLE_END = "BATTLE_END"
+    # The Party wiped.
+    WIPED = "WIPED"
+
+
+class CombatStateMachine:
+    """
+    Tracks the state of the battle with a single classification of every frame against all of the templates that tell the states apart, so that Combat Mode moves on as
+    soon as the screen changes instead of polling for each button on its own and sleeping through the animations.
+
+    The time spent in each state is summed up over every battle so it can be logged as metrics.
+    """
+
+    # The templates that make up each state. The first state in this order that has one of its templates on the screen wins.
+    _battle_end_screens: List[str] = ["no_loot", "battle_concluded", "exp_gained", "loot_collected"]
+    _wipe_screens: List[str] = ["buttons/party_wipe_indicator", "salute_participants"]
+    _turn_end_screens: List[str] = ["buttons/next"]
+    _input_screens: List[str] = ["buttons/attack"]
+    _animating_screens: List[str] = ["buttons/combat_cancel", "buttons/dialog_lyria", "buttons/dialog_vyrn"]
+
+    state: str = CombatState.ANIMATING
+    # The highest scoring end of battle screen of the last frame or None.
+    end_screen: Optional[str] = None
+    # The screen locations of every template found on the last frame.
+    locations: Dict[str, Tuple[int, int]] = {}
+
+    # The digest of the last classified frame and its extra header. A frame with the same digest is not classified again as the result would be the same.
+    _last_digest: Optional[Tuple[Tuple[Tuple[int, ...], int], str]] = None
+    frames_grabbed: int = 0
+    frames_classified: int = 0
+
+    # When the current state was entered or 0 while no battle is being tracked.
+    _entered_at: float = 0.0
+    # Seconds spent and number of times entered for each state over every battle.
+    _durations: Dict[str, float] = {}
+    _entries: Dict[str, int] = {}
+
+    @staticmethod
+    def reset():
+        """Start tracking a new battle.
+
+        Returns:
+            None
+        """
+        CombatStateMachine.state = CombatState.ANIMATING
+        CombatStateMachine.end_screen = None
+        CombatStateMachine.locations = {}
+        CombatStateMachine._last_digest = None
+        CombatStateMachine._entered_at = time.perf_counter()
+        return None
+
+    @staticmethod
+    def stop():
+        """Stop tracking the battle and account the time spent in its last state.
+
+        Returns:
+            None
+        """
+        if CombatStateMachine._entered_at > 0:
+            state = CombatStateMachine.state
+            CombatStateMachine._durations[state] = CombatStateMachine._durations.get(state, 0.0) + time.perf_counter() - CombatStateMachine._entered_at
+            CombatStateMachine._entered_at = 0.0
+        return None
+
+    @staticmethod
+    def _transition(state: str):
+        """Move to the state and account the time spent in the previous one.
+
+        Args:
+            state (str): The new state.
+
+        Returns:
+            None
+        """
+        now = time.perf_counter()
+        previous = CombatStateMachine.state
+        if state == previous:
+            return None
+
+        CombatStateMachine.state = state
+
+        # Outside of a battle the state is still followed but not accounted.
+        if CombatStateMachine._entered_at == 0:
+            return None
+
+        elapsed = now - CombatStateMachine._entered_at
+        CombatStateMachine._durations[previous] = CombatStateMachine._durations.get(previous, 0.0) + elapsed
+        CombatStateMachine._entries[state] = CombatStateMachine._entries.get(state, 0) + 1
+        CombatStateMachine._entered_at = now
+
+        if Settings.debug_mode:
+            MessageLog.print_message(f"[DEBUG] Combat state {previous} -> {state} after {elapsed:.3f} seconds.")
+
+        return None
+
+    @staticmethod
+    def update(exp_header: str = "") -> str:
+        """Classify the current frame and move to the state that it shows. The frame is only classified if it changed since the last one.
+
+        Args:
+            exp_header (str, optional): An extra header that also means that the battle ended. Defaults to "".
+
+        Returns:
+            (str): The current state.
+        """
+        digest = (ImageUtils.frame_digest(), exp_header)
+        CombatStateMachine.frames_grabbed += 1
+        if digest == CombatStateMachine._last_digest:
+            return CombatStateMachine.state
+
+        CombatStateMachine._last_digest = digest
+        CombatStateMachine.frames_classified += 1
+
+        battle_end_screens = CombatStateMachine._battle_end_screens
+        if exp_header and exp_header not in battle_end_screens:
+            battle_end_screens = battle_end_screens + [exp_header]
+
+        _, _, locations = ImageUtils.classify_screen(battle_end_screens + CombatStateMachine._wipe_screens + CombatStateMachine._turn_end_screens +
+                                                     CombatStateMachine._input_screens + CombatStateMachine._animating_screens)
+        CombatStateMachine.locations = locations
+
+        # Keep the layout of the Combat screen on the Attack button whenever it was matched anyway.
+        if "buttons/attack" in locations:
+            CombatLayout.observe("attack", locations["buttons/attack"])
+
+        # Prefer the end of battle screen that was found in the order of the list like the separate checks used to.
+        CombatStateMachine.end_screen = next((screen for screen in battle_end_screens if screen in locations), None)
+
+        if CombatStateMachine.end_screen is not None:
+            state = CombatState.BATTLE_END
+        elif any(screen in locations for screen in CombatStateMachine._wipe_screens):
+            state = CombatState.WIPED
+        elif any(screen in locations for screen in CombatStateMachine._turn_end_screens):
+            state = CombatState.TURN_END
+        elif "buttons/attack" in locations and "buttons/combat_cancel" not in locations:
+            state = CombatState.AWAIT_INPUT
+        else:
+            state = CombatState.ANIMATING
+
+        CombatStateMachine._transition(state)
+        return state
+
+    @staticmethod
+    def _wait_until(condition: Callable[[str], bool], timeout: float, exp_header: str = "", on_frame: Callable[[str], None] = None) -> str:
+        """Classify frames at the configured frame rate until the condition holds for the state or the time runs out.
+
+        Args:
+            condition (Callable[[str], bool]): Checks the state of each frame.
+            timeout (float): The most seconds to wait.
+            exp_header (str, optional): An extra header that also means that the battle ended. Defaults to "".
+            on_frame (Callable[[str], None], optional): Called with the state of every frame that did not meet the condition. Defaults to None.
+
+        Returns:
+            (str): The last state.
+        """
+        frame_interval = 1.0 / Settings.wait_fps if Settings.wait_fps > 0 else 0.0
+        deadline = time.perf_counter() + timeout
+        while True:
+            frame_start_time = time.perf_counter()
+            state = CombatStateMachine.update(exp_header)
+            if condition(state) or time.perf_counter() >= deadline:
+                return state
+
+            if on_frame is not None:
+                on_frame(state)
+            time.sleep(max(0.0, frame_interval - (time.perf_counter() - frame_start_time)))
+
+    @staticmethod
+    def wait_for(states: Tuple[str, ...], timeout: float, exp_header: str = "", on_frame: Callable[[str], None] = None) -> str:
+        """Wait until the battle is in one of the states.
+
+        Args:
+            states (Tuple[str, ...]): The states to wait for.
+            timeout (float): The most seconds to wait.
+            exp_header (str, optional): An extra header that also means that the battle ended. Defaults to "".
+            on_frame (Callable[[str], None], optional): Called with the state of every frame while waiting. Defaults to None.
+
+        Returns:
+            (str): The last state which is not one of the states if the time ran out.
+        """
+        return CombatStateMachine._wait_until(lambda state: state in states, timeout, exp_header, on_frame)
+
+    @staticmethod
+    def wait_while(states: Tuple[str, ...], timeout: float, exp_header: str = "", on_frame: Callable[[str], None] = None) -> str:
+        """Wait until the battle left the states.
+
+        Args:
+            states (Tuple[str, ...]): The states to wait out.
+            timeout (float): The most seconds to wait.
+            exp_header (str, optional): An extra header that also means that the battle ended. Defaults to "".
+            on_frame (Callable[[str], None], optional): Called with the state of every frame while waiting. Defaults to None.
+
+        Returns:
+            (str): The last state which is still one of the states if the time ran out.
+        """
+        return CombatStateMachine._wait_until(lambda state: state not in states, timeout, exp_header, on_frame)
+
+    @staticmethod
+    def wait_for_attack(timeout: float) -> bool:
+        """Wait until the attack that was just clicked went through, which is when neither the "Attack" nor the "Cancel" button is showing anymore.
+
+        Args:
+            timeout (float): The most seconds to wait.
+
+        Returns:
+            (bool): True if the attack went through in time.
+        """
+        state = CombatStateMachine._wait_until(lambda state: state != CombatState.AWAIT_INPUT and "buttons/combat_cancel" not in CombatStateMachine.locations, timeout)
+        return state != CombatState.AWAIT_INPUT and "buttons/combat_cancel" not in CombatStateMachine.locations
+
+    @staticmethod
+    def metrics() -> Dict[str, Tuple[float, int]]:
+        """Get the time spent in each state over every battle so far.
+
+        Returns:
+            (Dict[str, Tuple[float, int]]): The seconds spent in each state and the number of times that it was entered.
+        """
+        durations = dict(CombatStateMachine._durations)
+        if CombatStateMachine._entered_at > 0:
+            durations[CombatStateMachine.state] = durations.get(CombatStateMachine.state, 0.0) + time.perf_counter() - CombatStateMachine._entered_at
+        return {state: (seconds, CombatStateMachine._entries.get(state, 0)) for state, seconds in durations.items()}
+
+    @staticmethod
+    def log_summary():
+        """Print the time spent in each state of the battles.
+
+        Returns:
+            None
+        """
+        metrics = CombatStateMachine.metrics()
+        if len(metrics) == 0:
+            return None
+
+        MessageLog.print_message("\n[INFO] Time spent in each state of Combat Mode:")
+        for state, (seconds, entries) in sorted(metrics.items()):
+            MessageLog.print_message(f"[INFO] {state}: {seconds:.1f}s over {entries} times")
+        MessageLog.print_message(f"[INFO] Classified {CombatStateMachine.frames_classified} of {CombatStateMachine.frames_grabbed} frames grabbed.")
+
+        return None
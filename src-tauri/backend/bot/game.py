@@ -1,3 +1,4 @@
+import logging
 import multiprocessing
 import random
 import time
@@ -12,6 +13,12 @@ from utils.message_log import MessageLog
 from utils import discord_utils
 from utils.image_utils import ImageUtils
 from utils.mouse_utils import MouseUtils
+from utils.input_driver import InputDriver
+from utils.script_cache import ScriptCache
+from utils.template_cache import TemplateCache
+from utils.roi_registry import RoiRegistry
+from utils.settle_detector import SettleDetector
+from utils.scale_calibration import ScaleCalibration
 # Imports for all the supported game modes.
 from bot.game_modes.arcarum import Arcarum
 from bot.game_modes.arcarum_sandbox import ArcarumSandbox
@@ -28,6 +35,7 @@ from bot.game_modes.generic import Generic
 from bot.game_modes.generic_v2 import GenericV2
 from bot.game_modes.scheduler import Scheduler
 from bot.window import Window
+from bot.combat_state import CombatStateMachine
 
 
 class Game:
@@ -37,6 +45,7 @@ class Game:
 
     _discord_process = None
     _discord_queue = multiprocessing.Queue()
+    _discord_shutdown_timeout: float = 15.0
 
     def __init__(self):
         super().__init__()
@@ -110,14 +119,14 @@ class Game:
         Args:
             confirm_location_check (bool, optional): Check to see if the current location is confirmed to be at the Home screen. Defaults to False.
             display_info_check (bool, optional): Recalibrate the bot window dimensions and displays the info. Defaults to False.
-            test_mode (bool, optional): Flag to test and get a valid scale for device compatibility.
+            test_mode (bool, optional): Flag to calibrate and save the scale profile for this device.
 
         Returns:
             None
         """
         if test_mode:
             MessageLog.print_message("\n[DEBUG] Now beginning test to find a valid scale for this device...")
-            ImageUtils.find_button("home", test_mode = True)
+            ScaleCalibration.calibrate()
             return
 
         if not ImageUtils.confirm_location("home", bypass_general_adjustment = True):
@@ -155,15 +164,23 @@ class Game:
         Returns:
             None
         """
-        if Settings.reduce_delay_seconds > 0.0:
-            if seconds - Settings.reduce_delay_seconds < 0.0:
-                time.sleep(seconds)
-            else:
-                time.sleep(seconds - Settings.reduce_delay_seconds)
-        else:
-            time.sleep(seconds)
+        time.sleep(Game.reduce_delay(seconds))
         return None
 
+    @staticmethod
+    def reduce_delay(seconds: float) -> float:
+        """Apply the reduce_delay_seconds setting to the delay.
+
+        Args:
+            seconds (float): Number of seconds of the delay.
+
+        Returns:
+            (float): The reduced number of seconds or the original number if the reduction would make it negative.
+        """
+        if Settings.reduce_delay_seconds > 0.0 and seconds - Settings.reduce_delay_seconds >= 0.0:
+            return seconds - Settings.reduce_delay_seconds
+        return seconds
+
     @staticmethod
     def find_and_click_button(button_name: str, clicks: int = 1, tries: int = 0, x_offset: int = 0, y_offset: int = 0, custom_confidence: float = 0.80, suppress_error: bool = False,
                               bypass_general_adjustment: bool = True, custom_wait: Optional[float] = None):
@@ -348,7 +365,7 @@ class Game:
             width, height = pyautogui.size()
 
             # Get current x,y coordinate of the mouse.
-            curr_x, curr_y = pyautogui.position()
+            curr_x, curr_y = InputDriver.position()
 
             # Depending on where the mouse is, move the mouse off the game window left or right.
             if curr_x == width - 100 or curr_x == 100:
@@ -794,15 +811,32 @@ class Game:
         """
         MessageLog.print_message(f"\n[INFO] Now beginning process to check for popups...")
 
+        # Score the Summon Selection screen, the popups and their buttons against a single screenshot per attempt.
+        popup_candidates = ["buttons/close", "buttons/cancel"]
+        if Settings.farming_mode == "Rise of the Beasts":
+            popup_candidates.append("proud_solo_quest")
+        if Settings.farming_mode == "Event (Token Drawboxes)" or Settings.farming_mode == "Guild Wars":
+            popup_candidates.append("not_enough_treasure")
+
         check_popup_tries = 30
-        while ImageUtils.confirm_location("select_a_summon", tries = 1, suppress_error = True) is False:
+        while True:
+            _, _, popup_locations = ImageUtils.classify_screen(["select_a_summon"] + popup_candidates)
+            if "select_a_summon" in popup_locations:
+                break
+
+            # Give the Support Summon Selection screen as many tries as its adjustment allows like before, as the classification above only looks at a single frame.
+            if Settings.enable_support_summon_selection_screen_adjustment and ImageUtils.confirm_location("select_a_summon", tries = 1, suppress_error = True):
+                break
+
             check_popup_tries -= 1
             if check_popup_tries <= 0:
                 raise RuntimeError("Failed to progress in the Check for Popups process...")
 
-            if Settings.farming_mode == "Rise of the Beasts" and ImageUtils.confirm_location("proud_solo_quest", tries = 1):
+            is_screen_changed = False
+            if "proud_solo_quest" in popup_locations:
                 # Scroll down the screen a little bit because the popup itself is too long for screen sizes around 1080p.
                 MouseUtils.scroll_screen_from_home_button(-400)
+                is_screen_changed = True
 
             # Check for certain popups for certain Farming Modes.
             if (Settings.farming_mode == "Rise of the Beasts" and RiseOfTheBeasts.check_for_rotb_extreme_plus()) or (
@@ -810,14 +844,21 @@ class Game:
                     (Settings.farming_mode == "Event" or Settings.farming_mode == "Event (Token Drawboxes)") and Event.check_for_event_nightmare()):
                 return True
 
+            # Those checks may have clicked through popups of their own, so classify the screen again if anything could have moved since the last frame.
+            if is_screen_changed or Settings.farming_mode in ["Rise of the Beasts", "Special", "Event", "Event (Token Drawboxes)"]:
+                _, _, popup_locations = ImageUtils.classify_screen(popup_candidates)
+
             # If the bot tried to repeat a Extreme/Impossible difficulty Event Raid and it lacked the treasures to host it, go back to select the Mission again.
-            if (Settings.farming_mode == "Event (Token Drawboxes)" or Settings.farming_mode == "Guild Wars") and ImageUtils.confirm_location("not_enough_treasure", tries = 1):
+            if "not_enough_treasure" in popup_locations:
                 Game.find_and_click_button("ok")
                 return True
 
             # Attempt to close any popup by clicking on any detected "Close" and "Cancel" buttons.
-            if Game.find_and_click_button("close", tries = 1, suppress_error = True) is False:
-                Game.find_and_click_button("cancel", tries = 1, suppress_error = True)
+            for button_name in ["close", "cancel"]:
+                button_location = popup_locations.get(f"buttons/{button_name}")
+                if button_location is not None:
+                    MouseUtils.move_and_click_point(button_location[0], button_location[1], button_name)
+                    break
 
             if Settings.debug_mode:
                 MessageLog.print_message("[DEBUG] Have not detected the Support Summon Selection screen yet...")
@@ -955,13 +996,16 @@ class Game:
         """
         if Game._discord_process is not None and Game._discord_process.is_alive():
             MessageLog.print_message("\n[DISCORD] Now terminating Discord process...")
-            while Game._discord_queue.empty() is False:
-                Game.wait(1.0)
-
             Game._discord_queue.put(f"```diff\n- Terminated connection to Discord API for Granblue Automation\n```")
+
+            # Let the Discord process send what is left on the queue and close by itself, only terminating it if it takes too long.
+            Game._discord_queue.put(discord_utils.DiscordNotifier.stop_message)
+            Game._discord_process.join(timeout = Game._discord_shutdown_timeout)
+            if Game._discord_process.is_alive():
+                MessageLog.print_message(f"[WARNING] Discord process did not finish sending messages within {Game._discord_shutdown_timeout} seconds. Terminating it now...")
+                Game._discord_process.terminate()
+
             MessageLog.print_message("[DISCORD] Terminated connection to Discord API and terminating its Thread.")
-            Game.wait(1.0)
-            Game._discord_process.terminate()
 
         return None
 
@@ -994,12 +1038,46 @@ class Game:
         """
         exception_occurred = False
         try:
+            # Drop debug messages before they are formatted unless debug mode is on and optionally keep a copy of the log as JSON lines.
+            MessageLog.set_level(logging.DEBUG if Settings.debug_mode else logging.INFO)
+            MessageLog.enable_json_sink(Settings.log_json_path)
+
             Game.start_discord_process()
 
+            # Pick up changes to the delays and adjustments in settings.json while farming.
+            Settings.start_watching()
+
             if Settings.enable_test_for_home_screen:
                 Game.go_back_home(confirm_location_check = True, test_mode = True)
                 return True
 
+            # Use the calibrated scales for this device so that image matching does not need to try a range of scales.
+            if Settings.enable_scale_profile and ScaleCalibration.load():
+                preload_scales = sorted(set(ImageUtils._family_scales.values()))
+            else:
+                preload_scales = ImageUtils._get_scales()
+
+            # Load the templates into memory before any image matching happens.
+            if Settings.enable_template_preload:
+                TemplateCache.preload(preload_scales)
+
+            # Start building the EasyOCR reader in the background if it may be needed to count the farmed items.
+            if Settings.enable_easyocr_fallback and Settings.item_name not in ["EXP", "Angel Halo Weapons", "Repeated Runs"]:
+                ImageUtils.warm_up_reader()
+
+            # Compile the combat scripts before the first battle so that a malformed script is caught right away instead of in the middle of a battle.
+            if Settings.farming_mode == "Scheduler":
+                ScriptCache.schedule(Settings.combat_script)
+            elif Settings.farming_mode.endswith("V2"):
+                ScriptCache.battles(Settings.combat_script)
+            else:
+                ScriptCache.combat_script(Settings.combat_script)
+                # The scripts of the features that are turned off are never run so a stale one should not stop Farming Mode.
+                if Settings.enable_nightmare:
+                    ScriptCache.combat_script(Settings.nightmare_combat_script)
+                if Settings.enable_defender:
+                    ScriptCache.combat_script(Settings.defender_combat_script)
+
             # Calibrate the dimensions of the bot window on bot launch.
             if Settings.farming_mode.endswith("V2"):
                 Window.calibrate()
@@ -1073,6 +1151,16 @@ class Game:
             MessageLog.print_message(f"\n[ERROR] Bot encountered exception in Farming Mode: \n{traceback.format_exc()}")
             ImageUtils.generate_alert(f"Bot encountered exception in Farming Mode: \n{e}")
 
+        # Keep the learned regions of interest for the next session.
+        RoiRegistry.save()
+
+        if Settings.enable_settle_detection:
+            SettleDetector.log_summary()
+        CombatStateMachine.log_summary()
+
+        Settings.stop_watching()
+        ImageUtils.stop_reader_warm_up()
+
         Game.stop_discord_process()
 
         if exception_occurred:
@@ -15,7 +15,7 @@ class Arcarum:
     Provides the navigation and any necessary utility functions to handle the Arcarum game mode.
     """
 
-    _expedition: str = Settings.mission_name
+    _expedition: str = None
     _first_run: bool = True
     _encountered_boss: bool = False
 
@@ -173,6 +173,8 @@ class Arcarum:
         """
         from bot.game import Game
 
+        Arcarum._expedition = Settings.mission_name
+
         runs_completed = 0
         while runs_completed < Settings.item_amount_to_farm:
             Arcarum._navigate_to_map()
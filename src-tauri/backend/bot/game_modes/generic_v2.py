@@ -4,7 +4,7 @@ from utils.image_utils import ImageUtils
 from utils.mouse_utils import MouseUtils
 from bot.window import Window
 from bot.combat_mode_v2 import CombatModeV2 as Combat
-from utils.parser import Parser
+from utils.script_cache import ScriptCache
 import numpy as np
 from time import sleep
 
@@ -19,8 +19,8 @@ class GenericV2:
         from bot.game import Game
         ImageUtils._summon_selection_element_not_selected = False
 
-        Log.print_message(f"[GenericV2] Parsing combat script: {Settings.combat_script_name}")
-        battles_seq = Parser.parse_battles(Settings.combat_script)
+        Log.print_message(f"[GenericV2] Loading combat script: {Settings.combat_script_name}")
+        battles_seq = ScriptCache.battles(Settings.combat_script)
 
         for battle in battles_seq:
 
@@ -38,7 +38,7 @@ class GenericV2:
                 Window.goto(url)
                 Window.sub_prepare_loot()
                 # reload instead of back for first time
-                Combat.load_actions(actions[:-1] + [("_sub_reload",{})])
+                Combat.load_actions(actions[:-1] + (("_sub_reload", ()),))
                 # start first time
                 GenericV2.single_battle_sub_back(summon)         
                 # load the original script
@@ -52,8 +52,8 @@ class GenericV2:
                         Game._move_mouse_security_check()
     
             else:
-                if ("enablefullauto",{}) in actions:
-                    actions.append(('_wait_for_end' ,{}))
+                if ("enablefullauto", ()) in actions:
+                    actions += (("_wait_for_end", ()),)
                 Combat.load_actions(actions)
                 
                 for i in range (0, repeat):
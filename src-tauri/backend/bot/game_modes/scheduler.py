@@ -1,14 +1,12 @@
-import copy
-
 from utils.settings import Settings
 from utils.message_log import MessageLog
 from utils.image_utils import ImageUtils
 from utils.mouse_utils import MouseUtils
 from bot.combat_mode import CombatMode
+from utils.script_cache import ScriptCache
 from bot.window import Window
-import json
 
-from typing import List, Dict
+from typing import Dict, Tuple
 
 class SchedulerException(Exception):
     def __init__(self, message):
@@ -47,9 +45,8 @@ class Scheduler:
         """
         from bot.game import Game
 
-        loaded_script = copy.deepcopy(Settings.combat_script)
-        joined = ''.join(loaded_script)
-        json_script: List[Dict] = json.loads(joined)
+        # The schedule and the combat script of every entry are compiled only the first time and shared by every run after that, so they are read-only here.
+        json_script: Tuple[Dict, ...] = ScriptCache.schedule(Settings.combat_script)
 
         for index, script in enumerate(json_script, start=1):
             self.print_message(f"Running script #{index}")
@@ -60,7 +57,8 @@ class Scheduler:
             max_attempt = script.get('repeat', 1)
             battle_url = script['url']
             summons = script['summons']
-            script_command = script.get('combat_script')
+            # An entry without a combat script runs an empty one that goes straight to Full Auto, which is also what was compiled up front.
+            script_command = script.get('combat_script') or []
             elements = script.get("elements")
             exp_header = script.get("exp_header")
             ok_button = script.get("ok_button")
@@ -86,7 +84,7 @@ class Scheduler:
                             # Handle the rare case where joining the Raid after selecting the Summon and Party led the bot to the Quest Results screen with no loot to collect.
                             if ImageUtils.confirm_location("no_loot", disable_adjustment = True):
                                 MessageLog.print_message("\n[RAID] Seems that the Raid just ended. Moving back to the Home screen and joining another Raid...")
-                            elif CombatMode.start_combat_mode(script_commands=script_command, use_deep_copy=True, exp_header=exp_header):
+                            elif CombatMode.start_combat_mode(script_commands=script_command, exp_header=exp_header):
                                 Game.collect_loot(is_completed = True, ok_button=ok_button)
                                 Game._move_mouse_security_check()
                                 Game._delay_between_runs(in_seconds=delay_between_run)
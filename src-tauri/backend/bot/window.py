@@ -2,13 +2,13 @@ import cv2
 from PIL import Image
 from typing import List, Tuple
 from utils.settings import Settings
-from pyautogui import size as get_screen_size, hold, screenshot, click , press
-import pyautogui as pya
+from pyautogui import size as get_screen_size
 from utils.message_log import MessageLog as Log
 from utils.mouse_utils import MouseUtils as mouse
+from utils.input_driver import InputDriver
+from utils.capture import Capture
 from time import sleep
 from pyperclip import paste, copy
-import numpy as np
 
 class Window():
 
@@ -34,15 +34,17 @@ class Window():
             pattern: if match, will not go to the url
         """
         mouse.move_to(160, 55)
-        click()
+        InputDriver.click()
+        sleep(.03)
+        InputDriver.hotkey('ctrl', 'a')
+        InputDriver.hotkey('ctrl', 'c')
+        # Give the browser a moment to put the URL on the clipboard.
         sleep(.03)
-        with hold('ctrl'):
-            press(['a', 'c'])
         if paste() != url and not paste().startswith(pattern):
             copy(url)
-            pya.hotkey('ctrl', 'v')
+            InputDriver.hotkey('ctrl', 'v')
             sleep(.03)
-            press('enter')
+            InputDriver.press('enter')
 
 
     @staticmethod
@@ -56,15 +58,17 @@ class Window():
             mouse.move_to(Window.sub_start+160, Window.sub_top-55)
         else:
             mouse.move_to(Window.start+160, Window.top-55)
-        click()
+        InputDriver.click()
+        sleep(.03)
+        InputDriver.hotkey('ctrl', 'a')
+        InputDriver.hotkey('ctrl', 'c')
+        # Give the browser a moment to put the URL on the clipboard.
         sleep(.03)
-        with hold('ctrl'):
-            press(['a', 'c'])
         if paste() != url and not paste().startswith(pattern):
             copy(url)
-            pya.hotkey('ctrl', 'v')
+            InputDriver.hotkey('ctrl', 'v')
             sleep(.03)
-            press('enter')
+            InputDriver.press('enter')
 
     @staticmethod
     def sub_prepare_loot() -> None:
@@ -80,11 +84,9 @@ class Window():
                 mouse.move_to(Window.sub_start+160, Window.sub_top-55)
             elif not is_focus:
                 mouse.move_to(Window.start+160, Window.top-55)
-            click()
+            InputDriver.click()
 
-        pya.keyDown('f5')
-        sleep(np.random.uniform(0.04,0.15))
-        pya.keyUp('f5')
+        InputDriver.press('f5')
 
     @staticmethod
     def calibrate(display_info_check: bool = False) -> None:
@@ -122,7 +124,7 @@ class Window():
         
         calibraion_window = list(zip(calibration_left, calibration_right))
 
-        img = screenshot(region=(0,0, screen_w, screen_h))
+        img = Capture.grab(region=(0,0, screen_w, screen_h))
 
         left_width, bar_height = ImageUtils.get_button_dimensions("calibration_left")
         right_width, _ = ImageUtils.get_button_dimensions("calibration_right")
@@ -135,8 +137,8 @@ class Window():
             # serach up to find color
             for j in range (left_y, 3, -1):
                 # check if there are 3 consecutive pixel that match the color of browser top
-                if img.getpixel((left_x+2, j)) == img.getpixel((left_x+2, j-1))\
-                    == img.getpixel((left_x+2, j-2)) == Window.BROWSER_TOP_COLOR:
+                if tuple(img[j, left_x+2]) == tuple(img[j-1, left_x+2])\
+                    == tuple(img[j-2, left_x+2]) == Window.BROWSER_TOP_COLOR:
 
                     if win_idx==0:
                         Window.start = left_x
@@ -32,6 +32,9 @@ class MainDriver:
         # Initialize the Game class and start Farming Mode.
         self._game = Game()
         self._game.start_farming_mode()
+
+        # The bot process exits without running atexit handlers so write out the queued messages now.
+        MessageLog.stop()
         return None
 
     def start_bot(self):
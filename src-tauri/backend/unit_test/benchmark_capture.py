@@ -0,0 +1,9 @@
+import pyautogui
+
+from utils.capture import Capture
+
+# Reports the capture FPS of each available backend on this machine, both for the whole screen and for a typical game window.
+if __name__ == "__main__":
+    screen_w, screen_h = pyautogui.size()
+    print("Whole screen:", Capture.benchmark(duration = 3.0))
+    print("Game window:", Capture.benchmark(duration = 3.0, region = (0, 0, min(500, screen_w), min(1080, screen_h))))
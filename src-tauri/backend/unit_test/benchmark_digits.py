@@ -0,0 +1,56 @@
+import glob
+import os
+import time
+
+import cv2
+
+from utils.digit_recognizer import DigitRecognizer
+from utils.image_utils import ImageUtils
+
+# Compares the accuracy and the latency of reading the item amounts on the Quest Results test image with the digit recognizer and with EasyOCR.
+# Run from the /src-tauri/ folder so that the /images/ folder can be found. EasyOCR is only benchmarked if its models were downloaded to /backend/model/ before.
+_fixture_path = os.path.join(os.path.dirname(__file__), "..", "tests", "test_item_detection.png")
+
+# The location of each item that has an amount next to it and the text of that amount.
+_expected_texts = [
+    ((68, 578), "x10"),
+    ((326, 579), "x3"),
+    ((412, 578), "x2"),
+    ((68, 639), "x7"),
+    ((150, 639), "x6"),
+    ((242, 639), "x3"),
+    ((411, 639), "x4"),
+    ((153, 700), "x2"),
+    ((151, 578), None),
+    ((328, 639), None)
+]
+
+
+def benchmark(name, read_all, crops, repeats = 50):
+    results = read_all(crops)
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        read_all(crops)
+    elapsed = (time.perf_counter() - start_time) / repeats
+
+    correct = 0
+    for result, (_, expected_text) in zip(results, _expected_texts):
+        if ImageUtils._parse_item_count(result) == ImageUtils._parse_item_count([expected_text] if expected_text else []):
+            correct += 1
+
+    print(f"{name}: {correct}/{len(crops)} correct, {elapsed * 1000:.2f} ms for all crops, {elapsed * 1000 / len(crops):.3f} ms per crop")
+
+
+if __name__ == "__main__":
+    frame = cv2.cvtColor(cv2.imread(_fixture_path), cv2.COLOR_BGR2RGB)
+    crops = [ImageUtils._crop_item_count(frame, location) for location, _ in _expected_texts]
+
+    benchmark("Digit recognizer", lambda batch: [DigitRecognizer.read(crop)[0] for crop in batch], crops)
+
+    if len(glob.glob(os.path.join(os.getcwd(), "backend", "model", "*.pth"))) != 0:
+        start_time = time.perf_counter()
+        reader = ImageUtils._get_reader()
+        print(f"EasyOCR initialization: {time.perf_counter() - start_time:.2f} s")
+        benchmark("EasyOCR", lambda batch: reader.readtext_batched(batch, n_width = 30, n_height = 25, batch_size = len(batch), detail = 0), crops, repeats = 5)
+    else:
+        print("EasyOCR: skipped as its models have not been downloaded.")
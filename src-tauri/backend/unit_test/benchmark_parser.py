@@ -0,0 +1,34 @@
+import time
+
+from utils.parser import Parser
+
+# Measures how long Parser.parse_battles takes for generated scripts of growing size to check that the time grows linearly with the number of lines.
+# Run from the /src-tauri/backend/ folder.
+_battle = [
+    "// Generated battle",
+    "https://game.granbluefantasy.jp/#quest/supporter/305231/1/0/45",
+    "supportSummon:celeste_omega",
+    "repeat:1",
+    "",
+    "quickSummon",
+    "character1.useSkill(1).useSkill(3)",
+    "character3.useSkill(2).target(5)",
+    "summon(6)",
+    "wait(2)",
+    "attack",
+    "enableFullAuto",
+]
+
+
+def generate(battle_count):
+    for _ in range(battle_count):
+        yield from _battle
+
+
+if __name__ == "__main__":
+    for battle_count in [1_000, 10_000, 100_000]:
+        line_count = battle_count * len(_battle)
+        start_time = time.perf_counter()
+        battles = Parser.parse_battles(generate(battle_count))
+        elapsed = time.perf_counter() - start_time
+        print(f"{line_count} lines in {len(battles)} battles: {elapsed * 1000:.1f} ms, {elapsed * 1e6 / line_count:.2f} us per line")
@@ -0,0 +1,82 @@
+import numpy
+import pytest
+
+from utils.settings import Settings
+from utils.image_utils import ImageUtils
+from bot.combat_layout import CombatLayout, CombatLayoutException
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    """Stand in for the screen with a noisy frame of the window at (100, 50) that the tests can change, and count how often the Attack button is matched."""
+    state = {"frame": numpy.random.default_rng(0).integers(0, 255, (700, 500), dtype = numpy.uint8), "attack": (400, 600), "matches": 0}
+
+    def find_button(name, *args, **kwargs):
+        state["matches"] += 1
+        return state["attack"]
+
+    monkeypatch.setattr(Settings, "use_first_notch", False, raising = False)
+    monkeypatch.setattr(ImageUtils, "find_button", find_button)
+    monkeypatch.setattr(ImageUtils, "_capture", lambda *args, **kwargs: state["frame"])
+    monkeypatch.setattr(ImageUtils, "_get_window_region", lambda: (100, 50, 500, 700))
+    CombatLayout.reset()
+    return state
+
+
+def test_computes_every_hotspot_from_the_anchor(screen):
+    assert [CombatLayout.hotspot("character", number) for number in range(1, 5)] == [(80, 723), (160, 723), (240, 723), (320, 723)]
+    assert CombatLayout.hotspot("skill", 3) == (350, 770)
+    assert [CombatLayout.hotspot("target", number) for number in (1, 3, 4, 6)] == [(175, 545), (365, 545), (175, 685), (365, 685)]
+    assert CombatLayout.hotspot("enemy", 2) == (290, 315)
+    assert CombatLayout.hotspot("summon", 6) == (455, 740)
+    assert screen["matches"] == 1
+
+
+def test_uses_the_layout_of_the_first_notch(screen, monkeypatch):
+    monkeypatch.setattr(Settings, "use_first_notch", True, raising = False)
+
+    assert CombatLayout.hotspot("target", 5) == (310, 785)
+    assert CombatLayout.hotspot("character", 2, layout = "v2") == (238, 692)
+
+
+def test_locates_the_anchor_again_only_when_the_frame_drifted(screen):
+    CombatLayout.hotspot("character", 1, verify = True)
+    CombatLayout.hotspot("character", 2, verify = True)
+    assert screen["matches"] == 1
+
+    screen["frame"] = numpy.roll(screen["frame"], 40, axis = 0)
+    screen["attack"] = (400, 640)
+
+    assert CombatLayout.hotspot("character", 1, verify = True) == (80, 763)
+    assert screen["matches"] == 2
+
+
+def test_locates_the_v2_anchor_again_without_a_window_region(screen, monkeypatch):
+    # Combat Mode V2 does not calibrate a window region so the frame is the whole screen.
+    monkeypatch.setattr(ImageUtils, "_get_window_region", lambda: None)
+    CombatLayout.hotspot("character", 1, layout = "v2", verify = True)
+    CombatLayout.hotspot("character", 2, layout = "v2", verify = True)
+    assert screen["matches"] == 1
+
+    screen["frame"] = numpy.random.default_rng(1).integers(0, 255, (700, 500), dtype = numpy.uint8)
+    screen["attack"] = (400, 640)
+
+    assert CombatLayout.hotspot("character", 1, layout = "v2", verify = True) == (118, 732)
+    assert screen["matches"] == 2
+
+
+def test_follows_the_anchor_when_it_is_matched_elsewhere(screen):
+    CombatLayout.anchor("attack")
+    CombatLayout.observe("attack", (401, 601))
+    assert CombatLayout.hotspot("skill", 1) == (180, 770)
+
+    CombatLayout.observe("attack", (420, 600))
+    assert CombatLayout.hotspot("skill", 1) == (200, 770)
+    assert screen["matches"] == 1
+
+
+def test_raises_if_the_anchor_cannot_be_found(screen):
+    screen["attack"] = None
+
+    with pytest.raises(CombatLayoutException):
+        CombatLayout.hotspot("summon", 1)
@@ -0,0 +1,41 @@
+import pytest
+
+from utils.combat_script import CombatScript, CombatScriptError
+
+
+def test_compiles_commands_once_into_instructions():
+    lines = ["// Comment", "Turn 1:", "\tsummon(1).summon(3).wait(2).attack", "\tcharacter1.useSkill(2).target(5).wait(1.5).useSkill(1).attack()", "\tattack.wait(2) # Comment",
+             "end", "", "Turn 3", "\tenableFullAuto.reload", "\tuseGreenPotion.target(2)", "end"]
+
+    instructions = CombatScript.compile(lines)
+
+    assert [(instruction.op, instruction.args) for instruction in instructions] == [
+        ("turn", (1,)),
+        ("summon", ((1, 3), 2.0, True)),
+        ("character", (1, (("useskill", 2), ("target", 5), ("wait", 1.5), ("useskill", 1), ("attack",)))),
+        ("attack", (2.0,)),
+        ("end", ()),
+        ("turn", (3,)),
+        ("enablefullauto", (True,)),
+        ("healingitem", ("usegreenpotion.target(2)",)),
+        ("end", ()),
+    ]
+    assert [instruction.line_number for instruction in instructions] == [2, 3, 4, 5, 6, 8, 9, 10, 11]
+
+
+@pytest.mark.parametrize("line, message", [
+    ("character5.useSkill(1)", "character needs a number from 1 to 4"),
+    ("character1.useSkill(5)", "useSkill needs a number from 1 to 4"),
+    ("character1.target(1)", "target has to follow a useSkill"),
+    ("character1.attack.useSkill(1)", "after attack"),
+    ("summon(7)", "summon needs a number from 1 to 6"),
+    ("wait(soon)", "wait needs the number of seconds"),
+    ("useGreenPotion", "needs a target"),
+    ("attakc", "Unknown command"),
+])
+def test_rejects_malformed_lines_with_their_line_number(line, message):
+    with pytest.raises(CombatScriptError) as error:
+        CombatScript.compile(["Turn 1:", line, "end"])
+
+    assert error.value.line_number == 2
+    assert message in str(error.value)
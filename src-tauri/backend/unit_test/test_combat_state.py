@@ -0,0 +1,86 @@
+import itertools
+
+from utils.settings import Settings
+from utils.image_utils import ImageUtils
+from bot.combat_state import CombatState, CombatStateMachine
+
+
+def _screens(*frames):
+    """Stand in for the classified frames with the templates found on each one, repeating the last one."""
+    frames = list(frames)
+
+    def classify_screen(candidates, *args, **kwargs):
+        found = frames.pop(0) if len(frames) > 1 else frames[0]
+        return None, {}, {name: (10, 20) for name in found if name in candidates}
+
+    return classify_screen
+
+
+def _start(monkeypatch, *frames):
+    classify_screen = _screens(*frames)
+    monkeypatch.setattr(ImageUtils, "classify_screen", classify_screen)
+    # Every frame is different unless a test says otherwise.
+    digests = itertools.count()
+    monkeypatch.setattr(ImageUtils, "frame_digest", lambda *args, **kwargs: next(digests))
+    monkeypatch.setattr(Settings, "wait_fps", 0)
+    monkeypatch.setattr(CombatStateMachine, "_durations", {})
+    monkeypatch.setattr(CombatStateMachine, "_entries", {})
+    CombatStateMachine.reset()
+
+
+def test_classifies_each_frame_into_a_state(monkeypatch):
+    _start(monkeypatch, ["buttons/attack"], ["buttons/attack", "buttons/combat_cancel"], [], ["buttons/next"], ["buttons/party_wipe_indicator", "buttons/attack"],
+           ["exp_gained", "buttons/next"], ["tenshura_exp_gained"])
+
+    states = [CombatStateMachine.update() for _ in range(6)] + [CombatStateMachine.update("tenshura_exp_gained")]
+
+    assert states == [CombatState.AWAIT_INPUT, CombatState.ANIMATING, CombatState.ANIMATING, CombatState.TURN_END, CombatState.WIPED, CombatState.BATTLE_END,
+                      CombatState.BATTLE_END]
+    assert CombatStateMachine.end_screen == "tenshura_exp_gained"
+
+
+def test_moves_on_as_soon_as_the_frame_changes(monkeypatch):
+    _start(monkeypatch, ["buttons/combat_cancel"], [], [], ["buttons/dialog_lyria"], ["buttons/attack"], ["buttons/next"])
+    seen = []
+
+    state = CombatStateMachine.wait_while((CombatState.ANIMATING,), 5.0, on_frame = seen.append)
+
+    assert state == CombatState.AWAIT_INPUT
+    assert len(seen) == 4
+    assert CombatStateMachine.wait_for((CombatState.TURN_END,), 5.0) == CombatState.TURN_END
+
+
+def test_waits_for_a_clicked_attack_to_go_through(monkeypatch):
+    _start(monkeypatch, ["buttons/attack"], ["buttons/attack", "buttons/combat_cancel"], ["buttons/combat_cancel"], [])
+
+    assert CombatStateMachine.wait_for_attack(5.0) is True
+    assert CombatStateMachine.state == CombatState.ANIMATING
+
+
+def test_gives_up_at_the_timeout(monkeypatch):
+    _start(monkeypatch, [])
+
+    assert CombatStateMachine.wait_for((CombatState.AWAIT_INPUT,), 0.05) == CombatState.ANIMATING
+
+
+def test_accounts_the_time_spent_in_each_state(monkeypatch):
+    _start(monkeypatch, ["buttons/attack"], [], ["buttons/attack"])
+
+    for _ in range(3):
+        CombatStateMachine.update()
+    CombatStateMachine.stop()
+    metrics = CombatStateMachine.metrics()
+
+    assert metrics[CombatState.AWAIT_INPUT][1] == 2
+    assert metrics[CombatState.ANIMATING][1] == 1
+    assert all(seconds >= 0 for seconds, _ in metrics.values())
+
+
+def test_skips_classifying_unchanged_frames(monkeypatch):
+    _start(monkeypatch, ["buttons/attack"], ["buttons/next"])
+    monkeypatch.setattr(ImageUtils, "frame_digest", lambda *args, **kwargs: 1)
+
+    states = [CombatStateMachine.update() for _ in range(3)]
+
+    assert states == [CombatState.AWAIT_INPUT] * 3
+    assert CombatStateMachine.update("tenshura_exp_gained") == CombatState.TURN_END
@@ -0,0 +1,92 @@
+import asyncio
+import queue
+
+from utils.discord_notifier import DiscordNotifier
+
+
+class _RateLimited(Exception):
+    """Stands in for the HTTPException that discord.py raises when a DM is rate limited."""
+
+    status = 429
+    retry_after = 0.01
+
+
+class _SlowRateLimited(_RateLimited):
+    retry_after = 1.0
+
+
+class _FakeUser:
+    """Stands in for the Discord user and records the DMs that it receives."""
+
+    def __init__(self, rate_limits: int = 0, error: type = _RateLimited):
+        self.rate_limits = rate_limits
+        self.error = error
+        self.attempts = 0
+        self.messages = []
+
+    async def send(self, content: str):
+        self.attempts += 1
+        if self.rate_limits > 0:
+            self.rate_limits -= 1
+            raise self.error("429 Too Many Requests")
+        self.messages.append(content)
+
+
+def _run(notifier: DiscordNotifier):
+    asyncio.run(asyncio.wait_for(notifier.run(), timeout = 5))
+
+
+def test_bursts_are_sent_as_one_dm():
+    message_queue = queue.Queue()
+    user = _FakeUser()
+    for message in ["> 1x __Item__ gained", "> 2x __Item__ gained", "> Runs completed"]:
+        message_queue.put(message)
+    message_queue.put(DiscordNotifier.stop_message)
+
+    notifier = DiscordNotifier(message_queue, user.send, coalesce_window = 0.1)
+    _run(notifier)
+
+    assert user.messages == ["> 1x __Item__ gained\n> 2x __Item__ gained\n> Runs completed"]
+    assert notifier.message_count == 3
+    assert notifier.sent_count == 1
+
+
+def test_long_bursts_are_split_at_the_length_limit():
+    message_queue = queue.Queue()
+    user = _FakeUser()
+    for _ in range(3):
+        message_queue.put("x" * 900)
+    message_queue.put(DiscordNotifier.stop_message)
+
+    _run(DiscordNotifier(message_queue, user.send, coalesce_window = 0.1))
+
+    assert [len(message) for message in user.messages] == [1801, 900]
+
+
+def test_rate_limits_are_retried_with_backoff():
+    message_queue = queue.Queue()
+    user = _FakeUser(rate_limits = 2)
+    message_queue.put("> Runs completed")
+    message_queue.put(DiscordNotifier.stop_message)
+
+    notifier = DiscordNotifier(message_queue, user.send, coalesce_window = 0.0, backoff = 0.01)
+    _run(notifier)
+
+    assert user.attempts == 3
+    assert user.messages == ["> Runs completed"]
+    assert notifier.dropped_count == 0
+
+
+def test_stop_only_waits_for_the_drain_timeout():
+    message_queue = queue.Queue()
+    user = _FakeUser(rate_limits = 100, error = _SlowRateLimited)
+    message_queue.put("> Bot encountered exception")
+    message_queue.put(DiscordNotifier.stop_message)
+
+    # Waiting out the rate limit would go past the drain timeout so the message is given up on right away.
+    notifier = DiscordNotifier(message_queue, user.send, drain_timeout = 0.5)
+    _run(notifier)
+
+    assert user.attempts == 1
+    assert user.messages == []
+    assert notifier.dropped_count == 1
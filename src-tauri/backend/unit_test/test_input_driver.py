@@ -0,0 +1,57 @@
+import numpy
+
+from utils.capture import Capture
+from utils.input_driver import InputDriver, InputSequence, RecordingInput
+from utils.mouse_utils import MouseUtils
+from utils.settle_detector import SettleDetector
+
+
+def test_sequences_are_sent_on_schedule(monkeypatch):
+    backend = RecordingInput()
+    monkeypatch.setattr(InputDriver, "_backend", backend)
+
+    sequence = InputSequence().move_along(numpy.array([(10, 10), (20, 20), (30, 30)]), 0.06).click(0.02).pause(0.05).press("enter", 0.01)
+    InputDriver.play(sequence)
+
+    assert backend.events == [("move_to", 10, 10), ("move_to", 20, 20), ("move_to", 30, 30), ("mouse_down",), ("mouse_up",), ("key_down", "enter"), ("key_up", "enter")]
+    assert backend.timestamps[-1] - backend.timestamps[0] >= 0.06 + 0.02 + 0.05
+
+
+def test_chained_clicks_wait_for_the_screen_between_them(monkeypatch):
+    backend = RecordingInput(0, 0)
+    monkeypatch.setattr(InputDriver, "_backend", backend)
+    monkeypatch.setattr(Capture, "invalidate", lambda: None)
+    monkeypatch.setattr(MouseUtils, "_randomize_point", lambda x, y, image_name: (x, y))
+    monkeypatch.setattr(SettleDetector, "capture_baseline", lambda: len(backend.events))
+
+    settled = []
+    monkeypatch.setattr(SettleDetector, "wait", lambda image_name, baseline, max_wait: settled.append((image_name, baseline, len(backend.events))))
+
+    MouseUtils.move_and_click_chain([(100, 200, "template_skill"), (300, 400, "template_target")])
+
+    clicks = [index for index, event in enumerate(backend.events) if event == ("mouse_up",)]
+    assert len(clicks) == 2
+    assert backend.position() == (300, 400)
+
+    # Each click waits for the screen to settle before the cursor moves on to the next point.
+    assert [name for name, _, _ in settled] == ["template_skill", "template_target"]
+    assert [events for _, _, events in settled] == [clicks[0] + 1, clicks[1] + 1]
+    assert settled[0][1] < clicks[0]
+
+
+def test_scrolls_wait_for_the_page_to_stop_moving(monkeypatch):
+    backend = RecordingInput(0, 0)
+    monkeypatch.setattr(InputDriver, "_backend", backend)
+    monkeypatch.setattr(Capture, "invalidate", lambda: None)
+
+    settled = []
+    monkeypatch.setattr(SettleDetector, "wait", lambda image_name, baseline, max_wait: settled.append((image_name, baseline, max_wait, backend.events[-1])))
+
+    # Without settle detection the old fixed pause is kept after the scroll.
+    monkeypatch.setattr(SettleDetector, "capture_baseline", lambda: None)
+    MouseUtils.scroll_screen(100, 200, -700)
+
+    monkeypatch.setattr(SettleDetector, "capture_baseline", lambda: "baseline")
+    MouseUtils.scroll_screen(100, 200, 3)
+
+    assert settled == [("scroll", None, MouseUtils._scroll_pause, ("scroll", -700, 100, 200)), ("scroll", "baseline", MouseUtils._scroll_max_wait, ("scroll", 3, 100, 200))]
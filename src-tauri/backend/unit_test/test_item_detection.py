@@ -0,0 +1,123 @@
+import os
+import sys
+import threading
+import types
+
+import cv2
+import pytest
+
+from utils.settings import Settings
+from utils.capture import Capture
+from utils.image_utils import ImageUtils
+from utils.digit_recognizer import DigitRecognizer
+
+# The Quest Results screen with items detected as Cyclone Orb x3, Tempest Whorl x2, Sagittarius Omega Anima x4, Horseman's Plate x7 and x3 and Earth Grimoire without an amount.
+# Run from the /src-tauri/ folder so that the /images/ folder can be found.
+_fixture_path = os.path.join(os.path.dirname(__file__), "..", "tests", "test_item_detection.png")
+_expected_amounts = {
+    "Cyclone Orb": 3,
+    "Tempest Whorl": 2,
+    "Sagittarius Omega Anima": 4,
+    "Horseman's Plate": 10,
+    "Earth Grimoire": 1
+}
+
+
+class _RecordingReader:
+    """Stands in for the EasyOCR reader and records the crops that it receives."""
+
+    def __init__(self, text = None):
+        self.text = text
+        self.batches = []
+
+    def readtext_batched(self, crops, **kwargs):
+        self.batches.append([crop.copy() for crop in crops])
+        return [[self.text] if self.text else [] for _ in crops]
+
+
+@pytest.fixture
+def loot_screen(monkeypatch):
+    frame = cv2.cvtColor(cv2.imread(_fixture_path), cv2.COLOR_BGR2RGB)
+    monkeypatch.setattr(Capture, "grab", staticmethod(lambda region = None: frame))
+    monkeypatch.setattr(Capture, "grab_gray", staticmethod(lambda region = None, use_cache = True: cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)))
+    monkeypatch.setattr(Settings, "window_left", None)
+    monkeypatch.setattr(Settings, "additional_calibration_required", False)
+    return frame
+
+
+def test_parse_item_count():
+    assert ImageUtils._parse_item_count(["x3"]) == 3
+    assert ImageUtils._parse_item_count(["x7"]) == 7
+    assert ImageUtils._parse_item_count([]) == 1
+    # Zeroes are skipped by the digit parsing so only the last non-zero digit counts.
+    assert ImageUtils._parse_item_count(["x10"]) == 1
+
+
+def test_find_farmed_items_crops_single_frame(loot_screen, monkeypatch):
+    crops = []
+    read = DigitRecognizer.read
+    monkeypatch.setattr(DigitRecognizer, "read", staticmethod(lambda crop: crops.append(crop.copy()) or read(crop)))
+
+    assert ImageUtils.find_farmed_items("Horseman's Plate", take_screenshot = False) == 10
+
+    # Both amounts are cut from the same areas that used to be screenshotted.
+    assert len(crops) == 2
+    for crop, (x, y) in zip(crops, [(68, 639), (242, 639)]):
+        assert (crop == loot_screen[y - 5:y + 20, x + 10:x + 40]).all()
+
+
+def test_find_farmed_items_amounts(loot_screen):
+    for item_name, amount in _expected_amounts.items():
+        assert ImageUtils.find_farmed_items(item_name, take_screenshot = False) == amount
+
+
+def test_find_farmed_items_easyocr_fallback(loot_screen, monkeypatch):
+    reader = _RecordingReader("x4")
+    monkeypatch.setattr(ImageUtils, "_reader", reader)
+    monkeypatch.setattr(DigitRecognizer, "_max_distance", -1.0)
+
+    # EasyOCR is left alone unless the fallback is enabled and the uncertain amounts are each counted as a single item.
+    monkeypatch.setattr(Settings, "enable_easyocr_fallback", False)
+    assert ImageUtils.find_farmed_items("Horseman's Plate", take_screenshot = False) == 2
+    assert len(reader.batches) == 0
+
+    # Amounts that the digit recognizer is not certain about are sent to EasyOCR in a single batch.
+    monkeypatch.setattr(Settings, "enable_easyocr_fallback", True)
+    assert ImageUtils.find_farmed_items("Horseman's Plate", take_screenshot = False) == 8
+    assert len(reader.batches) == 1
+    assert len(reader.batches[0]) == 2
+
+
+def test_stand_in_glyphs_are_never_certain(monkeypatch):
+    digit = cv2.imread(os.path.join(DigitRecognizer._glyph_dir, "5_standin.png"), cv2.IMREAD_GRAYSCALE)
+    crop = cv2.copyMakeBorder(digit, 4, 4, 4, 4, cv2.BORDER_CONSTANT, value = 0)
+
+    assert DigitRecognizer.read(crop) == (["x5"], False)
+
+
+def test_reader_is_warmed_up_once_in_background(monkeypatch):
+    created = []
+    release = threading.Event()
+
+    class _FakeReader:
+        def __init__(self, languages, model_storage_directory = None, gpu = True):
+            release.wait(5)
+            created.append((threading.current_thread().name, gpu))
+
+    monkeypatch.setitem(sys.modules, "easyocr", types.SimpleNamespace(Reader = _FakeReader))
+    monkeypatch.setattr(ImageUtils, "_has_gpu", staticmethod(lambda: False))
+    monkeypatch.setattr(ImageUtils, "_reader", None)
+    monkeypatch.setattr(ImageUtils, "_reader_future", None)
+
+    # Warming up returns right away and repeated calls share the same future.
+    ImageUtils.warm_up_reader()
+    ImageUtils.warm_up_reader()
+    assert len(created) == 0
+
+    release.set()
+    reader = ImageUtils._get_reader()
+    assert isinstance(reader, _FakeReader)
+    assert ImageUtils._get_reader() is reader
+    assert len(created) == 1
+    assert created[0][0].startswith("easyocr")
+    assert created[0][1] is False
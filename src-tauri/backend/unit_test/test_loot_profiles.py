@@ -0,0 +1,21 @@
+from utils.loot_profiles import LootProfiles
+
+# Run from the /src-tauri/ folder so that images/loot_profiles.json can be found.
+
+
+def test_item_profiles():
+    assert LootProfiles.get("Sagittarius Omega Anima")["confidence"] == 0.99
+    assert LootProfiles.get("Horseman's Plate")["confidence"] == 0.85
+    assert LootProfiles.get("Horseman's Plate")["dedupRadius"] == 1
+
+    # Items that are not in any family use the default profile.
+    assert LootProfiles.get("Cyclone Orb") is LootProfiles.get_default()
+    assert LootProfiles.get_default()["confidence"] is None
+    assert tuple(LootProfiles.get_default()["cropSize"]) == (30, 25)
+
+
+def test_deduplicate():
+    locations = [(68, 639), (69, 639), (242, 639), (68, 640), (70, 639), (242, 700)]
+    assert LootProfiles.deduplicate(locations, 1) == [(68, 639), (242, 639), (70, 639), (242, 700)]
+    assert LootProfiles.deduplicate(locations, 2) == [(68, 639), (242, 639), (242, 700)]
+    assert LootProfiles.deduplicate(locations, 0) == locations
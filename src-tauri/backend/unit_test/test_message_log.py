@@ -0,0 +1,18 @@
+import json
+import logging
+
+from utils.message_log import MessageLog
+
+
+def test_levels_and_json_sink(tmp_path, monkeypatch):
+    json_path = tmp_path / "log.jsonl"
+    monkeypatch.setattr(MessageLog, "_level", logging.INFO)
+
+    MessageLog.enable_json_sink(str(json_path))
+    MessageLog.print_message("[DEBUG] Dropped before formatting.")
+    MessageLog.print_message("\n[WARNING] Kept.")
+    MessageLog.print_message("Untagged messages are INFO.")
+    MessageLog.enable_json_sink(None)
+
+    records = [json.loads(line) for line in json_path.read_text(encoding = "utf-8").splitlines()]
+    assert [(record["level"], record["message"]) for record in records] == [("WARNING", "[WARNING] Kept."), ("INFO", "Untagged messages are INFO.")]
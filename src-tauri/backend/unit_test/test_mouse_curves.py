@@ -0,0 +1,20 @@
+import numpy as np
+
+from utils.mouse_curves import MouseCurves
+
+
+def test_curves_connect_the_points():
+    for start, end, point_count in [((0, 0), (500, 300), 50), ((800, 600), (120, 640), 20), ((10, 10), (10, 10), 5), ((300, 200), (301, 200), 1)]:
+        curve = MouseCurves.generate(start, end, point_count)
+        assert curve.shape == (max(2, point_count), 2)
+        assert tuple(curve[0]) == start
+        assert tuple(curve[-1]) == end
+
+        # The curve stays near the straight line between the points.
+        distance = np.hypot(end[0] - start[0], end[1] - start[1])
+        assert np.all(np.abs(curve - np.asarray(start)) <= distance * 1.5 + 1)
+
+
+def test_curves_vary_between_moves():
+    curves = {MouseCurves.generate((0, 0), (600, 400), 30).tobytes() for _ in range(20)}
+    assert len(curves) > 1
@@ -1,5 +1,8 @@
+import pytest
+
 from utils.settings import Settings
 from utils.parser import Parser
+from utils.combat_script import CombatScriptError
 
 case = [    "// This script starts Semi-Auto mode on Turn 1.",
             "// It will go uninterrupted until either the party wipes or the quest/raid ends.",
@@ -7,14 +10,48 @@ case = [    "// This script starts Semi-Auto mode on Turn 1.",
             "",
             "https://game.granbluefantasy.jp/#quest/supporter/800021/22",
             "supportSummon:Kaguya",
+            "repeat:1",
             "",
             "quickSummon",
             "subBack",
             "https://game.granbluefantasy.jp/#quest/supporter/800021/22",
             "supportSummon:Kaguya",
+            "repeat:default",
             "",
             "quickSummon",
             "character1.useSkill(2).useSkill(4)",
+            "  character3.useSkill( 3 ).target(6)",
+            "summon(6)",
+            "wait(10)",
             "subBack"]
 
-print(Parser.parse_battles(case))
\ No newline at end of file
+
+def test_parse_battles(monkeypatch):
+    monkeypatch.setattr(Settings, "item_amount_to_farm", 5, raising = False)
+
+    battles = Parser.parse_battles(case)
+
+    url = "https://game.granbluefantasy.jp/#quest/supporter/800021/22"
+    assert battles == [
+        ((url, "kaguya", 1), (("quicksummon", ()), ("subback", ()))),
+        ((url, "kaguya", 5), (("quicksummon", ()), ("selectchar", (0,)), ("useskill", (1,)), ("useskill", (3,)), ("changechar", (2,)), ("useskill", (2,)),
+                              ("target", (5,)), ("deselectchar", ()), ("usesummon", (5,)), ("wait", (10.0,)), ("subback", ()))),
+    ]
+
+
+@pytest.mark.parametrize("line, column", [
+    ("  character1.useSkill(12)", 23),
+    ("character1.target(2)", 12),
+    ("character1.useSkill(1).attakc", 24),
+    ("summon(x)", 8),
+    ("attakc", 1),
+])
+def test_errors_point_at_the_line_and_column(line, column):
+    with pytest.raises(CombatScriptError) as error:
+        Parser.parse_battles(case[:10] + [line])
+
+    assert (error.value.line_number, error.value.column) == (11, column)
+
+
+if __name__ == "__main__":
+    print(Parser.parse_battles(case))
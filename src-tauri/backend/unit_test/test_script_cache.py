@@ -0,0 +1,35 @@
+import json
+
+from utils.script_cache import ScriptCache
+
+
+def test_reuses_the_compiled_plan_for_the_same_content():
+    lines = ["Turn 1:", "\tcharacter1.useSkill(1)", "end"]
+    misses = ScriptCache.misses
+
+    instructions = ScriptCache.combat_script(lines)
+
+    assert ScriptCache.combat_script(list(lines)) is instructions
+    assert ScriptCache.combat_script(lines + ["attack"]) is not instructions
+    assert ScriptCache.misses == misses + 2
+
+
+def test_keeps_the_kinds_of_plans_apart():
+    lines = ["https://game.granbluefantasy.jp/#quest/supporter/1/1", "supportSummon:Lucifer", "repeat:2", "character1.useSkill(1)"]
+
+    battles = ScriptCache.battles(lines)
+
+    assert battles is ScriptCache.battles(lines)
+    assert battles == ((("https://game.granbluefantasy.jp/#quest/supporter/1/1", "lucifer", 2), (("selectchar", (0,)), ("useskill", (0,)))),)
+
+
+def test_compiles_the_combat_script_of_every_schedule_entry():
+    combat_script = ["Turn 1:", "\tsummon(2)", "end"]
+    lines = json.dumps([{"url": "https://example.com", "summons": [], "combat_script": combat_script}], indent = 1).splitlines(keepends = True)
+
+    entries = ScriptCache.schedule(lines)
+    misses = ScriptCache.misses
+
+    assert ScriptCache.schedule(lines) is entries
+    assert ScriptCache.combat_script(entries[0]["combat_script"])[1].args == ((2,), None, False)
+    assert ScriptCache.misses == misses
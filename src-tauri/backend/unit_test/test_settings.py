@@ -0,0 +1,36 @@
+import json
+import os
+
+import pytest
+
+from utils.settings import Settings
+
+
+def test_reload_only_applies_hot_settings(tmp_path, monkeypatch):
+    Settings.load()
+    settings_path = tmp_path / "settings.json"
+    settings_path.write_text(json.dumps({"adjustment": {"adjustCaptcha": Settings.adjust_captcha + 1}, "device": {"confidence": 0.1}}))
+    os.utime(settings_path, (0, 0))
+
+    monkeypatch.setattr(Settings, "_settings_path", str(settings_path))
+    monkeypatch.setattr(Settings, "_settings_mtime", 1.0)
+    monkeypatch.setattr(Settings, "adjust_captcha", Settings.adjust_captcha)
+    monkeypatch.setattr(Settings, "confidence", Settings.confidence)
+    expected_captcha = Settings.adjust_captcha + 1
+    expected_confidence = Settings.confidence
+
+    assert "adjust_captcha" in Settings.reload_if_changed()
+    assert Settings.adjust_captcha == expected_captcha
+    assert Settings.confidence == expected_confidence
+
+    # Nothing is read again until the file is modified.
+    assert Settings.reload_if_changed() == []
+
+
+def test_settings_are_kept_in_slots():
+    assert not hasattr(Settings, "__dict__")
+    assert "debug_mode" in type(Settings).__slots__
+
+    # A misspelled setting cannot be assigned.
+    with pytest.raises(AttributeError):
+        Settings.debug_mod = True
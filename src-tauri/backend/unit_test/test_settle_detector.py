@@ -0,0 +1,38 @@
+import numpy
+
+from utils.settings import Settings
+from utils.settle_detector import SettleDetector
+
+
+def _frames(*values: int):
+    """Stand in for the grabbed frames with solid frames of the gray levels, repeating the last one."""
+    frames = [numpy.full((40, 60), value, dtype = numpy.uint8) for value in values]
+
+    def grab():
+        return frames.pop(0) if len(frames) > 1 else frames[0]
+
+    return grab
+
+
+def test_returns_once_the_window_settled(monkeypatch):
+    monkeypatch.setattr(Settings, "settle_stable_time", 50, raising = False)
+    monkeypatch.setattr(SettleDetector, "_poll_interval", 0.01)
+    monkeypatch.setattr(SettleDetector, "_stats", {})
+    monkeypatch.setattr(SettleDetector, "_grab", _frames(0, 0, 100, 200, 255))
+
+    elapsed = SettleDetector.wait("ok", numpy.zeros((40, 60), dtype = numpy.uint8), 1.0)
+
+    assert elapsed < 0.5
+    assert SettleDetector._stats["ok"][0][1] is False
+
+
+def test_waits_for_the_upper_bound_without_a_reaction(monkeypatch):
+    monkeypatch.setattr(Settings, "settle_stable_time", 50, raising = False)
+    monkeypatch.setattr(SettleDetector, "_poll_interval", 0.01)
+    monkeypatch.setattr(SettleDetector, "_stats", {})
+    monkeypatch.setattr(SettleDetector, "_grab", _frames(0))
+
+    elapsed = SettleDetector.wait("ok", numpy.zeros((40, 60), dtype = numpy.uint8), 0.2)
+
+    assert elapsed >= 0.2
+    assert SettleDetector._stats["ok"][0][1] is True
@@ -0,0 +1,75 @@
+import os
+
+import cv2
+import numpy
+
+from utils.image_utils import ImageUtils
+
+
+def _template(tmp_path, frame):
+    os.makedirs(tmp_path / "buttons", exist_ok = True)
+    image_path = str(tmp_path / "buttons" / "template.jpg")
+    cv2.imwrite(image_path, frame[100:160, 200:300])
+    return image_path
+
+
+def _frame():
+    return cv2.GaussianBlur(numpy.random.default_rng(1).integers(0, 255, (400, 600), dtype = numpy.uint8), (5, 5), 0)
+
+
+def test_falls_back_to_the_whole_range_after_the_remembered_scale_misses(tmp_path, monkeypatch):
+    frame = _frame()
+    image_path = _template(tmp_path, frame)
+    monkeypatch.setattr(ImageUtils, "_custom_scale", 1.02)
+    monkeypatch.setattr(ImageUtils, "_template_scales", {os.path.normpath(image_path): 0.6})
+
+    assert ImageUtils._get_template_scales(image_path) == [0.6, 1.0, 1.01, 1.02, 1.03, 1.04]
+
+    match = ImageUtils._search_template(frame, image_path, 0.8)
+
+    assert match[0] == (200, 100) and match[4] == 1.0
+    assert ImageUtils._template_scales[os.path.normpath(image_path)] == 1.0
+
+
+def test_a_miss_only_matches_the_downscaled_frame(tmp_path, monkeypatch):
+    frame = _frame()
+    image_path = _template(tmp_path, frame)
+    monkeypatch.setattr(ImageUtils, "_custom_scale", 1.02)
+    monkeypatch.setattr(ImageUtils, "_template_scales", {})
+
+    calls = []
+    match_template = cv2.matchTemplate
+
+    def count_match_template(src, template_array, method):
+        calls.append(src.shape)
+        return match_template(src, template_array, method)
+
+    monkeypatch.setattr(cv2, "matchTemplate", count_match_template)
+
+    # A flat frame has nothing that looks like the template.
+    assert ImageUtils._search_template(numpy.full_like(frame, 128), image_path, 0.8) is None
+    assert len(calls) == 5 and all(shape == (200, 300) for shape in calls)
+
+    # A hit adds a single refine at full resolution around the coarse location.
+    calls.clear()
+    assert ImageUtils._search_template(frame, image_path, 0.8)[0] == (200, 100)
+    assert len(calls) == 6 and calls[-1][0] < frame.shape[0]
+
+
+def test_a_loaded_scale_profile_only_searches_the_family_scale(tmp_path, monkeypatch):
+    frame = _frame()
+    image_path = _template(tmp_path, frame)
+    monkeypatch.setattr(ImageUtils, "_custom_scale", 1.02)
+    monkeypatch.setattr(ImageUtils, "_template_scales", {})
+    monkeypatch.setattr(ImageUtils, "_family_scales", {"buttons": 1.0})
+
+    assert ImageUtils._get_template_scales(image_path) == [1.0]
+
+    calls = []
+    match_template = cv2.matchTemplate
+    monkeypatch.setattr(cv2, "matchTemplate", lambda src, template_array, method: calls.append(src.shape) or match_template(src, template_array, method))
+
+    assert ImageUtils._search_template(numpy.full_like(frame, 128), image_path, 0.8) is None
+    assert calls == [frame.shape]
+    assert ImageUtils._search_template(frame, image_path, 0.8)[0] == (200, 100)
+    assert ImageUtils._template_scales == {}
@@ -0,0 +1,248 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy
+import pyautogui
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+
+class CaptureBackend:
+    """
+    Interface for grabbing the pixels of a region of the screen as NumPy arrays.
+    """
+
+    name: str = "base"
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> numpy.ndarray:
+        """Grab the pixels of the region.
+
+        Args:
+            region (Tuple[int, int, int, int], optional): The region as (left, top, width, height). Defaults to None which grabs the whole screen.
+
+        Returns:
+            (numpy.ndarray): The RGB array of the region.
+        """
+        raise NotImplementedError
+
+    def grab_gray(self, region: Optional[Tuple[int, int, int, int]] = None) -> numpy.ndarray:
+        """Grab the pixels of the region in grayscale.
+
+        Args:
+            region (Tuple[int, int, int, int], optional): The region as (left, top, width, height). Defaults to None which grabs the whole screen.
+
+        Returns:
+            (numpy.ndarray): The grayscale array of the region.
+        """
+        return cv2.cvtColor(self.grab(region), cv2.COLOR_RGB2GRAY)
+
+
+class PyAutoGUICapture(CaptureBackend):
+    """
+    Grabs the screen using PyAutoGUI. Slower as every frame goes through a PIL image but works everywhere.
+    """
+
+    name: str = "pyautogui"
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> numpy.ndarray:
+        frame = numpy.asarray(pyautogui.screenshot(region = region))
+        if frame.shape[2] == 4:
+            frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2RGB)
+        return frame
+
+
+class MssCapture(CaptureBackend):
+    """
+    Grabs the screen using mss which reads the pixels straight from the display server into a buffer without going through PIL.
+    """
+
+    name: str = "mss"
+
+    def __init__(self):
+        # mss handles are bound to the thread that created them.
+        self._local = threading.local()
+
+    def _grab_raw(self, region: Optional[Tuple[int, int, int, int]]) -> numpy.ndarray:
+        """Grab the pixels of the region as they come from mss.
+
+        Args:
+            region (Tuple[int, int, int, int], optional): The region as (left, top, width, height). None grabs the whole screen.
+
+        Returns:
+            (numpy.ndarray): The BGRA array of the region.
+        """
+        if getattr(self._local, "sct", None) is None:
+            self._local.sct = mss.mss()
+
+        if region is None:
+            monitor = self._local.sct.monitors[1]
+        else:
+            monitor = {"left": int(region[0]), "top": int(region[1]), "width": int(region[2]), "height": int(region[3])}
+
+        return numpy.asarray(self._local.sct.grab(monitor))
+
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> numpy.ndarray:
+        return cv2.cvtColor(self._grab_raw(region), cv2.COLOR_BGRA2RGB)
+
+    def grab_gray(self, region: Optional[Tuple[int, int, int, int]] = None) -> numpy.ndarray:
+        return cv2.cvtColor(self._grab_raw(region), cv2.COLOR_BGRA2GRAY)
+
+
+class Capture:
+    """
+    Grabs frames of the screen through the fastest available backend and keeps the most recent frames in a bounded ring buffer.
+
+    The backend is chosen by the device.captureBackend setting. "auto" uses mss when it is installed and falls back to PyAutoGUI otherwise.
+    """
+
+    _backend: CaptureBackend = None
+
+    # The last grayscale frame of each region as (timestamp, frame) so that back-to-back matches without any input in between share one capture.
+    _cached_frames: Dict[Optional[Tuple[int, int, int, int]], Tuple[float, numpy.ndarray]] = {}
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    # The most recent frames as (timestamp, region, frame). The oldest frame is dropped once the buffer is full. It is sized from the settings on first use.
+    _frames: Deque[Tuple[float, Optional[Tuple[int, int, int, int]], numpy.ndarray]] = None
+
+    @staticmethod
+    def _available_backends() -> List[CaptureBackend]:
+        """Create every backend that can be used on this machine, fastest first.
+
+        Returns:
+            (List[CaptureBackend]): List of backends.
+        """
+        backends: List[CaptureBackend] = []
+        if mss is not None:
+            backends.append(MssCapture())
+        backends.append(PyAutoGUICapture())
+        return backends
+
+    @staticmethod
+    def get_backend() -> CaptureBackend:
+        """Get the backend in use, choosing it on the first call.
+
+        Returns:
+            (CaptureBackend): The backend in use.
+        """
+        if Capture._backend is None:
+            backends = Capture._available_backends()
+            if Settings.capture_backend != "auto":
+                chosen = [backend for backend in backends if backend.name == Settings.capture_backend]
+                if len(chosen) == 0:
+                    MessageLog.print_message(f"[WARNING] Capture backend \"{Settings.capture_backend}\" is not available. Falling back to \"{backends[0].name}\".")
+                else:
+                    backends = chosen
+
+            Capture._backend = backends[0]
+            if Settings.debug_mode:
+                MessageLog.print_message(f"[DEBUG] Using the \"{Capture._backend.name}\" capture backend.")
+
+        return Capture._backend
+
+    @staticmethod
+    def _get_buffer() -> Deque[Tuple[float, Optional[Tuple[int, int, int, int]], numpy.ndarray]]:
+        """Get the ring buffer of the most recent frames, creating it on the first call.
+
+        Returns:
+            (Deque[Tuple[float, Optional[Tuple[int, int, int, int]], numpy.ndarray]]): The ring buffer.
+        """
+        if Capture._frames is None:
+            Capture._frames = deque(maxlen = max(1, Settings.capture_buffer_size))
+        return Capture._frames
+
+    @staticmethod
+    def grab(region: Optional[Tuple[int, int, int, int]] = None) -> numpy.ndarray:
+        """Grab the pixels of the region and keep the frame in the ring buffer.
+
+        Args:
+            region (Tuple[int, int, int, int], optional): The region as (left, top, width, height). Defaults to None which grabs the whole screen.
+
+        Returns:
+            (numpy.ndarray): The RGB array of the region.
+        """
+        frame = Capture.get_backend().grab(region)
+        Capture._get_buffer().append((time.time(), region, frame))
+        return frame
+
+    @staticmethod
+    def grab_gray(region: Optional[Tuple[int, int, int, int]] = None, use_cache: bool = True) -> numpy.ndarray:
+        """Grab the pixels of the region in grayscale and keep the frame in the ring buffer.
+
+        The frame is served from the cache instead if the same region was grabbed less than device.frameCacheTtl milliseconds ago and no input happened since.
+        Cached frames are shared so they are returned as read-only arrays.
+
+        Args:
+            region (Tuple[int, int, int, int], optional): The region as (left, top, width, height). Defaults to None which grabs the whole screen.
+            use_cache (bool, optional): Serve the frame from the cache if it is recent enough. Otherwise, always grab a new frame. Defaults to True.
+
+        Returns:
+            (numpy.ndarray): The grayscale array of the region.
+        """
+        start_time = time.time()
+        if use_cache:
+            cached_frame = Capture._cached_frames.get(region)
+            if cached_frame is not None and start_time - cached_frame[0] <= Settings.frame_cache_ttl / 1000:
+                Capture.cache_hits += 1
+                return cached_frame[1]
+
+        Capture.cache_misses += 1
+        frame = Capture.get_backend().grab_gray(region)
+        frame.setflags(write = False)
+
+        # The frame is timestamped from before the grab as the screen could have changed while grabbing.
+        Capture._cached_frames[region] = (start_time, frame)
+        Capture._get_buffer().append((start_time, region, frame))
+        return frame
+
+    @staticmethod
+    def invalidate():
+        """Drop the cached frames so that the next grab sees the screen after an input.
+
+        Returns:
+            None
+        """
+        Capture._cached_frames.clear()
+        return None
+
+    @staticmethod
+    def recent_frames() -> List[Tuple[float, Optional[Tuple[int, int, int, int]], numpy.ndarray]]:
+        """Get the most recent frames.
+
+        Returns:
+            (List[Tuple[float, Tuple[int, int, int, int], numpy.ndarray]]): List of the timestamp, region and array of each frame from the oldest to the newest.
+        """
+        return list(Capture._get_buffer())
+
+    @staticmethod
+    def benchmark(duration: float = 2.0, region: Optional[Tuple[int, int, int, int]] = None) -> Dict[str, float]:
+        """Measure how many grayscale frames per second each available backend can grab on this machine.
+
+        Args:
+            duration (float, optional): Seconds to spend on each backend. Defaults to 2.0.
+            region (Tuple[int, int, int, int], optional): The region as (left, top, width, height). Defaults to None which grabs the whole screen.
+
+        Returns:
+            (Dict[str, float]): The frames per second of each backend.
+        """
+        results: Dict[str, float] = {}
+        for backend in Capture._available_backends():
+            frames = 0
+            start_time = time.perf_counter()
+            while time.perf_counter() - start_time < duration:
+                backend.grab_gray(region)
+                frames += 1
+
+            results[backend.name] = frames / (time.perf_counter() - start_time)
+            MessageLog.print_message(f"[INFO] Capture backend \"{backend.name}\": {results[backend.name]:.1f} FPS")
+
+        return results
@@ -0,0 +1,257 @@
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+
+class CombatScriptError(Exception):
+    """
+    Raised when a combat script cannot be compiled. The message points at the offending line and the column if it is known.
+    """
+
+    def __init__(self, message: str, line_number: int, line: str, column: Optional[int] = None):
+        position = f"Line {line_number}" if column is None else f"Line {line_number}, column {column}"
+        super().__init__(f"{position}: {message}: \"{line.strip()}\"")
+        self.line_number = line_number
+        self.column = column
+        self.line = line
+
+
+class Instruction(NamedTuple):
+    """
+    A single compiled command of a combat script.
+    """
+
+    # The operation like "turn", "character" or "summon".
+    op: str
+    # The parsed arguments of the operation.
+    args: tuple
+    # The 1-based line number and the cleaned up text of the command for logging.
+    line_number: int
+    text: str
+
+
+class CombatScript:
+    """
+    Compiles the text of a combat script for Combat Mode into an immutable list of instructions.
+
+    Each line is lowercased, stripped of comments and split into its dotted calls like "character1.useskill(1).target(2)" once when the script is loaded. Anything
+    malformed is rejected right away with the line number instead of being found in the middle of a battle.
+    """
+
+    # Matches one call like "useskill(1)" or "attack" followed by a dot or the end of the command. Arguments may contain dots like "wait(1.5)".
+    _call_pattern = re.compile(r"\s*([a-z0-9]+)\s*(?:\(\s*([^)]*?)\s*\))?\s*(?:\.|$)")
+    _turn_pattern = re.compile(r"turn\s*(\d+)\s*:?")
+
+    # Commands that take no arguments and are not followed by other calls.
+    _simple_commands = frozenset(["requestbackup", "tweetbackup", "enablesemiauto", "attackback", "back", "reload", "refresh", "repeatmanualattackandreload", "end", "exit"])
+
+    # Healing items and whether they need a Character as target.
+    _healing_items = {"usegreenpotion": True, "usebluepotion": False, "usefullelixir": False, "usesupportpotion": False, "useclarityherb": True, "userevivalpotion": False}
+
+    @staticmethod
+    def _clean(line: str) -> str:
+        """Lowercase the line and remove its surrounding whitespace and any comment.
+
+        Args:
+            line (str): The line of the script.
+
+        Returns:
+            (str): The command or an empty string if there is none.
+        """
+        command = line.strip().lower()
+        for marker in ("#", "/"):
+            if marker in command:
+                command = command[:command.index(marker)]
+        return command.strip()
+
+    @staticmethod
+    def _tokenize(command: str, line_number: int, line: str) -> List[Tuple[str, Optional[str]]]:
+        """Split the command into its dotted calls.
+
+        Args:
+            command (str): The cleaned up command.
+            line_number (int): The line number for errors.
+            line (str): The original line for errors.
+
+        Returns:
+            (List[Tuple[str, Optional[str]]]): The name and the argument of each call. The argument is None if the call had no parentheses.
+        """
+        calls = []
+        position = 0
+        while position < len(command):
+            match = CombatScript._call_pattern.match(command, position)
+            if match is None or match.end() == position:
+                raise CombatScriptError(f"Unable to read the command at \"{command[position:]}\"", line_number, line)
+            calls.append((match.group(1), match.group(2)))
+            position = match.end()
+        return calls
+
+    @staticmethod
+    def _to_number(argument: Optional[str], maximum: int, name: str, line_number: int, line: str) -> int:
+        """Parse the argument of the call as a number between 1 and the maximum.
+
+        Args:
+            argument (str, optional): The argument.
+            maximum (int): The largest allowed number.
+            name (str): Name of the call for errors.
+            line_number (int): The line number for errors.
+            line (str): The original line for errors.
+
+        Returns:
+            (int): The number.
+        """
+        if argument is None or not argument.isdigit() or not 1 <= int(argument) <= maximum:
+            raise CombatScriptError(f"{name} needs a number from 1 to {maximum}", line_number, line)
+        return int(argument)
+
+    @staticmethod
+    def _to_seconds(argument: Optional[str], line_number: int, line: str) -> float:
+        """Parse the argument of a wait call as seconds.
+
+        Args:
+            argument (str, optional): The argument.
+            line_number (int): The line number for errors.
+            line (str): The original line for errors.
+
+        Returns:
+            (float): The seconds.
+        """
+        try:
+            seconds = float(argument)
+        except (TypeError, ValueError):
+            raise CombatScriptError("wait needs the number of seconds", line_number, line) from None
+
+        if seconds < 0:
+            raise CombatScriptError("wait needs a positive number of seconds", line_number, line)
+        return seconds
+
+    @staticmethod
+    def _compile_followups(calls: List[Tuple[str, Optional[str]]], line_number: int, line: str) -> Tuple[Optional[float], bool]:
+        """Compile the optional ".wait(#)" and ".attack" calls that may follow a Summon or an Attack.
+
+        Args:
+            calls (List[Tuple[str, Optional[str]]]): The calls after the command.
+            line_number (int): The line number for errors.
+            line (str): The original line for errors.
+
+        Returns:
+            (Tuple[Optional[float], bool]): The seconds to wait or None and whether to end the Turn by attacking.
+        """
+        wait_seconds = None
+        attack = False
+        for name, argument in calls:
+            if name == "wait" and wait_seconds is None and not attack:
+                wait_seconds = CombatScript._to_seconds(argument, line_number, line)
+            elif name == "attack" and not attack:
+                attack = True
+            else:
+                raise CombatScriptError(f"Unexpected \"{name}\"", line_number, line)
+        return wait_seconds, attack
+
+    @staticmethod
+    def _compile_line(command: str, line_number: int, line: str) -> Instruction:
+        """Compile a single command.
+
+        Args:
+            command (str): The cleaned up command.
+            line_number (int): The line number for errors.
+            line (str): The original line for errors.
+
+        Returns:
+            (Instruction): The instruction.
+        """
+        match = CombatScript._turn_pattern.fullmatch(command)
+        if match is not None:
+            return Instruction("turn", (int(match.group(1)),), line_number, command)
+
+        calls = CombatScript._tokenize(command, line_number, line)
+        name, argument = calls[0]
+        rest = calls[1:]
+
+        if name.startswith("character") and argument is None:
+            character = CombatScript._to_number(name[len("character"):] or None, 4, "character", line_number, line)
+
+            # The Skills of the Character with an optional target after each one, waits in between and an optional attack at the end.
+            steps = []
+            for step_name, step_argument in rest:
+                if steps and steps[-1][0] == "attack":
+                    raise CombatScriptError(f"Unexpected \"{step_name}\" after attack", line_number, line)
+                elif step_name == "useskill":
+                    steps.append(("useskill", CombatScript._to_number(step_argument, 4, "useSkill", line_number, line)))
+                elif step_name == "target":
+                    if not steps or steps[-1][0] != "useskill":
+                        raise CombatScriptError("target has to follow a useSkill", line_number, line)
+                    steps.append(("target", CombatScript._to_number(step_argument, 6, "target", line_number, line)))
+                elif step_name == "wait":
+                    steps.append(("wait", CombatScript._to_seconds(step_argument, line_number, line)))
+                elif step_name == "attack":
+                    steps.append(("attack",))
+                else:
+                    raise CombatScriptError(f"Unexpected \"{step_name}\"", line_number, line)
+
+            return Instruction("character", (character, tuple(steps)), line_number, command)
+
+        elif name == "summon":
+            summons = [CombatScript._to_number(argument, 6, "summon", line_number, line)]
+            while rest and rest[0][0] == "summon":
+                summons.append(CombatScript._to_number(rest.pop(0)[1], 6, "summon", line_number, line))
+            wait_seconds, attack = CombatScript._compile_followups(rest, line_number, line)
+            return Instruction("summon", (tuple(summons), wait_seconds, attack), line_number, command)
+
+        elif name == "quicksummon" and not argument:
+            wait_seconds, attack = CombatScript._compile_followups(rest, line_number, line)
+            return Instruction("quicksummon", (wait_seconds, attack), line_number, command)
+
+        elif name in CombatScript._healing_items and not argument:
+            if CombatScript._healing_items[name]:
+                if len(rest) != 1 or rest[0][0] != "target":
+                    raise CombatScriptError(f"{name} needs a target like \"{name}.target(1)\"", line_number, line)
+                target = CombatScript._to_number(rest[0][1], 4, "target", line_number, line)
+                return Instruction("healingitem", (f"{name}.target({target})",), line_number, command)
+            elif rest:
+                raise CombatScriptError(f"{name} does not take a target", line_number, line)
+            return Instruction("healingitem", (name,), line_number, command)
+
+        elif name == "enablefullauto" and not argument:
+            if rest and rest != [("reload", None)]:
+                raise CombatScriptError(f"Unexpected \"{rest[0][0]}\"", line_number, line)
+            return Instruction("enablefullauto", (len(rest) == 1,), line_number, command)
+
+        elif name == "targetenemy":
+            if rest:
+                raise CombatScriptError(f"Unexpected \"{rest[0][0]}\"", line_number, line)
+            return Instruction("targetenemy", (CombatScript._to_number(argument, 3, "targetEnemy", line_number, line),), line_number, command)
+
+        elif name == "attack" and not argument:
+            wait_seconds, attack = CombatScript._compile_followups(rest, line_number, line)
+            if attack:
+                raise CombatScriptError("Unexpected \"attack\"", line_number, line)
+            return Instruction("attack", (wait_seconds,), line_number, command)
+
+        elif name == "wait":
+            if rest:
+                raise CombatScriptError(f"Unexpected \"{rest[0][0]}\"", line_number, line)
+            return Instruction("wait", (CombatScript._to_seconds(argument, line_number, line),), line_number, command)
+
+        elif name in CombatScript._simple_commands and not argument:
+            if rest:
+                raise CombatScriptError(f"Unexpected \"{rest[0][0]}\"", line_number, line)
+            return Instruction(name, (), line_number, command)
+
+        raise CombatScriptError(f"Unknown command \"{name}\"", line_number, line)
+
+    @staticmethod
+    def compile(lines: List[str]) -> Tuple[Instruction, ...]:
+        """Compile the lines of a combat script.
+
+        Args:
+            lines (List[str]): The lines of the script.
+
+        Returns:
+            (Tuple[Instruction, ...]): The instructions in order.
+        """
+        instructions = []
+        for line_number, line in enumerate(lines, start = 1):
+            command = CombatScript._clean(line)
+            if command != "":
+                instructions.append(CombatScript._compile_line(command, line_number, line))
+        return tuple(instructions)
@@ -0,0 +1,187 @@
+import glob
+import os
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+
+
+class DigitRecognizer:
+    """
+    Reads the white amounts like "x3" that are written next to the items on the Loot Collected screen without going through EasyOCR.
+
+    Every digit in the crop is separated out as a connected component of bright pixels, normalized to a small square patch and classified by its nearest neighbour among the
+    bundled glyphs in /images/digits/. Glyph files are named like "3_0.png" where the first character is the digit that they show.
+
+    Glyphs named like "5_standin.png" are rendered stand-ins for digits that no in-game capture was bundled for yet. A digit whose nearest glyph is a stand-in is never
+    treated as certain.
+    """
+
+    _glyph_dir: str = f"{os.getcwd()}/images/digits/"
+
+    # Pixels brighter than this are part of the white text. The dark outline around the text keeps neighbouring glyphs apart.
+    _threshold: int = 200
+
+    # Digits are at least this fraction of the crop height tall which leaves out the shorter "x" in front of them and specks from the item icon.
+    _min_height_ratio: float = 0.45
+
+    # Size of the square patch that every glyph is normalized to before being compared.
+    _patch_size: int = 16
+
+    # Digits whose nearest glyph is further away than this are treated as uncertain.
+    _max_distance: float = 0.2
+
+    # Lazily loaded glyph patches as a (glyph count, patch size * patch size) matrix, the digit of each row and whether it is a stand-in.
+    _patches: numpy.ndarray = None
+    _labels: List[str] = None
+    _is_stand_in: List[bool] = None
+
+    @staticmethod
+    def _segment(crop: numpy.ndarray) -> List[numpy.ndarray]:
+        """Separate the digits in the crop from left to right.
+
+        Args:
+            crop (numpy.ndarray): The RGB or grayscale crop of the item amount.
+
+        Returns:
+            (List[numpy.ndarray]): The binary mask of each digit cut to its bounding box.
+        """
+        if crop.ndim == 3:
+            crop = cv2.cvtColor(crop, cv2.COLOR_RGB2GRAY)
+
+        mask = (crop > DigitRecognizer._threshold).astype(numpy.uint8)
+        count, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity = 8)
+
+        crop_height = mask.shape[0]
+        digits = []
+        for label in range(1, count):
+            left, top, width, height, _ = stats[label]
+
+            # Parts of the item icon can reach into the crop from the top or the bottom while the text never touches those edges.
+            if top == 0 or top + height == crop_height:
+                continue
+            if height < crop_height * DigitRecognizer._min_height_ratio or width > height:
+                continue
+
+            digits.append((left, (labels[top:top + height, left:left + width] == label).astype(numpy.uint8)))
+
+        return [digit for _, digit in sorted(digits, key = lambda entry: entry[0])]
+
+    @staticmethod
+    def _normalize(digit: numpy.ndarray) -> numpy.ndarray:
+        """Center the digit on a square canvas while keeping its aspect ratio and shrink it down to the patch size.
+
+        Args:
+            digit (numpy.ndarray): The binary mask of the digit cut to its bounding box.
+
+        Returns:
+            (numpy.ndarray): The flattened patch with values between 0 and 1.
+        """
+        height, width = digit.shape
+        side = max(height, width)
+        canvas = numpy.zeros((side, side), numpy.float32)
+        top = (side - height) // 2
+        left = (side - width) // 2
+        canvas[top:top + height, left:left + width] = digit
+
+        patch = cv2.resize(canvas, (DigitRecognizer._patch_size, DigitRecognizer._patch_size), interpolation = cv2.INTER_AREA)
+        return patch.ravel()
+
+    @staticmethod
+    def _load_glyphs():
+        """Load the bundled glyphs and turn them into patches.
+
+        Returns:
+            None
+        """
+        patches = []
+        labels = []
+        is_stand_in = []
+        for glyph_path in sorted(glob.glob(f"{DigitRecognizer._glyph_dir}*.png")):
+            glyph = cv2.imread(glyph_path, cv2.IMREAD_GRAYSCALE)
+            if glyph is None:
+                continue
+
+            patches.append(DigitRecognizer._normalize((glyph > 127).astype(numpy.uint8)))
+            labels.append(os.path.basename(glyph_path)[0])
+            is_stand_in.append(os.path.basename(glyph_path).endswith("_standin.png"))
+
+        if len(patches) == 0:
+            MessageLog.print_message(f"[WARNING] No digit glyphs were found in {DigitRecognizer._glyph_dir}.")
+            DigitRecognizer._patches = numpy.zeros((0, DigitRecognizer._patch_size ** 2), numpy.float32)
+        else:
+            DigitRecognizer._patches = numpy.stack(patches)
+        DigitRecognizer._labels = labels
+        DigitRecognizer._is_stand_in = is_stand_in
+
+        if Settings.debug_mode:
+            MessageLog.print_message(f"[DEBUG] Loaded {len(labels)} digit glyphs for the digits {''.join(sorted(set(labels)))}.")
+
+        stand_in_labels = sorted(set(label for label, stand_in in zip(labels, is_stand_in) if stand_in))
+        if len(stand_in_labels) != 0:
+            MessageLog.print_message(f"[WARNING] The digit glyphs for {', '.join(stand_in_labels)} are stand-ins so amounts with those digits are not read with certainty.")
+
+        return None
+
+    @staticmethod
+    def classify(digit: numpy.ndarray) -> Tuple[Optional[str], float]:
+        """Find the nearest glyph of the digit.
+
+        Args:
+            digit (numpy.ndarray): The binary mask of the digit cut to its bounding box.
+
+        Returns:
+            (Tuple[Optional[str], float]): The digit and the root mean square distance to its glyph. The digit is None if there are no glyphs.
+        """
+        nearest, distance = DigitRecognizer._nearest(digit)
+        if nearest is None:
+            return None, distance
+
+        return DigitRecognizer._labels[nearest], distance
+
+    @staticmethod
+    def _nearest(digit: numpy.ndarray) -> Tuple[Optional[int], float]:
+        """Find the index of the nearest glyph of the digit.
+
+        Args:
+            digit (numpy.ndarray): The binary mask of the digit cut to its bounding box.
+
+        Returns:
+            (Tuple[Optional[int], float]): The index of the glyph and the root mean square distance to it. The index is None if there are no glyphs.
+        """
+        if DigitRecognizer._patches is None:
+            DigitRecognizer._load_glyphs()
+
+        if len(DigitRecognizer._labels) == 0:
+            return None, 1.0
+
+        distances = numpy.sqrt(numpy.mean((DigitRecognizer._patches - DigitRecognizer._normalize(digit)) ** 2, axis = 1))
+        nearest = int(numpy.argmin(distances))
+        return nearest, float(distances[nearest])
+
+    @staticmethod
+    def read(crop: numpy.ndarray) -> Tuple[List[str], bool]:
+        """Read the amount written in the crop.
+
+        Args:
+            crop (numpy.ndarray): The RGB or grayscale crop of the item amount.
+
+        Returns:
+            (Tuple[List[str], bool]): The text in the same form as EasyOCR gives it, like ["x3"] or an empty list if there is no amount, and whether every digit was recognized with certainty.
+        """
+        digits = DigitRecognizer._segment(crop)
+        if len(digits) == 0:
+            return [], True
+
+        text = "x"
+        is_certain = True
+        for digit in digits:
+            nearest, distance = DigitRecognizer._nearest(digit)
+            if nearest is None or distance > DigitRecognizer._max_distance or DigitRecognizer._is_stand_in[nearest]:
+                is_certain = False
+            text += DigitRecognizer._labels[nearest] if nearest is not None else ""
+
+        return [text], is_certain
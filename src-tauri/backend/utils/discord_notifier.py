@@ -0,0 +1,209 @@
+import asyncio
+import queue
+import threading
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+
+
+class DiscordNotifier:
+    """
+    Forwards the messages that the bot process puts on its Queue to the user as Discord DMs from inside the event loop of the Discord client.
+
+    A daemon thread blocks on the Queue and hands each message over to the event loop so that the loop only wakes up when there is something to send.
+    Messages that arrive close together are sent as one DM and sending is retried with backoff when Discord rate limits it.
+    Putting stop_message on the Queue sends whatever is left and ends run().
+    """
+
+    # Put on the Queue by the bot process to shut the notifier down after everything before it was sent.
+    stop_message = None
+
+    # Discord rejects DMs longer than this many characters.
+    _max_length: int = 2000
+
+    def __init__(self, message_queue: queue.Queue, send: Callable[[str], Awaitable], coalesce_window: float = 0.5, max_retries: int = 5, backoff: float = 1.0,
+                 drain_timeout: float = 10.0):
+        """Create the notifier.
+
+        Args:
+            message_queue (queue.Queue): The Queue holding messages to be sent to the user. Usually a multiprocessing.Queue.
+            send (Callable[[str], Awaitable]): Sends the content as a DM to the user.
+            coalesce_window (float, optional): Seconds to wait for more messages after the first one before sending them together. Defaults to 0.5.
+            max_retries (int, optional): Number of times to retry a DM that was rate limited. Defaults to 5.
+            backoff (float, optional): Seconds to wait before the first retry if Discord did not say how long to wait. It doubles with each retry. Defaults to 1.0.
+            drain_timeout (float, optional): Seconds to spend sending the remaining messages after stop_message was received. Defaults to 10.0.
+        """
+        self._queue = message_queue
+        self._send = send
+        self._coalesce_window = coalesce_window
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._drain_timeout = drain_timeout
+
+        # Statistics of the notifier.
+        self.sent_count = 0
+        self.message_count = 0
+        self.dropped_count = 0
+
+    def _pump(self, loop: asyncio.AbstractEventLoop, pending: asyncio.Queue):
+        """Move messages from the Queue into the event loop until stop_message is received. This runs on the daemon thread.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The event loop of the Discord client.
+            pending (asyncio.Queue): The queue inside the event loop.
+
+        Returns:
+            None
+        """
+        while True:
+            message = self._queue.get()
+            try:
+                loop.call_soon_threadsafe(pending.put_nowait, message)
+            except RuntimeError:
+                # The event loop was closed.
+                return None
+
+            if message is DiscordNotifier.stop_message:
+                return None
+
+    async def _next_batch(self, pending: asyncio.Queue) -> Tuple[List[str], bool]:
+        """Wait for a message and collect any others that arrive within the coalescing window.
+
+        Args:
+            pending (asyncio.Queue): The queue inside the event loop.
+
+        Returns:
+            (Tuple[List[str], bool]): The messages and whether stop_message was received.
+        """
+        message = await pending.get()
+        if message is DiscordNotifier.stop_message:
+            return [], True
+
+        messages = [message]
+        deadline = time.monotonic() + self._coalesce_window
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                message = await asyncio.wait_for(pending.get(), timeout = remaining)
+            except asyncio.TimeoutError:
+                break
+
+            if message is DiscordNotifier.stop_message:
+                return messages, True
+            messages.append(message)
+
+        return messages, False
+
+    @staticmethod
+    def _join(messages: List[str]) -> List[str]:
+        """Join the messages into as few DMs as possible without going over the length limit.
+
+        Args:
+            messages (List[str]): The messages.
+
+        Returns:
+            (List[str]): The content of each DM.
+        """
+        contents: List[str] = []
+        current = ""
+        for message in messages:
+            message = str(message)
+            while len(message) > DiscordNotifier._max_length:
+                if current:
+                    contents.append(current)
+                    current = ""
+                contents.append(message[:DiscordNotifier._max_length])
+                message = message[DiscordNotifier._max_length:]
+
+            if not current:
+                current = message
+            elif len(current) + 1 + len(message) <= DiscordNotifier._max_length:
+                current += "\n" + message
+            else:
+                contents.append(current)
+                current = message
+
+        if current:
+            contents.append(current)
+
+        return contents
+
+    async def _send_with_backoff(self, content: str, deadline: Optional[float] = None) -> bool:
+        """Send the DM and retry with exponential backoff if Discord rate limits it.
+
+        Args:
+            content (str): The content of the DM.
+            deadline (float, optional): The time.monotonic() by which to give up retrying. Defaults to None.
+
+        Returns:
+            (bool): True if the DM was sent.
+        """
+        delay = self._backoff
+        for attempt in range(self._max_retries + 1):
+            try:
+                await self._send(content)
+                return True
+            except Exception as e:
+                if getattr(e, "status", None) != 429 or attempt == self._max_retries:
+                    MessageLog.print_message(f"[DISCORD] Failed to send a message via Discord DM: {e}")
+                    return False
+
+                # Use the wait that Discord asked for if it gave one.
+                wait = getattr(e, "retry_after", None) or delay
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    return False
+
+                MessageLog.print_message(f"[DISCORD] Rate limited by Discord. Retrying in {wait:.2f} seconds...")
+                await asyncio.sleep(wait)
+                delay *= 2
+
+        return False
+
+    async def _deliver(self, messages: List[str], deadline: Optional[float] = None):
+        """Send the messages as few DMs as possible.
+
+        Args:
+            messages (List[str]): The messages.
+            deadline (float, optional): The time.monotonic() by which to give up. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.message_count += len(messages)
+        for content in DiscordNotifier._join(messages):
+            if deadline is not None and time.monotonic() > deadline:
+                self.dropped_count += 1
+                continue
+
+            if Settings.debug_mode:
+                MessageLog.print_message(f"\n[DEBUG] Acquired message to send via Discord DM: {content}")
+
+            if await self._send_with_backoff(content, deadline):
+                self.sent_count += 1
+            else:
+                self.dropped_count += 1
+
+        return None
+
+    async def run(self):
+        """Send the messages on the Queue until stop_message is received.
+
+        Returns:
+            None
+        """
+        loop = asyncio.get_running_loop()
+        pending: asyncio.Queue = asyncio.Queue()
+        threading.Thread(target = self._pump, args = (loop, pending), name = "discord-queue", daemon = True).start()
+
+        while True:
+            messages, is_stopping = await self._next_batch(pending)
+            if is_stopping:
+                await self._deliver(messages, time.monotonic() + self._drain_timeout)
+                return None
+
+            await self._deliver(messages)
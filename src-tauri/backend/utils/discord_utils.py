@@ -5,8 +5,8 @@ from typing import Any
 import discord
 from discord import LoginFailure, Intents
 
-from utils.settings import Settings
 from utils.message_log import MessageLog
+from utils.discord_notifier import DiscordNotifier
 
 
 class MyClient(discord.Client):
@@ -36,7 +36,7 @@ class MyClient(discord.Client):
         self.bg_task = self.loop.create_task(self.start_task())
 
     async def start_task(self):
-        """After the connection is ready, continue looping and reading in messages from the queue to send to the user.
+        """After the connection is ready, send the messages from the queue to the user until the bot process asks to stop.
 
         Returns:
             None
@@ -54,19 +54,21 @@ class MyClient(discord.Client):
             MessageLog.print_message(f"[DISCORD] Found user: {self.current_user.name}")
             if self.test_queue:
                 self.test_queue.put(f"[DISCORD] Found user: {self.current_user.name}")
-
-            while not self.is_closed():
-                if self.current_user is not None and not self.queue.empty():
-                    message: str = self.queue.get()
-                    if Settings.debug_mode:
-                        MessageLog.print_message(f"\n[DEBUG] Acquired message to send via Discord DM: {message}")
-                    await self.current_user.send(content = message)
-
         except discord.errors.HTTPException:
             MessageLog.print_message("[DISCORD] Failed to find user using provided user ID.\n")
             if self.test_queue:
                 self.test_queue.put("[DISCORD] Failed to find user using provided user ID.")
 
+            # Close the connection so that the client started by start_now returns instead of staying connected with nobody to message.
+            await self.close()
+            return None
+
+        notifier = DiscordNotifier(self.queue, lambda content: self.current_user.send(content = content))
+        await notifier.run()
+        MessageLog.print_message(f"[DISCORD] Sent {notifier.message_count} messages in {notifier.sent_count} DMs before closing the connection.")
+        await self.close()
+        return None
+
 
 def start_now(token: str, user_id: int, queue: multiprocessing.Queue, test_queue: multiprocessing.Queue = None):
     """Initialize the Client object and begin the process to connect to the Discord API.
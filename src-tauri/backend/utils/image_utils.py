@@ -4,12 +4,13 @@ import sys
 import codecs
 import threading
 import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import PIL
 import cv2
-import easyocr
 import numpy
 import pyautogui
 from PIL.Image import Image
@@ -17,6 +18,11 @@ from playsound import playsound
 
 from utils.settings import Settings
 from utils.message_log import MessageLog
+from utils.template_cache import TemplateCache
+from utils.roi_registry import RoiRegistry
+from utils.capture import Capture
+from utils.digit_recognizer import DigitRecognizer
+from utils.loot_profiles import LootProfiles
 from bot.window import Window
 
 
@@ -35,7 +41,24 @@ class ImageUtils:
 
     _match_method: int = cv2.TM_CCOEFF_NORMED
     _match_location: Tuple[int, int] = None
-    _custom_scale = Settings.custom_scale
+
+    # The calibrated scale of each template family, keyed by the folder name inside /images/. Loaded from the scale profile.
+    _family_scales: Dict[str, float] = {}
+
+    # The scale that found the last match of each template so that later searches go straight to it.
+    _template_scales: Dict[str, float] = {}
+
+    # Matches on the downscaled frame that score this much below the confidence are treated as misses without searching at full resolution.
+    _pyramid_slack: float = 0.2
+
+    # Templates with a side shorter than this lose too much detail on the downscaled frame and are only matched at full resolution.
+    _pyramid_min_size: int = 16
+
+    # Statistics of the last wait_appear() or wait_vanish() call.
+    _wait_stats: Dict[str, Optional[float]] = {}
+
+    # The scale of the buttons from the calibrated scale profile or None to use the custom scale setting.
+    _custom_scale: float = None
 
     # Check if the temp folder is created in the images folder.
     _current_dir: str = os.getcwd()
@@ -43,7 +66,10 @@ class ImageUtils:
     if not os.path.exists(_temp_dir):
         os.makedirs(_temp_dir)
 
-    _reader: easyocr.Reader = None
+    # The EasyOCR reader is only created when device.enableEasyOcrFallback is set. It is built on a background thread and later calls wait on the future.
+    _reader = None
+    _reader_executor: ThreadPoolExecutor = None
+    _reader_future: Future = None
 
     page_key_pixel = {}
 
@@ -59,16 +85,16 @@ class ImageUtils:
             (450,500),
             (450,600)
         ]
-        scrshot = pyautogui.screenshot(region=(Window.start, Window.top, Window.width, Window.height))
+        scrshot = Capture.grab(region=(Window.start, Window.top, Window.width, Window.height))
         pixel_check = ImageUtils.page_key_pixel.get(page_name)
         if pixel_check is None:
             pixel = {}
             for pt in pts:
-                pixel[pt] = scrshot.getpixel(pt)
+                pixel[pt] = tuple(scrshot[pt[1], pt[0]])
             ImageUtils.page_key_pixel[page_name] = pixel
         else:
             for pt in pts:
-                if pixel_check[pt] != scrshot.getpixel(pt):
+                if pixel_check[pt] != tuple(scrshot[pt[1], pt[0]]):
                     return False
         return True
     clickable_area = {
@@ -96,6 +122,9 @@ class ImageUtils:
         Settings.window_height = window_height
         Settings.calibration_complete = True
         Settings.additional_calibration_required = additional_calibration_required
+
+        # The remembered scales may no longer fit the new window.
+        ImageUtils._template_scales.clear()
         return None
 
     @staticmethod
@@ -108,23 +137,356 @@ class ImageUtils:
         return Settings.window_left, Settings.window_top, Settings.window_width, Settings.window_height
 
     @staticmethod
-    def _rescale(template: Image, scale: float) -> Image:
-        """Rescales the Image object using the provided factors.
+    def _capture(is_sub: bool = False, use_cache: bool = True) -> numpy.ndarray:
+        """Takes a screenshot of the calibrated window and converts it straight into a grayscale array for template matching.
+
+        Args:
+            is_sub (bool, optional): Capture the sub window instead of the main window. Defaults to False.
+            use_cache (bool, optional): Reuse the last frame if it was captured within the frame cache TTL and no input happened since. Defaults to True.
+
+        Returns:
+            (numpy.ndarray): The grayscale array of the captured frame.
+        """
+        if is_sub:
+            src: numpy.ndarray = Capture.grab_gray(region = (Window.sub_start, Window.sub_top, Window.width, Window.sub_height), use_cache = use_cache)
+        else:
+            src: numpy.ndarray = Capture.grab_gray(region = ImageUtils._get_window_region(), use_cache = use_cache)
+
+        if Settings.debug_mode:
+            cv2.imwrite(f"temp/source.png", src)
+
+        return src
+
+    @staticmethod
+    def _load_template(image_path: str, scale: float = 1.0, is_summon: bool = False) -> numpy.ndarray:
+        """Get the template image as a grayscale array from the template cache, rescaled if necessary.
+
+        Args:
+            image_path (str): The file path of the template image.
+            scale (float, optional): The factor to scale the template by. Defaults to 1.0.
+            is_summon (bool, optional): Crop out the plus signs on a summon template image. Defaults to False.
+
+        Returns:
+            (numpy.ndarray): The grayscale array of the template.
+        """
+        try:
+            template_array: numpy.ndarray = TemplateCache.get(image_path, scale)
+            if template_array is None:
+                raise AttributeError(f"Unable to read the template image at {image_path}")
+
+            if scale != 1.0 and Settings.debug_mode:
+                cv2.imwrite(f"temp/rescaled.png", template_array)
+
+            if is_summon:
+                # Crop the summon template image so that plus marks would not potentially obscure any match.
+                height, width = template_array.shape
+                template_array = template_array[0:height, 0:width - int(40 * ImageUtils._get_custom_scale())]
+        except AttributeError as e:
+            MessageLog.print_message(f"[ERROR] Failed in processing image path: {image_path}")
+            raise e
+
+        return template_array
+
+    @staticmethod
+    def _get_custom_scale() -> float:
+        """Get the scale of the buttons, which is read from the settings on first use unless a scale profile was calibrated.
+
+        Returns:
+            (float): The scale.
+        """
+        if ImageUtils._custom_scale is None:
+            ImageUtils._custom_scale = Settings.custom_scale
+        return ImageUtils._custom_scale
+
+    @staticmethod
+    def _get_scales(use_single_scale: bool = False) -> List[float]:
+        """Create the range of scales to try in order.
+
+        Args:
+            use_single_scale (bool, optional): Use a range of scales if this is disabled. Otherwise, it will use the custom_scale value. Defaults to False.
+
+        Returns:
+            (List[float]): List of scales.
+        """
+        custom_scale = ImageUtils._get_custom_scale()
+        if custom_scale != 1.0 and use_single_scale is False:
+            return [custom_scale - 0.02, custom_scale - 0.01, custom_scale, custom_scale + 0.01, custom_scale + 0.02]
+        elif custom_scale != 1.0 and use_single_scale:
+            return [custom_scale]
+        else:
+            return [1.0]
+
+    @staticmethod
+    def _get_preferred_scale(image_path: str, use_single_scale: bool = False) -> Optional[float]:
+        """Get the calibrated scale of the family of the template or the scale that found its last match.
+
+        Args:
+            image_path (str): The file path of the template image.
+            use_single_scale (bool, optional): Use a range of scales if this is disabled. Otherwise, it will use the custom_scale value. Defaults to False.
+
+        Returns:
+            (float): The scale to try first or None if there is none.
+        """
+        family_scale = ImageUtils._family_scales.get(os.path.basename(os.path.dirname(image_path)))
+        if family_scale is not None:
+            return family_scale
+
+        if len(ImageUtils._get_scales(use_single_scale)) > 1:
+            return ImageUtils._template_scales.get(os.path.normpath(image_path))
+
+        return None
+
+    @staticmethod
+    def _is_multi_scale(image_path: str, use_single_scale: bool = False) -> bool:
+        """Check if the template is searched over a range of scales, which is only the case until a scale profile with the scale of its family is loaded.
+
+        Args:
+            image_path (str): The file path of the template image.
+            use_single_scale (bool, optional): Use a range of scales if this is disabled. Otherwise, it will use the custom_scale value. Defaults to False.
+
+        Returns:
+            (bool): True if the template is searched over a range of scales.
+        """
+        if os.path.basename(os.path.dirname(image_path)) in ImageUtils._family_scales:
+            return False
+
+        return len(ImageUtils._get_scales(use_single_scale)) > 1
+
+    @staticmethod
+    def _get_template_scales(image_path: str, use_single_scale: bool = False) -> List[float]:
+        """Create the range of scales to try for the template.
+
+        With a scale profile loaded this is only the calibrated scale of its family. Otherwise the range starts with the scale that found its last match if there is one
+        and the rest of the range is kept after it so that the template is still found after the window was zoomed or resized.
+
+        Args:
+            image_path (str): The file path of the template image.
+            use_single_scale (bool, optional): Use a range of scales if this is disabled. Otherwise, it will use the custom_scale value. Defaults to False.
+
+        Returns:
+            (List[float]): List of scales.
+        """
+        scales = ImageUtils._get_scales(use_single_scale)
+        preferred_scale = ImageUtils._get_preferred_scale(image_path, use_single_scale)
+        if preferred_scale is None:
+            return scales
+        elif len(scales) == 1 or not ImageUtils._is_multi_scale(image_path, use_single_scale):
+            return [preferred_scale]
+
+        return [preferred_scale] + [new_scale for new_scale in scales if new_scale != preferred_scale]
+
+    @staticmethod
+    def _best_match(src: numpy.ndarray, template_array: numpy.ndarray) -> Tuple[float, Tuple[int, int]]:
+        """Find the best match of the template inside the source frame.
+
+        Args:
+            src (numpy.ndarray): The grayscale source frame.
+            template_array (numpy.ndarray): The grayscale template.
+
+        Returns:
+            (Tuple[float, Tuple[int, int]]): The score of the best match where higher is better and its top-left corner inside the frame.
+        """
+        result: numpy.ndarray = cv2.matchTemplate(src, template_array, ImageUtils._match_method)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+
+        if ImageUtils._match_method == cv2.TM_SQDIFF or ImageUtils._match_method == cv2.TM_SQDIFF_NORMED:
+            return 1.0 - min_val, min_loc
+        else:
+            return max_val, max_loc
+
+    @staticmethod
+    def _rank_scales(src: numpy.ndarray, image_path: str, scales: List[float], is_summon: bool = False) -> Optional[List[Tuple[float, float, Tuple[int, int]]]]:
+        """Match the template at every scale on a frame downscaled by half and rank the scales by how well they matched.
 
         Args:
-            template (Image): The template image to be resized.
-            scale (float): The factor to scale by.
+            src (numpy.ndarray): The grayscale source frame.
+            image_path (str): The file path of the template image.
+            scales (List[float]): The scales to rank.
+            is_summon (bool, optional): Crop out the plus signs on a summon template image. Defaults to False.
 
         Returns:
-            The Image object rescaled.
+            (List[Tuple[float, float, Tuple[int, int]]]): List of the score, scale and top-left corner on the downscaled frame ordered from the best scale to the worst or None if the template is too small for the downscaled frame.
         """
-        width = template.width
-        height = template.height
-        return template.resize(size = (int(width * scale), int(height * scale)), resample = None)
+        small_src = cv2.pyrDown(src)
+        ranked_scales = []
+        for new_scale in scales:
+            template_array = ImageUtils._load_template(image_path, new_scale, is_summon = is_summon)
+            if min(template_array.shape) < ImageUtils._pyramid_min_size:
+                return None
+
+            small_template = cv2.pyrDown(template_array)
+            if small_template.shape[0] > small_src.shape[0] or small_template.shape[1] > small_src.shape[1]:
+                return None
+
+            score, location = ImageUtils._best_match(small_src, small_template)
+            ranked_scales.append((score, new_scale, location))
+
+        ranked_scales.sort(key = lambda ranked_scale: ranked_scale[0], reverse = True)
+        return ranked_scales
+
+    @staticmethod
+    def _search_scales(src: numpy.ndarray, image_path: str, confidence: float, scales: List[float], is_summon: bool = False) -> Optional[Tuple[Tuple[int, int], int, int, float, float]]:
+        """Match the template at full resolution using each scale in order until one of them passes the confidence.
+
+        Args:
+            src (numpy.ndarray): The grayscale source frame.
+            image_path (str): The file path of the template image.
+            confidence (float): Accuracy threshold for matching.
+            scales (List[float]): The scales to try in order.
+            is_summon (bool, optional): Crop out the plus signs on a summon template image. Defaults to False.
+
+        Returns:
+            (Tuple[Tuple[int, int], int, int, float, float]): The top-left corner of the match inside the frame, the width and height of the template, the score and the scale or None if there was no match.
+        """
+        for new_scale in scales:
+            template_array = ImageUtils._load_template(image_path, new_scale, is_summon = is_summon)
+            height, width = template_array.shape
+
+            # The template cannot be matched against a frame that is smaller than itself.
+            if height > src.shape[0] or width > src.shape[1]:
+                continue
+
+            score, location = ImageUtils._best_match(src, template_array)
+            if score >= confidence:
+                return location, width, height, score, new_scale
+            elif Settings.debug_mode:
+                MessageLog.print_message(f"[WARNING] Match not found with {score:.4f} not >= {confidence:.2f} at Point {location} using scale: {new_scale:.2f}.")
+
+        return None
+
+    @staticmethod
+    def _search_coarse_to_fine(src: numpy.ndarray, image_path: str, confidence: float, scale_groups: List[List[float]], is_summon: bool = False) \
+            -> Optional[Tuple[Tuple[int, int], int, int, float, float]]:
+        """Match the scales on a frame downscaled by half one group at a time and refine only the best scale at full resolution around the location found on the
+        downscaled frame.
+
+        The first group whose best scale comes within the pyramid slack of the confidence is the only one refined, so a miss costs the downscaled matches plus at most
+        one full resolution pass.
+
+        Args:
+            src (numpy.ndarray): The grayscale source frame.
+            image_path (str): The file path of the template image.
+            confidence (float): Accuracy threshold for matching.
+            scale_groups (List[List[float]]): The groups of scales to rank in order.
+            is_summon (bool, optional): Crop out the plus signs on a summon template image. Defaults to False.
+
+        Returns:
+            (Tuple[Tuple[int, int], int, int, float, float]): The top-left corner of the match inside the frame, the width and height of the template, the score and the scale or None if there was no match.
+        """
+        for index, scales in enumerate(scale_groups):
+            if len(scales) == 0:
+                continue
+
+            ranked_scales = ImageUtils._rank_scales(src, image_path, scales, is_summon)
+            if ranked_scales is None:
+                # The template is too small for the downscaled frame so search the remaining scales at full resolution instead.
+                return ImageUtils._search_scales(src, image_path, confidence, [new_scale for group in scale_groups[index:] for new_scale in group], is_summon)
+
+            best_score, best_scale, best_location = ranked_scales[0]
+            if best_score < confidence - ImageUtils._pyramid_slack:
+                if Settings.debug_mode:
+                    MessageLog.print_message(f"[WARNING] Match not found on the downscaled frame with {best_score:.4f} using scale: {best_scale:.2f}.")
+                continue
+
+            # Refine the best scale at full resolution inside a small area around the coarse location.
+            height, width = ImageUtils._load_template(image_path, best_scale, is_summon = is_summon).shape
+            margin = 8
+            left = max(0, best_location[0] * 2 - margin)
+            top = max(0, best_location[1] * 2 - margin)
+            right = min(src.shape[1], best_location[0] * 2 + width + margin)
+            bottom = min(src.shape[0], best_location[1] * 2 + height + margin)
+
+            match = ImageUtils._search_scales(src[top:bottom, left:right], image_path, confidence, [best_scale], is_summon)
+            if match is None:
+                return None
+
+            location, width, height, score, new_scale = match
+            return (location[0] + left, location[1] + top), width, height, score, new_scale
+
+        return None
+
+    @staticmethod
+    def _search_template(src: numpy.ndarray, image_path: str, confidence: float, use_single_scale: bool = False, is_summon: bool = False) -> Optional[Tuple[Tuple[int, int], int, int, float, float]]:
+        """Search for the template inside the frame from coarse to fine.
+
+        With a scale profile loaded, only the calibrated scale of the family of the template is searched at full resolution. Otherwise the last matching scale of the
+        template is ranked on its own first and every other scale in the range is only ranked if it does not come close on the downscaled frame.
+
+        Args:
+            src (numpy.ndarray): The grayscale source frame.
+            image_path (str): The file path of the template image.
+            confidence (float): Accuracy threshold for matching.
+            use_single_scale (bool, optional): Use a range of scales if this is disabled. Otherwise, it will use the custom_scale value. Defaults to False.
+            is_summon (bool, optional): Crop out the plus signs on a summon template image. Defaults to False.
+
+        Returns:
+            (Tuple[Tuple[int, int], int, int, float, float]): The top-left corner of the match inside the frame, the width and height of the template, the score and the scale or None if there was no match.
+        """
+        scales = ImageUtils._get_template_scales(image_path, use_single_scale)
+        is_multi_scale = ImageUtils._is_multi_scale(image_path, use_single_scale)
+
+        if not is_multi_scale:
+            match = ImageUtils._search_scales(src, image_path, confidence, scales, is_summon)
+        elif ImageUtils._get_preferred_scale(image_path, use_single_scale) is not None:
+            match = ImageUtils._search_coarse_to_fine(src, image_path, confidence, [scales[:1], scales[1:]], is_summon)
+        else:
+            match = ImageUtils._search_coarse_to_fine(src, image_path, confidence, [scales], is_summon)
+
+        if match is not None and is_multi_scale:
+            ImageUtils._template_scales[os.path.normpath(image_path)] = match[4]
+
+        return match
+
+    @staticmethod
+    def _center_location(match_location: Tuple[int, int], width: int, height: int) -> Tuple[int, int]:
+        """Convert the top-left corner of a match into the center point of the match on the screen.
+
+        Args:
+            match_location (Tuple[int, int]): The top-left corner of the match inside the source frame.
+            width (int): Width of the matched template.
+            height (int): Height of the matched template.
+
+        Returns:
+            (Tuple[int, int]): The center point of the match.
+        """
+        temp_location = list(match_location)
+        if Settings.additional_calibration_required is False:
+            temp_location[0] += int(width / 2)
+            temp_location[1] += int(height / 2)
+        else:
+            temp_location[0] += (pyautogui.size()[0] - (pyautogui.size()[0] - Settings.window_left)) + int(width / 2)
+            temp_location[1] += (pyautogui.size()[1] - (pyautogui.size()[1] - Settings.window_top)) + int(height / 2)
+
+        return tuple(temp_location)
+
+    @staticmethod
+    def _to_screen_location(match_location: Tuple[int, int], width: int, height: int, is_sub: bool = False) -> Tuple[int, int]:
+        """Convert the top-left corner of a match inside the source frame into the location that the rest of the bot expects for the current Farming Mode.
+
+        Args:
+            match_location (Tuple[int, int]): The top-left corner of the match inside the source frame.
+            width (int): Width of the matched template.
+            height (int): Height of the matched template.
+            is_sub (bool, optional): If the match was found on the sub window. Defaults to False.
+
+        Returns:
+            (Tuple[int, int]): The top-left corner on the screen for V2 Farming Modes or the center point of the match otherwise.
+        """
+        if Settings.farming_mode.endswith("V2"):
+            temp_location = list(match_location)
+            if is_sub:
+                temp_location[0] += Window.sub_start
+                temp_location[1] += Window.sub_top
+            else:
+                temp_location[0] += Window.start
+                temp_location[1] += Window.top
+            return tuple(temp_location)
+        else:
+            return ImageUtils._center_location(match_location, width, height)
 
     @staticmethod
     def _match(image_path: str, confidence: float = 0.8, \
-               use_single_scale: bool = False, is_summon: bool = False, is_sub: bool = False) -> Tuple[int, ...]:
+               use_single_scale: bool = False, is_summon: bool = False, is_sub: bool = False, src: numpy.ndarray = None, use_cache: bool = True) -> Tuple[int, ...]:
         """Match the given template image against the source screenshot to find a match location.
 
         Args:
@@ -133,112 +495,100 @@ class ImageUtils:
             use_single_scale: Use a range of scales if this is disabled. Otherwise, it will use the custom_scale value.
             is_summon: Crop out the plus signs on a summon template image before doing template matching.
             is_sub: if is searching on sub window.
+            src: An already captured frame to match against. A new frame is captured if this is None.
+            use_cache: Reuse the last frame if it is recent enough when capturing. Retries should disable this to see a new frame.
 
         Returns:
             (Tuple[int, ...]): Tuple containing match location if the template was found inside the source image and None otherwise
         """
 
-        match_check = False
-        if is_sub:
-            image: Image = pyautogui.screenshot(region = (Window.sub_start, Window.sub_top, Window.width, Window.sub_height))
-        elif Settings.window_left is not None and Settings.window_top is not None and Settings.window_width is not None and Settings.window_height is not None:
-            image: Image = pyautogui.screenshot(region = (Settings.window_left, Settings.window_top, Settings.window_width, Settings.window_height))
-        else:
-            image: Image = pyautogui.screenshot()
-
-        # Create the range of scales.
-        scales = []
-        if ImageUtils._custom_scale != 1.0 and use_single_scale is False:
-            scales.append(ImageUtils._custom_scale - 0.02)
-            scales.append(ImageUtils._custom_scale - 0.01)
-            scales.append(ImageUtils._custom_scale)
-            scales.append(ImageUtils._custom_scale + 0.01)
-            scales.append(ImageUtils._custom_scale + 0.02)
-        elif ImageUtils._custom_scale != 1.0 and use_single_scale:
-            scales.append(ImageUtils._custom_scale)
-        else:
-            scales.append(1.0)
-
-        while len(scales) != 0:
-            new_scale = scales.pop(0)
-
-            try:
-                # Rescale if necessary.
-                if new_scale != 1.0:
-                    template = PIL.Image.open(image_path)
-                    template = ImageUtils._rescale(template, new_scale)
-                    Image.save(template, f"temp/rescaled.png")
-                    template_array = cv2.imread(f"temp/rescaled.png", 0)
-                else:
-                    template_array = cv2.imread(image_path, 0)
-
-                if is_summon:
-                    # Crop the summon template image so that plus marks would not potentially obscure any match.
-                    height, width = template_array.shape
-                    template_array = template_array[0:height, 0:width - int(40 * ImageUtils._custom_scale)]
-            except AttributeError as e:
-                MessageLog.print_message(f"[ERROR] Failed in processing image path: {image_path}")
-                raise e
-
-            image.save(f"temp/source.png")
-            src: numpy.ndarray = cv2.imread(f"temp/source.png", 0)
-            height, width = template_array.shape
+        if src is None:
+            src = ImageUtils._capture(is_sub = is_sub, use_cache = use_cache)
 
-            result: numpy.ndarray = cv2.matchTemplate(src, template_array, ImageUtils._match_method)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-
-            if (ImageUtils._match_method == cv2.TM_SQDIFF or ImageUtils._match_method == cv2.TM_SQDIFF_NORMED) and min_val <= 1.0 - confidence:
-                ImageUtils._match_location = min_loc
-                match_check = True
-            elif ImageUtils._match_method != cv2.TM_SQDIFF and ImageUtils._match_method != cv2.TM_SQDIFF_NORMED and max_val >= confidence:
-                ImageUtils._match_location = max_loc
-                match_check = True
-            elif Settings.debug_mode:
-                if ImageUtils._match_method == cv2.TM_SQDIFF or ImageUtils._match_method == cv2.TM_SQDIFF_NORMED:
-                    MessageLog.print_message(f"[WARNING] Match not found with {min_val:.4f} not <= {(1.0 - confidence):.2f} at Point {min_loc} using scale: {new_scale:.2f}.")
-                else:
-                    MessageLog.print_message(f"[WARNING] Match not found with {max_val:.4f} not >= {confidence:.2f} at Point {max_loc} using scale: {new_scale:.2f}.")
+        # Search the region of interest of the template first and fall back to the full frame only on a miss.
+        search_regions = [None]
+        roi = RoiRegistry.get(image_path, src.shape)
+        if roi is not None:
+            search_regions.insert(0, roi)
 
-            if match_check:
-                region = (ImageUtils._match_location[0] + width, ImageUtils._match_location[1] + height)
-                cv2.rectangle(src, ImageUtils._match_location, region, 255, 5)
+        for search_region in search_regions:
+            if search_region is not None:
+                left, top, right, bottom = search_region
+                search_src = src[top:bottom, left:right]
+            else:
+                left, top = 0, 0
+                search_src = src
 
-                if Settings.debug_mode:
-                    cv2.imwrite(f"temp/match.png", src)
+            match = ImageUtils._search_template(search_src, image_path, confidence, use_single_scale, is_summon)
+            if match is None:
+                if Settings.debug_mode and search_region is not None:
+                    MessageLog.print_message(f"[DEBUG] Match not found inside the region of interest {search_region}. Searching the full frame now...")
+                continue
 
-                if Settings.farming_mode.endswith("V2"):
-                    if is_sub:
-                        temp_location = list(ImageUtils._match_location)
-                        temp_location[0] += Window.sub_start
-                        temp_location[1] += Window.sub_top
-                    else:
-                        temp_location = list(ImageUtils._match_location)
-                        temp_location[0] += Window.start
-                        temp_location[1] += Window.top
-                else:
-                    if Settings.additional_calibration_required is False:
-                        temp_location = list(ImageUtils._match_location)
-                        temp_location[0] += int(width / 2)
-                        temp_location[1] += int(height / 2)
-                    else:
-                        temp_location = list(ImageUtils._match_location)
-                        temp_location[0] += (pyautogui.size()[0] - (pyautogui.size()[0] - Settings.window_left)) + int(width / 2)
-                        temp_location[1] += (pyautogui.size()[1] - (pyautogui.size()[1] - Settings.window_top)) + int(height / 2)
+            location, width, height, score, new_scale = match
+            ImageUtils._match_location = (location[0] + left, location[1] + top)
+            RoiRegistry.record(image_path, src.shape, ImageUtils._match_location, width, height)
 
-                ImageUtils._match_location = tuple(temp_location)
+            if Settings.debug_mode:
+                # Draw on a copy so that the frame itself is left untouched.
+                debug_src = src.copy()
+                region = (ImageUtils._match_location[0] + width, ImageUtils._match_location[1] + height)
+                cv2.rectangle(debug_src, ImageUtils._match_location, region, 255, 5)
+                cv2.imwrite(f"temp/match.png", debug_src)
 
-                if ImageUtils._match_method == cv2.TM_SQDIFF or ImageUtils._match_method == cv2.TM_SQDIFF_NORMED:
-                    if Settings.debug_mode:
-                        MessageLog.print_message(f"[DEBUG] Match found with {min_val:.4f} <= {confidence:.2f} at Point {ImageUtils._match_location} using scale: {new_scale:.2f}")
-                else:
-                    if Settings.debug_mode:
-                        MessageLog.print_message(f"[DEBUG] Match found with {max_val:.4f} >= {confidence:.2f} at Point {ImageUtils._match_location} using scale: {new_scale:.2f}")
+            temp_location = ImageUtils._to_screen_location(ImageUtils._match_location, width, height, is_sub = is_sub)
+            ImageUtils._match_location = temp_location
 
-                return tuple(temp_location)
+            if Settings.debug_mode:
+                MessageLog.print_message(f"[DEBUG] Match found with {score:.4f} >= {confidence:.2f} at Point {ImageUtils._match_location} using scale: {new_scale:.2f}")
+
+            return temp_location
 
-        del scales
         return None
 
+    @staticmethod
+    def _find_peaks(score_map: numpy.ndarray, confidence: float, width: int, height: int) -> List[Tuple[int, int]]:
+        """Extract every peak above the threshold from a template matching response map using non-maximum suppression.
+
+        Args:
+            score_map (numpy.ndarray): Response map where higher values mean better matches.
+            confidence (float): Accuracy threshold for matching.
+            width (int): Width of the template.
+            height (int): Height of the template.
+
+        Returns:
+            (List[Tuple[int, int]]): List of top-left locations of the peaks, ordered from the best match to the worst.
+        """
+        # Peaks closer than half of the template to a better peak belong to the same match.
+        radius_x = max(1, width // 2)
+        radius_y = max(1, height // 2)
+
+        if score_map.max() < confidence:
+            return []
+
+        # A location is a local maximum if it is the largest value inside its neighbourhood.
+        kernel = numpy.ones((radius_y | 1, radius_x | 1), numpy.uint8)
+        local_maxima = cv2.dilate(score_map, kernel)
+        ys, xs = numpy.nonzero((score_map >= confidence) & (score_map >= local_maxima))
+        order = numpy.argsort(-score_map[ys, xs], kind = "stable")
+
+        # Greedily keep the best peaks and drop any peak near an already kept one by probing the neighbouring grid cells.
+        grid: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        peaks: List[Tuple[int, int]] = []
+        for index in order:
+            x, y = int(xs[index]), int(ys[index])
+            cell_x, cell_y = x // radius_x, y // radius_y
+
+            is_suppressed = any(abs(peak[0] - x) < radius_x and abs(peak[1] - y) < radius_y
+                                for neighbour_x in range(cell_x - 1, cell_x + 2)
+                                for neighbour_y in range(cell_y - 1, cell_y + 2)
+                                for peak in grid.get((neighbour_x, neighbour_y), []))
+            if not is_suppressed:
+                grid.setdefault((cell_x, cell_y), []).append((x, y))
+                peaks.append((x, y))
+
+        return peaks
+
     @staticmethod
     def _match_all(image_path: str, confidence: float = 0.8, use_single_scale: bool = False) -> List[Tuple[int, ...]]:
         """Match the given template image against the source screenshot to find all match locations.
@@ -251,161 +601,137 @@ class ImageUtils:
         Returns:
             (List[Tuple[int, ...]]): List of Tuples containing match locations.
         """
-        if Settings.window_left is not None and Settings.window_top is not None and Settings.window_width is not None and Settings.window_height is not None:
-            image: Image = pyautogui.screenshot(region = (Settings.window_left, Settings.window_top, Settings.window_width, Settings.window_height))
-        else:
-            image: Image = pyautogui.screenshot()
-
-        # Create the range of scales.
-        scales = []
-        if ImageUtils._custom_scale != 1.0 and use_single_scale is False:
-            scales.append(ImageUtils._custom_scale - 0.02)
-            scales.append(ImageUtils._custom_scale - 0.01)
-            scales.append(ImageUtils._custom_scale)
-            scales.append(ImageUtils._custom_scale + 0.01)
-            scales.append(ImageUtils._custom_scale + 0.02)
-        elif ImageUtils._custom_scale != 1.0 and use_single_scale:
-            scales.append(ImageUtils._custom_scale)
-        else:
-            scales.append(1.0)
-
-        match_check = False
-        new_scale = 0.0
-        match_locations = []
-        src: numpy.ndarray
-        template_array: numpy.ndarray
-
-        # Determine which scale can be used to find the very first match.
-        while match_check is False and len(scales) != 0:
-            new_scale = scales.pop(0)
-
-            # Rescale if necessary.
-            if new_scale != 1.0:
-                template = PIL.Image.open(image_path)
-                template = ImageUtils._rescale(template, new_scale)
-                Image.save(template, f"temp/rescaled.png")
-                template_array = cv2.imread(f"temp/rescaled.png", 0)
-            else:
-                template_array = cv2.imread(image_path, 0)
+        src: numpy.ndarray = ImageUtils._capture()
+
+        # Try the scales that matched best on the downscaled frame first.
+        scales = ImageUtils._get_template_scales(image_path, use_single_scale)
+        ranked_scales = ImageUtils._rank_scales(src, image_path, scales) if len(scales) > 1 else None
+        if ranked_scales is not None:
+            scales = [ranked_scale[1] for ranked_scale in ranked_scales]
 
-            image.save(f"temp/source.png")
+        # Use the first scale that finds at least one match and extract every match from its response map in a single pass.
+        for new_scale in scales:
+            template_array = ImageUtils._load_template(image_path, new_scale)
             height, width = template_array.shape
-            src: numpy.ndarray = cv2.imread(f"temp/source.png", 0)
+            if height > src.shape[0] or width > src.shape[1]:
+                continue
 
             result: numpy.ndarray = cv2.matchTemplate(src, template_array, ImageUtils._match_method)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            if ImageUtils._match_method == cv2.TM_SQDIFF or ImageUtils._match_method == cv2.TM_SQDIFF_NORMED:
+                result = 1.0 - result
 
-            if (ImageUtils._match_method == cv2.TM_SQDIFF or ImageUtils._match_method == cv2.TM_SQDIFF_NORMED) and min_val <= 1.0 - confidence:
-                ImageUtils._match_location = min_loc
-                match_check = True
+            peaks = ImageUtils._find_peaks(result, confidence, width, height)
+            if len(peaks) == 0:
+                if Settings.debug_mode:
+                    MessageLog.print_message(f"[WARNING] Match not found with {result.max():.4f} not >= {confidence:.2f} using scale: {new_scale:.2f}.")
+                continue
 
-                region = (ImageUtils._match_location[0] + width, ImageUtils._match_location[1] + height)
-                cv2.rectangle(src, ImageUtils._match_location, region, 255, 5)
+            if Settings.debug_mode:
+                # Draw on a copy so that the frame itself is left untouched.
+                debug_src = src.copy()
+                for peak in peaks:
+                    MessageLog.print_message(f"[DEBUG] Match found with {result[peak[1], peak[0]]:.4f} >= {confidence:.2f} at Point {peak} using scale: {new_scale:.2f}.")
+                    cv2.rectangle(debug_src, peak, (peak[0] + width, peak[1] + height), 255, 5)
+                cv2.imwrite(f"temp/matchAll.png", debug_src)
 
-                if Settings.additional_calibration_required is False:
-                    temp_location = list(ImageUtils._match_location)
-                    temp_location[0] += int(width / 2)
-                    temp_location[1] += int(height / 2)
-                else:
-                    temp_location = list(ImageUtils._match_location)
-                    temp_location[0] += (pyautogui.size()[0] - (pyautogui.size()[0] - Settings.window_left)) + int(width / 2)
-                    temp_location[1] += (pyautogui.size()[1] - (pyautogui.size()[1] - Settings.window_top)) + int(height / 2)
+            if ImageUtils._is_multi_scale(image_path, use_single_scale):
+                ImageUtils._template_scales[os.path.normpath(image_path)] = new_scale
 
-                ImageUtils._match_location = tuple(temp_location)
-                match_locations.append(ImageUtils._match_location)
-            elif ImageUtils._match_method != cv2.TM_SQDIFF and ImageUtils._match_method != cv2.TM_SQDIFF_NORMED and max_val >= confidence:
-                ImageUtils._match_location = max_loc
-                match_check = True
+            ImageUtils._match_location = ImageUtils._center_location(peaks[-1], width, height)
+            return [ImageUtils._center_location(peak, width, height) for peak in peaks]
 
-                region = (ImageUtils._match_location[0] + width, ImageUtils._match_location[1] + height)
-                cv2.rectangle(src, ImageUtils._match_location, region, 255, 5)
+        return []
 
-                if Settings.additional_calibration_required is False:
-                    temp_location = list(ImageUtils._match_location)
-                    temp_location[0] += int(width / 2)
-                    temp_location[1] += int(height / 2)
-                else:
-                    temp_location = list(ImageUtils._match_location)
-                    temp_location[0] += (pyautogui.size()[0] - (pyautogui.size()[0] - Settings.window_left)) + int(width / 2)
-                    temp_location[1] += (pyautogui.size()[1] - (pyautogui.size()[1] - Settings.window_top)) + int(height / 2)
+    @staticmethod
+    def _score_template(src: numpy.ndarray, image_path: str, use_single_scale: bool = False, confidence: Optional[float] = None) -> Tuple[float, Tuple[int, int], int, int]:
+        """Score the template image against an already captured frame using every scale in the scale range.
 
-                ImageUtils._match_location = tuple(temp_location)
-                match_locations.append(ImageUtils._match_location)
+        Args:
+            src (numpy.ndarray): The grayscale source frame.
+            image_path (str): The file path of the template image.
+            use_single_scale (bool, optional): Use a range of scales if this is disabled. Otherwise, it will use the custom_scale value. Defaults to False.
+            confidence (float, optional): Stop at the first scale that reaches this score instead of scoring the rest of the range. Defaults to None.
+
+        Returns:
+            (Tuple[float, Tuple[int, int], int, int]): The best score where higher is better, the top-left corner of that match inside the frame and the width and height of the template.
+        """
+        best_score = -1.0
+        best_location = (0, 0)
+        best_width = 0
+        best_height = 0
 
-        # Now loop until all other matches are found and break out when there are no more to be found.
-        while match_check:
+        for new_scale in ImageUtils._get_template_scales(image_path, use_single_scale):
+            template_array = ImageUtils._load_template(image_path, new_scale)
             height, width = template_array.shape
+            if height > src.shape[0] or width > src.shape[1]:
+                continue
 
-            result: numpy.ndarray = cv2.matchTemplate(src, template_array, ImageUtils._match_method)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            score, location = ImageUtils._best_match(src, template_array)
+            if score > best_score:
+                best_score, best_location, best_width, best_height = score, location, width, height
+                if confidence is not None and score >= confidence:
+                    break
 
-            if (ImageUtils._match_method == cv2.TM_SQDIFF or ImageUtils._match_method == cv2.TM_SQDIFF_NORMED) and min_val <= 1.0 - confidence:
-                ImageUtils._match_location = min_loc
+        return best_score, best_location, best_width, best_height
 
-                if Settings.debug_mode:
-                    MessageLog.print_message(f"[DEBUG] Match found with {min_val:.4f} <= {confidence:.2f} at Point {ImageUtils._match_location} using scale: {new_scale:.2f}.")
-                    cv2.imwrite(f"temp/matchAll.png", src)
+    @staticmethod
+    def classify_screen(candidates: List[str], custom_confidence: float = None, is_sub: bool = False) -> Tuple[Optional[str], Dict[str, float], Dict[str, Tuple[int, int]]]:
+        """Take a single screenshot and score every candidate template against it so that checking for several screens costs only one capture.
 
-                region = (ImageUtils._match_location[0] + width, ImageUtils._match_location[1] + height)
-                cv2.rectangle(src, ImageUtils._match_location, region, 255, 5)
+        Args:
+            candidates (List[str]): Names of the header images in the /images/headers/ folder. Prefix a name with "buttons/" to use the button image in the /images/buttons/ folder instead.
+            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to None which uses Settings.confidence.
+            is_sub (bool, optional): Flag to enable usage of a second window. Defaults to False.
 
-                if Settings.additional_calibration_required is False:
-                    temp_location = list(ImageUtils._match_location)
-                    temp_location[0] += int(width / 2)
-                    temp_location[1] += int(height / 2)
-                else:
-                    temp_location = list(ImageUtils._match_location)
-                    temp_location[0] += (pyautogui.size()[0] - (pyautogui.size()[0] - Settings.window_left)) + int(width / 2)
-                    temp_location[1] += (pyautogui.size()[1] - (pyautogui.size()[1] - Settings.window_top)) + int(height / 2)
-
-                ImageUtils._match_location = tuple(temp_location)
-
-                if match_locations.__contains__(ImageUtils._match_location) is False and \
-                        match_locations.__contains__(tuple([ImageUtils._match_location[0] + 1, ImageUtils._match_location[1]])) is False and \
-                        match_locations.__contains__(tuple([ImageUtils._match_location[0], ImageUtils._match_location[1] + 1])) is False and \
-                        match_locations.__contains__(tuple([ImageUtils._match_location[0] + 1, ImageUtils._match_location[1] + 1])) is False:
-                    match_locations.append(ImageUtils._match_location)
-                elif match_locations.__contains__(ImageUtils._match_location):
-                    break
-            elif ImageUtils._match_method != cv2.TM_SQDIFF and ImageUtils._match_method != cv2.TM_SQDIFF_NORMED and max_val >= confidence:
-                ImageUtils._match_location = max_loc
+        Returns:
+            (Tuple[Optional[str], Dict[str, float], Dict[str, Tuple[int, int]]]): The name of the highest scoring candidate that passed the confidence threshold or None if none did,
+                the scores of every candidate and the screen locations of every candidate that passed the confidence threshold.
+        """
+        if custom_confidence is None:
+            custom_confidence = Settings.confidence
 
-                if Settings.debug_mode:
-                    MessageLog.print_message(f"[DEBUG] Match found with {max_val:.4f} >= {confidence:.2f} at Point {ImageUtils._match_location} using scale: {new_scale:.2f}.")
-                    cv2.imwrite(f"temp/matchAll.png", src)
+        src: numpy.ndarray = ImageUtils._capture(is_sub = is_sub)
 
-                region = (ImageUtils._match_location[0] + width, ImageUtils._match_location[1] + height)
-                cv2.rectangle(src, ImageUtils._match_location, region, 255, 5)
+        scores: Dict[str, float] = {}
+        locations: Dict[str, Tuple[int, int]] = {}
+        best_candidate: Optional[str] = None
 
-                if Settings.additional_calibration_required is False:
-                    temp_location = list(ImageUtils._match_location)
-                    temp_location[0] += int(width / 2)
-                    temp_location[1] += int(height / 2)
-                else:
-                    temp_location = list(ImageUtils._match_location)
-                    temp_location[0] += (pyautogui.size()[0] - (pyautogui.size()[0] - Settings.window_left)) + int(width / 2)
-                    temp_location[1] += (pyautogui.size()[1] - (pyautogui.size()[1] - Settings.window_top)) + int(height / 2)
-
-                ImageUtils._match_location = tuple(temp_location)
-
-                if match_locations.__contains__(ImageUtils._match_location) is False and \
-                        match_locations.__contains__(tuple([ImageUtils._match_location[0] + 1, ImageUtils._match_location[1]])) is False and \
-                        match_locations.__contains__(tuple([ImageUtils._match_location[0], ImageUtils._match_location[1] + 1])) is False and \
-                        match_locations.__contains__(tuple([ImageUtils._match_location[0] + 1, ImageUtils._match_location[1] + 1])) is False:
-                    match_locations.append(ImageUtils._match_location)
-                elif match_locations.__contains__(ImageUtils._match_location):
-                    break
+        for candidate in candidates:
+            if candidate.startswith("buttons/"):
+                image_path = f"{ImageUtils._current_dir}/images/{candidate.lower()}.jpg"
             else:
-                if Settings.debug_mode:
-                    if ImageUtils._match_method == cv2.TM_SQDIFF or ImageUtils._match_method == cv2.TM_SQDIFF_NORMED:
-                        MessageLog.print_message(f"[WARNING] Match not found with {min_val:.4f} not <= {(1.0 - confidence):.2f} at Point {min_loc} using scale: {new_scale:.2f}.")
-                    else:
-                        MessageLog.print_message(f"[WARNING] Match not found with {max_val:.4f} not >= {confidence:.2f} at Point {max_loc} using scale: {new_scale:.2f}.")
+                image_path = f"{ImageUtils._current_dir}/images/headers/{candidate.lower()}_header.jpg"
+
+            score, location, width, height = ImageUtils._score_template(src, image_path, confidence = custom_confidence)
+            scores[candidate] = score
+
+            if score >= custom_confidence:
+                locations[candidate] = ImageUtils._to_screen_location(location, width, height, is_sub = is_sub)
+                if best_candidate is None or score > scores[best_candidate]:
+                    best_candidate = candidate
 
-                match_check = False
+        if best_candidate is not None:
+            ImageUtils._match_location = locations[best_candidate]
 
-        del scales
-        return match_locations
+        if Settings.debug_mode:
+            MessageLog.print_message(f"[DEBUG] Screen classified as {str(best_candidate).upper()} with scores: { {name: round(score, 4) for name, score in scores.items()} }")
+
+        return best_candidate, scores, locations
+
+    @staticmethod
+    def frame_digest(is_sub: bool = False) -> Tuple[Tuple[int, ...], int]:
+        """Capture a fresh frame and get a cheap digest of its pixels to tell whether anything on the screen changed since an earlier frame.
+
+        The frame stays in the frame cache so that classifying or matching against it right after does not capture it again.
+
+        Args:
+            is_sub (bool, optional): Capture the sub window instead of the main window. Defaults to False.
+
+        Returns:
+            (Tuple[Tuple[int, ...], int]): The shape and the CRC32 of the frame.
+        """
+        src = ImageUtils._capture(is_sub = is_sub, use_cache = False)
+        return src.shape, zlib.crc32(numpy.ascontiguousarray(src))
 
     @staticmethod
     def _determine_adjustment(image_name: str) -> int:
@@ -461,23 +787,25 @@ class ImageUtils:
             return 0
 
     @staticmethod
-    def find_button(image_name: str, custom_confidence: float = Settings.confidence, tries: int = 5, suppress_error: bool = False, disable_adjustment: bool = False,
-                    bypass_general_adjustment: bool = False, test_mode: bool = False, is_sub = False) -> Optional[Tuple[int, int]]:
+    def find_button(image_name: str, custom_confidence: float = None, tries: int = 5, suppress_error: bool = False, disable_adjustment: bool = False,
+                    bypass_general_adjustment: bool = False, is_sub = False) -> Optional[Tuple[int, int]]:
         """Find the location of the specified button.
 
         Args:
             image_name (str): Name of the button image file in the /images/buttons/ folder.
-            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to 0.8.
+            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to None which uses Settings.confidence.
             tries (int, optional): Number of tries before failing. Note that this gets overridden if the image_name is one of the adjustments. Defaults to 5.
             suppress_error (bool, optional): Suppresses template matching error if True. Defaults to False.
             disable_adjustment (bool, optional): Disable the usage of adjustment to tries. Defaults to False.
             bypass_general_adjustment (bool, optional): Bypass using the general adjustment for the number of tries. Defaults to False.
-            test_mode (bool, optional): Flag to test and get a valid scale for device compatibility. Defaults to False.
             is_sub (bool, optional): Flag to enable usage of a second window. Defaults to False.
 
         Returns:
             Coordinates of where the center of the button is located if image matching was successful.
         """
+        if custom_confidence is None:
+            custom_confidence = Settings.confidence
+
         if Settings.debug_mode:
             MessageLog.print_message(f"\n[DEBUG] Starting process to find the {image_name.upper()} button image...")
 
@@ -490,43 +818,32 @@ class ImageUtils:
         else:
             new_tries = tries
 
-        # If Test Mode is enabled, prepare for it by setting initial scale.
-        if test_mode:
-            new_tries = 50
-            ImageUtils._custom_scale = 0.30
-
+        # Only the first try may reuse a recent frame as the following tries are waiting for the screen to change.
+        is_first_try = True
         while new_tries > 0:
             result_flag: bool = ImageUtils._match(f"{ImageUtils._current_dir}/images/buttons/{image_name.lower()}.jpg", confidence = custom_confidence,
-                                                  use_single_scale = Settings.enable_test_for_home_screen, is_sub = is_sub) is not None
+                                                  use_single_scale = Settings.enable_test_for_home_screen, is_sub = is_sub, use_cache = is_first_try) is not None
 
             if result_flag is False:
-                if test_mode:
-                    # Increment scale by 0.02 until a match is found if Test Mode is enabled.
-                    ImageUtils._custom_scale += 0.02
-
+                is_first_try = False
                 new_tries -= 1
                 if new_tries <= 0:
                     if not suppress_error:
                         MessageLog.print_message(f"[WARNING] Failed to find the {image_name.upper()} button.")
                     return None
             else:
-                if test_mode:
-                    MessageLog.print_message(f"[SUCCESS] Found {image_name.upper()} at {ImageUtils._match_location} with scale {ImageUtils._custom_scale:.2f}.\n\nRecommended to use " +
-                                             f"scale {(ImageUtils._custom_scale + 0.01):.2f}, {(ImageUtils._custom_scale + 0.02):.2f}, {(ImageUtils._custom_scale + 0.03):.2f} or "
-                                             f"{(ImageUtils._custom_scale + 0.04):.2f}.")
-
                 return ImageUtils._match_location
 
         return None
 
     @staticmethod
-    def confirm_location(image_name: str, custom_confidence: float = Settings.confidence, tries: int = 5, suppress_error: bool = False, disable_adjustment: bool = False,
+    def confirm_location(image_name: str, custom_confidence: float = None, tries: int = 5, suppress_error: bool = False, disable_adjustment: bool = False,
                          bypass_general_adjustment: bool = False):
         """Confirm the position of the bot by searching for the header image.
 
         Args:
             image_name (str): Name of the header image file in the /images/headers/ folder.
-            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to 0.8.
+            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to None which uses Settings.confidence.
             tries (int, optional): Number of tries before failing. Note that this gets overridden if the image_name is one of the adjustments. Defaults to 5.
             suppress_error (bool, optional): Suppresses template matching error if True. Defaults to False.
             disable_adjustment (bool, optional): Disable the usage of adjustment to tries. Defaults to False.
@@ -535,6 +852,9 @@ class ImageUtils:
         Returns:
             (bool): True if current location is confirmed. Otherwise, False.
         """
+        if custom_confidence is None:
+            custom_confidence = Settings.confidence
+
         if Settings.debug_mode:
             MessageLog.print_message(f"\n[DEBUG] Starting process to find the {image_name.upper()} button image...")
 
@@ -551,10 +871,13 @@ class ImageUtils:
                 Settings.enable_support_summon_selection_screen_adjustment:
             new_tries = Settings.adjust_support_summon_selection_screen
 
+        # Only the first try may reuse a recent frame as the following tries are waiting for the screen to change.
+        is_first_try = True
         while new_tries > 0:
-            result_flag: bool = ImageUtils._match(f"{ImageUtils._current_dir}/images/headers/{image_name.lower()}_header.jpg", custom_confidence) is not None
+            result_flag: bool = ImageUtils._match(f"{ImageUtils._current_dir}/images/headers/{image_name.lower()}_header.jpg", custom_confidence, use_cache = is_first_try) is not None
 
             if result_flag is False:
+                is_first_try = False
                 new_tries -= 1
                 if new_tries <= 0:
                     if not suppress_error:
@@ -566,13 +889,13 @@ class ImageUtils:
         return False
 
     @staticmethod
-    def find_summon(summon_list: List[str], summon_element_list: List[str], custom_confidence: float = Settings.confidence, suppress_error: bool = False):
+    def find_summon(summon_list: List[str], summon_element_list: List[str], custom_confidence: float = None, suppress_error: bool = False):
         """Find the location of the specified Summon. Will attempt to scroll the screen down to see more Summons if the initial screen position yielded no matches.
 
         Args:
             summon_list (List[str]): List of names of the Summon image's file name in /images/summons/ folder.
             summon_element_list (List[str]): List of names of the Summon element image file in the /images/buttons/ folder.
-            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to 0.8.
+            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to None which uses Settings.confidence.
             suppress_error (bool, optional): Suppresses template matching error if True. Defaults to False.
 
         Returns:
@@ -580,6 +903,9 @@ class ImageUtils:
         """
         from bot.game import Game
 
+        if custom_confidence is None:
+            custom_confidence = Settings.confidence
+
         if Settings.debug_mode:
             MessageLog.print_message(f"[DEBUG] Received the following list of Summons to search for: {str(summon_list)}")
             MessageLog.print_message(f"[DEBUG] Received the following list of Elements: {str(summon_element_list)}")
@@ -679,18 +1005,21 @@ class ImageUtils:
             Game.wait(1.0)
 
     @staticmethod
-    def find(image_name: str, is_item: bool = False, custom_confidence: float = Settings.confidence_all) \
+    def find(image_name: str, is_item: bool = False, custom_confidence: float = None) \
             -> Tuple[int, ...]:
         """Find the specified image file by locating one occurrence on the screen.
 
         Args:
             image_name (str): Name of the image file in the /images/buttons folder.
             is_item (bool, optional): Determines whether to search for the image file in the /images/buttons/ or /images/items/ folder. Defaults to False.
-            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to 0.8.
+            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to None which uses Settings.confidence_all.
 
         Returns:
             (Tuple[int, ...]): Occurrence found on the screen. If no occurrence was found, return None
         """
+        if custom_confidence is None:
+            custom_confidence = Settings.confidence_all
+
         if is_item:
             folder_name = "items"
         else:
@@ -699,18 +1028,21 @@ class ImageUtils:
         return ImageUtils._match(f"{ImageUtils._current_dir}/images/{folder_name}/{image_name}.jpg", custom_confidence)
 
     @staticmethod
-    def find_all(image_name: str, is_item: bool = False, custom_confidence: float = Settings.confidence_all, hide_info: bool = False) -> List[Tuple[int, ...]]:
+    def find_all(image_name: str, is_item: bool = False, custom_confidence: float = None, hide_info: bool = False) -> List[Tuple[int, ...]]:
         """Find the specified image file by locating all occurrences on the screen.
 
         Args:
             image_name (str): Name of the image file in the /images/buttons folder.
             is_item (bool, optional): Determines whether to search for the image file in the /images/buttons/ or /images/items/ folder. Defaults to False.
-            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to 0.8.
+            custom_confidence (float, optional): Accuracy threshold for matching. Defaults to None which uses Settings.confidence_all.
             hide_info (bool, optional): Whether to print the matches' locations. Defaults to False.
 
         Returns:
             (List[Tuple[int, ...]): List of occurrences found on the screen. If no occurrence was found, return a empty list.
         """
+        if custom_confidence is None:
+            custom_confidence = Settings.confidence_all
+
         if is_item:
             folder_name = "items"
         else:
@@ -762,104 +1094,219 @@ class ImageUtils:
         return filtered_locations
 
     @staticmethod
-    def find_farmed_items(item_name: str, take_screenshot: bool = True) -> int:
-        """Detect amounts of items gained according to the desired items specified.
+    def _get_window_region() -> Optional[Tuple[int, int, int, int]]:
+        """Get the region of the calibrated window.
+
+        Returns:
+            (Tuple[int, int, int, int]): The region as (left, top, width, height) or None if the window has not been calibrated yet.
+        """
+        if Settings.window_left is not None and Settings.window_top is not None and Settings.window_width is not None and Settings.window_height is not None:
+            return Settings.window_left, Settings.window_top, Settings.window_width, Settings.window_height
+        else:
+            return None
+
+    @staticmethod
+    def _crop_item_count(frame: numpy.ndarray, location: Tuple[int, int], profile: Dict = None) -> numpy.ndarray:
+        """Cut out the area next to the item where its amount is written.
 
         Args:
-            item_name (str): Item to be found.
-            take_screenshot (bool, optional): Takes a screenshot whenever matches were detected. Defaults to True.
+            frame (numpy.ndarray): The frame of the calibrated window.
+            location (Tuple[int, int]): The location of the item as returned by find_all().
+            profile (Dict, optional): The loot profile of the item with the offset and size of the crop. Defaults to None which uses the default loot profile.
 
         Returns:
-            (int): Amount gained for the item.
+            (numpy.ndarray): The crop of the item amount.
+        """
+        if profile is None:
+            profile = LootProfiles.get_default()
+
+        # Locations only include the window offset when additional calibration is required so convert them back into frame coordinates.
+        x, y = location
+        if Settings.additional_calibration_required:
+            x -= Settings.window_left
+            y -= Settings.window_top
+
+        # Adjust the offsets and the size in images/loot_profiles.json if the numbers cannot be read correctly.
+        left = max(0, x + profile["cropOffset"][0])
+        top = max(0, y + profile["cropOffset"][1])
+        width, height = profile["cropSize"]
+        return frame[top:top + height, left:left + width]
+
+    @staticmethod
+    def _parse_item_count(result: List[str]) -> int:
+        """Parse the amount of an item out of the text that was read from its crop.
+
+        Args:
+            result (List[str]): The extracted text.
+
+        Returns:
+            (int): The amount of the item. Items without any text next to them count as 1.
+        """
+        # Split any unnecessary characters in the extracted text until only the number remains.
+        result_cleaned = 0
+        if len(result) != 0:
+            result_split = [char for char in result[0]]
+            for char in result_split:
+                try:
+                    if int(char):
+                        result_cleaned = int(char)
+                except ValueError:
+                    continue
+        else:
+            result_cleaned = 1
+
+        return result_cleaned
+
+    @staticmethod
+    def _has_gpu() -> bool:
+        """Check if EasyOCR can run on a CUDA device on this machine.
+
+        Returns:
+            (bool): True if PyTorch can see a CUDA device.
         """
         try:
-            if not os.path.exists(ImageUtils._current_dir + "/backend/model/"):
-                os.makedirs(ImageUtils._current_dir + "/backend/model/")
+            import torch
+            return torch.cuda.is_available()
+        except ImportError:
+            return False
+
+    @staticmethod
+    def _create_reader():
+        """Create the EasyOCR reader. This is run on the background thread started by warm_up_reader().
 
-            if not ImageUtils._reader:
-                MessageLog.print_message(f"\n[INFO] Initializing EasyOCR reader. This may take a few seconds...")
-                ImageUtils._reader = easyocr.Reader(["en"], model_storage_directory = ImageUtils._current_dir + "/backend/model/", gpu = True)
-                MessageLog.print_message(f"[INFO] EasyOCR reader initialized.")
+        Returns:
+            (easyocr.Reader): The EasyOCR reader.
+        """
+        import easyocr
+
+        model_dir = ImageUtils._current_dir + "/backend/model/"
+        if not os.path.exists(model_dir):
+            os.makedirs(model_dir)
+
+        use_gpu = ImageUtils._has_gpu()
+        start_time = time.time()
+        try:
+            MessageLog.print_message(f"\n[INFO] Initializing EasyOCR reader on the {'GPU' if use_gpu else 'CPU'} in the background...")
+            reader = easyocr.Reader(["en"], model_storage_directory = model_dir, gpu = use_gpu)
         except UnicodeEncodeError:
             # Tauri spawns the Python process using encoding cp1252 and not utf-8. Need to do this hacky way to force stdout to be utf-8 to get through
             # EasyOCR initialization as it uses Unicode characters. This process is not needed after EasyOCR downloads the models to the /model/ folder.
             MessageLog.print_message(f"\n[INFO] Seems that the models for EasyOCR has not been downloaded yet. Downloading them now after setting stdout encoding from cp1252 to utf-8...\n\n")
             sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
-            ImageUtils._reader = easyocr.Reader(["en"], model_storage_directory = ImageUtils._current_dir + "/backend/model/", gpu = True)
+            reader = easyocr.Reader(["en"], model_storage_directory = model_dir, gpu = use_gpu)
             MessageLog.print_message(f"\n[INFO] Models for EasyOCR has been downloaded successfully.\n\n")
 
-        # List of items blacklisted from using the standard confidence and instead need a custom confidence to detect them.
-        blacklisted_items = ["Fire Orb", "Water Orb", "Earth Orb", "Wind Orb", "Light Orb", "Dark Orb",
-                             "Red Tome", "Blue Tome", "Brown Tome", "Green Tome", "White Tome", "Black Tome",
-                             "Hellfire Scroll", "Flood Scroll", "Thunder Scroll", "Gale Scroll", "Skylight Scroll", "Chasm Scroll",
-                             "Jasper Scale", "Crystal Spirit", "Luminous Judgment", "Sagittarius Rune", "Sunlight Quartz", "Shadow Silver",
-                             "Ifrit Anima", "Cocytus Anima", "Vohu Manah Anima", "Sagittarius Anima", "Corow Anima", "Diablo Anima",
-                             "Ifrit Omega Anima", "Cocytus Omega Anima", "Vohu Manah Omega Anima", "Sagittarius Omega Anima", "Corow Omega Anima", "Diablo Omega Anima",
-                             "Ancient Ecke Sachs", "Ancient Auberon", "Ancient Perseus", "Ancient Nalakuvara", "Ancient Bow of Artemis", "Ancient Cortana",
-                             "Ecke Sachs", "Auberon", "Perseus", "Nalakuvara", "Bow of Artemis", "Cortana"]
-
-        lite_blacklisted_items = ["Infernal Garnet", "Frozen Hell Prism", "Evil Judge Crystal", "Horseman's Plate", "Halo Light Quartz", "Phantom Demon Jewel",
-                                  "Tiamat Anima", "Colossus Anima", "Leviathan Anima", "Yggdrasil Anima", "Luminiera Anima", "Celeste Anima",
-                                  "Tiamat Omega Anima", "Colossus Omega Anima", "Leviathan Omega Anima", "Yggdrasil Omega Anima", "Luminiera Omega Anima", "Celeste Omega Anima",
-                                  "Shiva Anima", "Europa Anima", "Alexiel Anima", "Grimnir Anima", "Metatron Anima", "Avatar Anima",
-                                  "Shiva Omega Anima", "Europa Omega Anima", "Alexiel Omega Anima", "Grimnir Omega Anima", "Metatron Omega Anima", "Avatar Omega Anima",
-                                  "Twin Elements Anima", "Macula Marius Anima", "Medusa Anima", "Nezha Anima", "Apollo Anima", "Dark Angel Olivia Anima",
-                                  "Twin Elements Omega Anima", "Macula Marius Omega Anima", "Medusa Omega Anima", "Nezha Omega Anima", "Apollo Omega Anima", "Dark Angel Olivia Omega Anima",
-                                  "Athena Anima", "Grani Anima", "Baal Anima", "Garuda Anima", "Odin Anima", "Lich Anima",
-                                  "Athena Omega Anima", "Grani Omega Anima", "Baal Omega Anima", "Garuda Omega Anima", "Odin Omega Anima", "Lich Omega Anima",
-                                  "Prometheus Anima", "Ca Ong Anima", "Gilgamesh Anima", "Morrigna Anima", "Hector Anima", "Anubis Anima",
-                                  "Prometheus Omega Anima", "Ca Ong Omega Anima", "Gilgamesh Omega Anima", "Morrigna Omega Anima", "Hector Omega Anima", "Anubis Omega Anima",
-                                  "Huanglong Anima", "Huanglong Omega Anima", "Qilin Anima", "Qilin Omega Anima"]
+        ImageUtils._reader = reader
+        MessageLog.print_message(f"[INFO] EasyOCR reader initialized in {time.time() - start_time:.2f} seconds.")
+        return reader
+
+    @staticmethod
+    def warm_up_reader():
+        """Start creating the EasyOCR reader on a background thread if it has not been started yet so that the first Loot Collected screen does not wait on it.
+
+        Returns:
+            None
+        """
+        if ImageUtils._reader_future is None:
+            if ImageUtils._reader_executor is None:
+                ImageUtils._reader_executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "easyocr")
+            ImageUtils._reader_future = ImageUtils._reader_executor.submit(ImageUtils._create_reader)
+
+        return None
+
+    @staticmethod
+    def stop_reader_warm_up():
+        """Shut down the background thread of warm_up_reader() without waiting on it. The reader is no longer created if it has not started yet.
+
+        Returns:
+            None
+        """
+        if ImageUtils._reader_executor is not None:
+            ImageUtils._reader_executor.shutdown(wait = False, cancel_futures = True)
+            ImageUtils._reader_executor = None
+
+            # Let the next call to warm_up_reader() start over if the reader was never created.
+            if ImageUtils._reader_future is not None and ImageUtils._reader_future.cancelled():
+                ImageUtils._reader_future = None
+
+        return None
+
+    @staticmethod
+    def _get_reader():
+        """Get the EasyOCR reader, waiting for the background initialization to finish if it is still running.
+
+        Returns:
+            (easyocr.Reader): The EasyOCR reader.
+        """
+        if ImageUtils._reader is not None:
+            return ImageUtils._reader
+
+        ImageUtils.warm_up_reader()
+        try:
+            return ImageUtils._reader_future.result()
+        except Exception:
+            # Let the next call try again instead of raising the same error forever.
+            ImageUtils._reader_future = None
+            raise
+
+    @staticmethod
+    def find_farmed_items(item_name: str, take_screenshot: bool = True) -> int:
+        """Detect amounts of items gained according to the desired items specified.
+
+        Args:
+            item_name (str): Item to be found.
+            take_screenshot (bool, optional): Takes a screenshot whenever matches were detected. Defaults to True.
+
+        Returns:
+            (int): Amount gained for the item.
+        """
+        profile = LootProfiles.get(item_name)
 
         MessageLog.print_message(f"[INFO] Now detecting item rewards...")
 
         total_amount_farmed = 0
 
-        # Detect amounts gained from each item on the Loot Collected screen. If the item is on the blacklist, use my method instead.
-        if item_name in blacklisted_items:
-            locations = ImageUtils.find_all(item_name, is_item = True, custom_confidence = 0.99)
-        elif item_name in lite_blacklisted_items:
-            locations = ImageUtils.find_all(item_name, is_item = True, custom_confidence = 0.85)
+        # Detect amounts gained from each item on the Loot Collected screen. Some items need a custom confidence to be detected which is set by their loot profile.
+        if profile["confidence"] is not None:
+            locations = ImageUtils.find_all(item_name, is_item = True, custom_confidence = profile["confidence"])
         else:
             locations = ImageUtils.find_all(item_name, is_item = True)
 
-        for index, location in enumerate(locations):
-            check = False
-
-            # Filter out any duplicate locations that are 1 pixels from each other when the item is in either of the blacklists.
-            if item_name in blacklisted_items or item_name in lite_blacklisted_items:
-                for x in range(index):
-                    if (abs(location[0] - locations[x][0]) <= 1 and location[1] == locations[x][1]) or (abs(location[1] - locations[x][1]) and location[0] == locations[x][0]) or (
-                            abs(location[0] - locations[x][0]) and abs(location[1] - locations[x][1])):
-                        check = True
-
-            if not check:
-                # Create a screenshot in the specified region named "test" and save it in the /temp/ folder. Then use EasyOCR to extract text from it into a list.
-                # Adjust the width and height variables if EasyOCR cannot detect the numbers correctly.
-                left = location[0] + 10
-                top = location[1] - 5
-                width = 30
-                height = 25
-                test_image = pyautogui.screenshot(f"temp/test.png", region = (left, top, width, height))
-                # test_image.show() # Uncomment this line of code to see what the bot captured for the region of the detected text.
-                result = ImageUtils._reader.readtext(f"temp/test.png", detail = 0)
-
-                # Split any unnecessary characters in the extracted text until only the number remains.
-                result_cleaned = 0
-                if len(result) != 0:
-                    result_split = [char for char in result[0]]
-                    for char in result_split:
-                        try:
-                            if int(char):
-                                result_cleaned = int(char)
-                        except ValueError:
-                            continue
-                else:
-                    result_cleaned = 1
-
-                total_amount_farmed += result_cleaned
+        # Filter out any duplicate locations that are within the dedup radius of each other.
+        filtered_locations = LootProfiles.deduplicate(locations, profile["dedupRadius"])
+        if len(filtered_locations) != len(locations):
+            MessageLog.print_message(f"[INFO] Duplicate location detected. Removed {len(locations) - len(filtered_locations)} of them...")
+
+        # Cut every item count out of a single frame of the Loot Collected screen.
+        frame = Capture.grab(region = ImageUtils._get_window_region())
+        crops: List[numpy.ndarray] = [ImageUtils._crop_item_count(frame, location, profile) for location in filtered_locations]
+
+        # Then read the amounts with the digit recognizer. Only the amounts that it is not certain about are sent to EasyOCR in a single batch if the fallback is enabled.
+        results = []
+        uncertain_indices = []
+        for index, crop in enumerate(crops):
+            result, is_certain = DigitRecognizer.read(crop)
+            results.append(result)
+            if not is_certain:
+                uncertain_indices.append(index)
+
+        if len(uncertain_indices) != 0:
+            if Settings.enable_easyocr_fallback:
+                MessageLog.print_message(f"[INFO] Digit recognizer was not certain about {len(uncertain_indices)} amount(s). Reading them with EasyOCR instead...")
+                fallback_crops = [crops[index] for index in uncertain_indices]
+                fallback_results = ImageUtils._get_reader().readtext_batched(fallback_crops, n_width = profile["cropSize"][0], n_height = profile["cropSize"][1],
+                                                                              batch_size = len(fallback_crops), detail = 0)
+                for index, result in zip(uncertain_indices, fallback_results):
+                    results[index] = result
             else:
-                MessageLog.print_message(f"[INFO] Duplicate location detected. Removing it...")
+                # Count an uncertain amount as a single item instead of trusting the read as a wrong amount could stop farming too early.
+                MessageLog.print_message(f"[WARNING] Digit recognizer was not certain about {len(uncertain_indices)} amount(s) read as {[results[index] for index in uncertain_indices]}. "
+                                         f"Counting each of them as 1. Enable the EasyOCR fallback to read them instead.")
+                for index in uncertain_indices:
+                    results[index] = []
+
+        for result in results:
+            total_amount_farmed += ImageUtils._parse_item_count(result)
 
         # If items were detected on the Quest Results screen, take a screenshot and save in the /results/ folder.    
         if take_screenshot and total_amount_farmed != 0:
@@ -868,6 +1315,69 @@ class ImageUtils:
         MessageLog.print_message(f"[INFO] Detection of item rewards finished.")
         return total_amount_farmed
 
+    @staticmethod
+    def _wait_for(image_name: str, timeout: int, should_appear: bool) -> bool:
+        """Poll the screen at the configured frame rate until the image appears or vanishes.
+
+        Template matching is skipped for frames where the watched pixels did not change since the last frame, as the result would be the same.
+        The pixels watched are the region of interest of the image while it is on screen and the whole frame otherwise, as the image could appear anywhere.
+
+        Args:
+            image_name (str): Name of the image file in the /images/buttons/ folder.
+            timeout (int): Timeout in seconds.
+            should_appear (bool): Wait for the image to appear if True or to vanish if False.
+
+        Returns:
+            (bool): True if the image appeared or vanished within the allotted time or False if timeout was reached.
+        """
+        image_path = f"{ImageUtils._current_dir}/images/buttons/{image_name.lower()}.jpg"
+        frame_interval = 1.0 / Settings.wait_fps if Settings.wait_fps > 0 else 0.0
+
+        frames_grabbed = 0
+        matches_run = 0
+        last_digest = None
+        is_found = False
+        is_done = False
+
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            frame_start_time = time.time()
+            src = ImageUtils._capture(use_cache = False)
+            frames_grabbed += 1
+
+            watched = src
+            if is_found:
+                roi = RoiRegistry.get(image_path, src.shape)
+                if roi is not None:
+                    left, top, right, bottom = roi
+                    watched = src[top:bottom, left:right]
+
+            digest = (watched.shape, zlib.crc32(numpy.ascontiguousarray(watched)))
+            if digest != last_digest:
+                is_found = ImageUtils._match(image_path, src = src) is not None
+                matches_run += 1
+                last_digest = digest
+
+                if is_found == should_appear:
+                    is_done = True
+                    break
+
+            time.sleep(max(0.0, frame_interval - (time.time() - frame_start_time)))
+
+        ImageUtils._wait_stats = {
+            "frames_grabbed": frames_grabbed,
+            "matches_run": matches_run,
+            "latency": time.time() - start_time if is_done else None
+        }
+
+        if Settings.debug_mode:
+            if is_done:
+                MessageLog.print_message(f"[DEBUG] Waited {ImageUtils._wait_stats['latency']:.2f} seconds for {image_name.upper()} with {frames_grabbed} frames grabbed and {matches_run} matches run.")
+            else:
+                MessageLog.print_message(f"[DEBUG] Timed out waiting for {image_name.upper()} with {frames_grabbed} frames grabbed and {matches_run} matches run.")
+
+        return is_done
+
     @staticmethod
     def wait_appear(image_name: str, timeout: int = 10, suppress_error: bool = False) -> bool:
         """Check if the provided image appears on the screen after a certain amount of time.
@@ -882,11 +1392,9 @@ class ImageUtils:
         """
         MessageLog.print_message(f"\n[INFO] Now waiting for {image_name.upper()} to appear on screen...")
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if ImageUtils._match(f"{ImageUtils._current_dir}/images/buttons/{image_name.lower()}.jpg"):
-                MessageLog.print_message(f"[SUCCESS] Image successfully appeared on screen...")
-                return True
+        if ImageUtils._wait_for(image_name, timeout, should_appear = True):
+            MessageLog.print_message(f"[SUCCESS] Image successfully appeared on screen...")
+            return True
 
         if suppress_error is False:
             MessageLog.print_message(f"[WARNING] Image did not appear on screen...")
@@ -907,11 +1415,9 @@ class ImageUtils:
         """
         MessageLog.print_message(f"\n[INFO] Now waiting for {image_name.upper()} to vanish from screen...")
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if not ImageUtils._match(f"{ImageUtils._current_dir}/images/buttons/{image_name.lower()}.jpg"):
-                MessageLog.print_message(f"[SUCCESS] Image successfully vanished from screen...")
-                return True
+        if ImageUtils._wait_for(image_name, timeout, should_appear = False):
+            MessageLog.print_message(f"[SUCCESS] Image successfully vanished from screen...")
+            return True
 
         if suppress_error is False:
             MessageLog.print_message(f"[WARNING] Image did not vanish from screen...")
@@ -928,12 +1434,8 @@ class ImageUtils:
         Returns:
             (Tuple[int, int]): Tuple of the width and the height of the image.
         """
-        if Settings.custom_scale == 1.0:
-            image = PIL.Image.open(f"{ImageUtils._current_dir}/images/buttons/{image_name.lower()}.jpg")
-        else:
-            image = PIL.Image.open(f"temp/rescaled.png")
-        width, height = image.size
-        image.close()
+        template = ImageUtils._load_template(f"{ImageUtils._current_dir}/images/buttons/{image_name.lower()}.jpg", ImageUtils._get_custom_scale())
+        height, width = template.shape
         return width, height
     
     @staticmethod
@@ -972,7 +1474,7 @@ class ImageUtils:
             ImageUtils._new_folder_name = f"{current_date} {current_time}"
 
         # Take a screenshot using the calibrated window dimensions.
-        new_image: PIL.Image.Image = pyautogui.screenshot(region = (Settings.window_left, Settings.window_top, Settings.window_width, Settings.window_height))
+        new_image: PIL.Image.Image = PIL.Image.fromarray(Capture.grab(region = (Settings.window_left, Settings.window_top, Settings.window_width, Settings.window_height)))
 
         # Create the /results/ directory if it does not already exist.
         current_dir = os.getcwd()
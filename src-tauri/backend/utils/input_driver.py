@@ -0,0 +1,557 @@
+import os
+import re
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy
+import pyautogui
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+from utils.capture import Capture
+
+try:
+    from Xlib import X, XK, display as xdisplay
+    from Xlib.ext import xtest
+except ImportError:
+    xdisplay = None
+
+
+class InputBackend:
+    """
+    Interface for sending mouse and keyboard input to the screen. Every call sends its input right away without any delay after it.
+    """
+
+    name: str = "base"
+
+    def position(self) -> Tuple[int, int]:
+        """Get the position of the cursor.
+
+        Returns:
+            (Tuple[int, int]): The position of the cursor on the screen.
+        """
+        raise NotImplementedError
+
+    def move_to(self, x: int, y: int):
+        """Move the cursor to the coordinates on the screen in one step.
+
+        Args:
+            x (int): X coordinate on the screen.
+            y (int): Y coordinate on the screen.
+
+        Returns:
+            None
+        """
+        raise NotImplementedError
+
+    def mouse_down(self):
+        """Press the left mouse button.
+
+        Returns:
+            None
+        """
+        raise NotImplementedError
+
+    def mouse_up(self):
+        """Release the left mouse button.
+
+        Returns:
+            None
+        """
+        raise NotImplementedError
+
+    def scroll(self, clicks: int, x: int, y: int):
+        """Scroll the mouse wheel at the coordinates.
+
+        Args:
+            clicks (int): How much to scroll. Positive for scrolling up and negative for scrolling down.
+            x (int): X coordinate on the screen.
+            y (int): Y coordinate on the screen.
+
+        Returns:
+            None
+        """
+        raise NotImplementedError
+
+    def key_down(self, key: str):
+        """Press the key.
+
+        Args:
+            key (str): Name of the key in PyAutoGUI's naming like "ctrl", "enter" or "a".
+
+        Returns:
+            None
+        """
+        raise NotImplementedError
+
+    def key_up(self, key: str):
+        """Release the key.
+
+        Args:
+            key (str): Name of the key in PyAutoGUI's naming like "ctrl", "enter" or "a".
+
+        Returns:
+            None
+        """
+        raise NotImplementedError
+
+    def write(self, text: str):
+        """Type the text.
+
+        Args:
+            text (str): The text to type.
+
+        Returns:
+            None
+        """
+        for character in text:
+            self.key_down(character)
+            self.key_up(character)
+        return None
+
+
+class PyAutoGUIInput(InputBackend):
+    """
+    Sends input through PyAutoGUI with its pause after every call turned off. Works everywhere.
+    """
+
+    name: str = "pyautogui"
+
+    def position(self) -> Tuple[int, int]:
+        x, y = pyautogui.position()
+        return int(x), int(y)
+
+    def move_to(self, x: int, y: int):
+        pyautogui.moveTo(int(x), int(y), _pause = False)
+
+    def mouse_down(self):
+        pyautogui.mouseDown(_pause = False)
+
+    def mouse_up(self):
+        pyautogui.mouseUp(_pause = False)
+
+    def scroll(self, clicks: int, x: int, y: int):
+        pyautogui.scroll(clicks, x = x, y = y, _pause = False)
+
+    def key_down(self, key: str):
+        pyautogui.keyDown(key, _pause = False)
+
+    def key_up(self, key: str):
+        pyautogui.keyUp(key, _pause = False)
+
+    def write(self, text: str):
+        pyautogui.write(text, _pause = False)
+
+
+class XTestInput(InputBackend):
+    """
+    Sends input on Linux straight to the X server through the XTest extension of python-xlib instead of going through PyAutoGUI's per-call overhead.
+    """
+
+    name: str = "xtest"
+
+    # PyAutoGUI's key names that differ from the names of the X keysyms.
+    _key_names = {
+        "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R", "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R", "alt": "Alt_L",
+        "altleft": "Alt_L", "altright": "Alt_R", "enter": "Return", "return": "Return", "del": "Delete", "delete": "Delete", "esc": "Escape", "escape": "Escape", "tab": "Tab",
+        "backspace": "BackSpace", "space": "space", "up": "Up", "down": "Down", "left": "Left", "right": "Right", "home": "Home", "end": "End", "pageup": "Page_Up",
+        "pagedown": "Page_Down",
+    }
+
+    def __init__(self):
+        self._display = xdisplay.Display()
+
+    def _flush(self):
+        """Send the queued events to the X server right away.
+
+        Returns:
+            None
+        """
+        self._display.sync()
+        return None
+
+    def _get_keycode(self, key: str) -> Tuple[int, bool]:
+        """Look up the keycode of the key.
+
+        Args:
+            key (str): Name of the key in PyAutoGUI's naming or a single character.
+
+        Returns:
+            (Tuple[int, bool]): The keycode and whether Shift has to be held to type it.
+        """
+        if len(key) == 1:
+            # The keysyms of Latin-1 characters are their code points.
+            keysym = ord(key)
+        elif key.lower() in XTestInput._key_names:
+            keysym = XK.string_to_keysym(XTestInput._key_names[key.lower()])
+        elif re.fullmatch(r"f\d+", key.lower()):
+            # Function keys like "f5" are named "F5" in X.
+            keysym = XK.string_to_keysym(key.upper())
+        else:
+            keysym = XK.string_to_keysym(key)
+
+        keycode = self._display.keysym_to_keycode(keysym)
+        if keycode == 0:
+            raise ValueError(f"The key \"{key}\" is not on the keyboard layout of the X server.")
+
+        return keycode, len(key) == 1 and self._display.keycode_to_keysym(keycode, 0) != keysym
+
+    def position(self) -> Tuple[int, int]:
+        pointer = self._display.screen().root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def move_to(self, x: int, y: int):
+        xtest.fake_input(self._display, X.MotionNotify, x = int(x), y = int(y))
+        self._flush()
+
+    def mouse_down(self):
+        xtest.fake_input(self._display, X.ButtonPress, 1)
+        self._flush()
+
+    def mouse_up(self):
+        xtest.fake_input(self._display, X.ButtonRelease, 1)
+        self._flush()
+
+    def scroll(self, clicks: int, x: int, y: int):
+        self.move_to(x, y)
+
+        # The wheel is button 4 for scrolling up and button 5 for scrolling down.
+        button = 4 if clicks > 0 else 5
+        for _ in range(abs(clicks)):
+            xtest.fake_input(self._display, X.ButtonPress, button)
+            xtest.fake_input(self._display, X.ButtonRelease, button)
+        self._flush()
+
+    def key_down(self, key: str):
+        keycode, needs_shift = self._get_keycode(key)
+        if needs_shift:
+            xtest.fake_input(self._display, X.KeyPress, self._get_keycode("shift")[0])
+        xtest.fake_input(self._display, X.KeyPress, keycode)
+        self._flush()
+
+    def key_up(self, key: str):
+        keycode, needs_shift = self._get_keycode(key)
+        xtest.fake_input(self._display, X.KeyRelease, keycode)
+        if needs_shift:
+            xtest.fake_input(self._display, X.KeyRelease, self._get_keycode("shift")[0])
+        self._flush()
+
+
+class RecordingInput(InputBackend):
+    """
+    Records the input instead of sending it so that tests can check what the bot would have done without a display.
+    """
+
+    name: str = "recording"
+
+    def __init__(self, x: int = 0, y: int = 0):
+        # The input as tuples of the name of the call followed by its arguments and the time.perf_counter() of each one.
+        self.events: List[tuple] = []
+        self.timestamps: List[float] = []
+        self._position = (x, y)
+
+    def _record(self, *event):
+        self.events.append(event)
+        self.timestamps.append(time.perf_counter())
+
+    def position(self) -> Tuple[int, int]:
+        return self._position
+
+    def move_to(self, x: int, y: int):
+        self._position = (int(x), int(y))
+        self._record("move_to", int(x), int(y))
+
+    def mouse_down(self):
+        self._record("mouse_down")
+
+    def mouse_up(self):
+        self._record("mouse_up")
+
+    def scroll(self, clicks: int, x: int, y: int):
+        self._position = (int(x), int(y))
+        self._record("scroll", clicks, int(x), int(y))
+
+    def key_down(self, key: str):
+        self._record("key_down", key)
+
+    def key_up(self, key: str):
+        self._record("key_up", key)
+
+    def write(self, text: str):
+        self._record("write", text)
+
+
+class InputSequence:
+    """
+    A list of input steps that InputDriver.play() sends on a fixed schedule, so that a whole chain of moves and clicks is planned up front and does not drift
+    from the time that each call takes.
+
+    Every method returns the sequence so that steps can be chained.
+    """
+
+    def __init__(self):
+        self.steps: List[tuple] = []
+
+    def move_along(self, points: numpy.ndarray, duration: float) -> "InputSequence":
+        """Move the cursor through every point evenly spread over the duration.
+
+        Args:
+            points (numpy.ndarray): The points of the path.
+            duration (float): Time in seconds that the movement should take.
+
+        Returns:
+            (InputSequence): The sequence.
+        """
+        self.steps.append(("move_along", points, duration))
+        return self
+
+    def click(self, hold_time: Optional[float] = None) -> "InputSequence":
+        """Click the left mouse button where the cursor is.
+
+        Args:
+            hold_time (float, optional): Time in seconds to hold the button down. Defaults to None which picks a random time between 0.02 and 0.12 seconds.
+
+        Returns:
+            (InputSequence): The sequence.
+        """
+        if not hold_time:
+            hold_time = numpy.random.uniform(0.02, 0.12)
+        self.steps.append(("mouse_down",))
+        self.steps.append(("pause", hold_time))
+        self.steps.append(("mouse_up",))
+        return self
+
+    def press(self, key: str, hold_time: Optional[float] = None) -> "InputSequence":
+        """Press and release the key.
+
+        Args:
+            key (str): Name of the key in PyAutoGUI's naming.
+            hold_time (float, optional): Time in seconds to hold the key down. Defaults to None which picks a random time between 0.04 and 0.15 seconds.
+
+        Returns:
+            (InputSequence): The sequence.
+        """
+        if not hold_time:
+            hold_time = numpy.random.uniform(0.04, 0.15)
+        self.steps.append(("key_down", key))
+        self.steps.append(("pause", hold_time))
+        self.steps.append(("key_up", key))
+        return self
+
+    def pause(self, seconds: float) -> "InputSequence":
+        """Wait before the next step.
+
+        Args:
+            seconds (float): Number of seconds to wait.
+
+        Returns:
+            (InputSequence): The sequence.
+        """
+        self.steps.append(("pause", seconds))
+        return self
+
+    def call(self, function: Callable[[], None]) -> "InputSequence":
+        """Call the function once every step before it was sent, like waiting for the screen to react. The schedule of the steps after it starts when it returns.
+
+        Args:
+            function (Callable[[], None]): The function.
+
+        Returns:
+            (InputSequence): The sequence.
+        """
+        self.steps.append(("call", function))
+        return self
+
+
+class InputDriver:
+    """
+    Sends mouse and keyboard input through the fastest available backend.
+
+    The backend is chosen by the device.inputBackend setting. "auto" uses XTest on Linux when python-xlib is installed and falls back to PyAutoGUI otherwise.
+    """
+
+    _backend: InputBackend = None
+
+    @staticmethod
+    def _available_backends() -> List[InputBackend]:
+        """Create every backend that can be used on this machine, fastest first.
+
+        Returns:
+            (List[InputBackend]): List of backends.
+        """
+        backends: List[InputBackend] = []
+        if xdisplay is not None and sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+            try:
+                backends.append(XTestInput())
+            except Exception as e:
+                MessageLog.print_message(f"[WARNING] Unable to connect to the X server for the \"xtest\" input backend: {e}")
+        backends.append(PyAutoGUIInput())
+        return backends
+
+    @staticmethod
+    def get_backend() -> InputBackend:
+        """Get the backend in use, choosing it on the first call.
+
+        Returns:
+            (InputBackend): The backend in use.
+        """
+        if InputDriver._backend is None:
+            backends = InputDriver._available_backends()
+            if Settings.input_backend != "auto":
+                chosen = [backend for backend in backends if backend.name == Settings.input_backend]
+                if len(chosen) == 0:
+                    MessageLog.print_message(f"[WARNING] Input backend \"{Settings.input_backend}\" is not available. Falling back to \"{backends[0].name}\".")
+                else:
+                    backends = chosen
+
+            InputDriver._backend = backends[0]
+            if Settings.debug_mode:
+                MessageLog.print_message(f"[DEBUG] Using the \"{InputDriver._backend.name}\" input backend.")
+
+        return InputDriver._backend
+
+    @staticmethod
+    def position() -> Tuple[int, int]:
+        """Get the position of the cursor.
+
+        Returns:
+            (Tuple[int, int]): The position of the cursor on the screen.
+        """
+        return InputDriver.get_backend().position()
+
+    @staticmethod
+    def play(sequence: InputSequence):
+        """Send the steps of the sequence, each one at its scheduled time after the start.
+
+        Args:
+            sequence (InputSequence): The sequence.
+
+        Returns:
+            None
+        """
+        backend = InputDriver.get_backend()
+        start_time = time.perf_counter()
+        offset = 0.0
+
+        def wait_for_schedule():
+            delay = start_time + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        for step in sequence.steps:
+            kind = step[0]
+            if kind == "move_along":
+                points, duration = step[1], step[2]
+                interval = duration / max(1, len(points))
+                for point_x, point_y in points:
+                    backend.move_to(int(point_x), int(point_y))
+                    offset += interval
+                    wait_for_schedule()
+            elif kind == "pause":
+                offset += step[1]
+                wait_for_schedule()
+            elif kind == "call":
+                # The screen may have changed from the input before so cached frames are out of date.
+                Capture.invalidate()
+                step[1]()
+                start_time = time.perf_counter()
+                offset = 0.0
+            else:
+                getattr(backend, kind)(*step[1:])
+
+        # The input can change the screen so any cached frame is out of date.
+        Capture.invalidate()
+        return None
+
+    @staticmethod
+    def move_to(x: int, y: int):
+        """Move the cursor to the coordinates on the screen in one step.
+
+        Args:
+            x (int): X coordinate on the screen.
+            y (int): Y coordinate on the screen.
+
+        Returns:
+            None
+        """
+        InputDriver.get_backend().move_to(x, y)
+        Capture.invalidate()
+        return None
+
+    @staticmethod
+    def click(hold_time: Optional[float] = None):
+        """Click the left mouse button where the cursor is.
+
+        Args:
+            hold_time (float, optional): Time in seconds to hold the button down. Defaults to None which picks a random time between 0.02 and 0.12 seconds.
+
+        Returns:
+            None
+        """
+        InputDriver.play(InputSequence().click(hold_time))
+        return None
+
+    @staticmethod
+    def scroll(clicks: int, x: int, y: int):
+        """Scroll the mouse wheel at the coordinates.
+
+        Args:
+            clicks (int): How much to scroll. Positive for scrolling up and negative for scrolling down.
+            x (int): X coordinate on the screen.
+            y (int): Y coordinate on the screen.
+
+        Returns:
+            None
+        """
+        InputDriver.get_backend().scroll(clicks, x, y)
+        Capture.invalidate()
+        return None
+
+    @staticmethod
+    def press(*keys: str):
+        """Press and release each key one after another.
+
+        Args:
+            *keys (str): Names of the keys in PyAutoGUI's naming.
+
+        Returns:
+            None
+        """
+        sequence = InputSequence()
+        for key in keys:
+            sequence.press(key)
+        InputDriver.play(sequence)
+        return None
+
+    @staticmethod
+    def hotkey(*keys: str):
+        """Press the keys in order and release them in reverse order like a keyboard shortcut.
+
+        Args:
+            *keys (str): Names of the keys in PyAutoGUI's naming like "ctrl", "v".
+
+        Returns:
+            None
+        """
+        backend = InputDriver.get_backend()
+        for key in keys:
+            backend.key_down(key)
+        for key in reversed(keys):
+            backend.key_up(key)
+        Capture.invalidate()
+        return None
+
+    @staticmethod
+    def write(text: str):
+        """Type the text.
+
+        Args:
+            text (str): The text to type.
+
+        Returns:
+            None
+        """
+        InputDriver.get_backend().write(text)
+        Capture.invalidate()
+        return None
@@ -0,0 +1,131 @@
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+
+
+class LootProfiles:
+    """
+    Registry of how each item is detected on the Loot Collected screen, loaded once from images/loot_profiles.json.
+
+    Items are grouped into families that share a profile of the confidence to match them with, the offset and size of the crop where their amount is written relative to their
+    location and the radius in pixels within which two matches count as the same item. Items that are not in any family use the default profile.
+    Adding a new family of items only needs a new entry in the JSON file.
+    """
+
+    _profile_path: str = f"{os.getcwd()}/images/loot_profiles.json"
+
+    # Used when the JSON file is missing or does not set every key. A confidence of None uses device.confidenceAll.
+    _fallback_profile: Dict[str, Any] = {
+        "confidence": None,
+        "cropOffset": (10, -5),
+        "cropSize": (30, 25),
+        "dedupRadius": 0
+    }
+
+    # Lazily loaded default profile and the merged profile of each item in a family.
+    _default_profile: Dict[str, Any] = None
+    _item_profiles: Dict[str, Dict[str, Any]] = None
+
+    @staticmethod
+    def _load():
+        """Load the profiles from the JSON file and merge every family onto the default profile.
+
+        Returns:
+            None
+        """
+        data = {}
+        if os.path.exists(LootProfiles._profile_path):
+            try:
+                with open(LootProfiles._profile_path) as file:
+                    data = json.load(file)
+            except (OSError, ValueError):
+                MessageLog.print_message(f"[WARNING] Failed to read the loot profiles from {LootProfiles._profile_path}. Using the default profile for every item.")
+        else:
+            MessageLog.print_message(f"[WARNING] Loot profiles were not found at {LootProfiles._profile_path}. Using the default profile for every item.")
+
+        default_profile = dict(LootProfiles._fallback_profile)
+        default_profile.update(data.get("default", {}))
+
+        item_profiles: Dict[str, Dict[str, Any]] = {}
+        for family_name, family in data.get("families", {}).items():
+            profile = dict(default_profile)
+            profile.update({key: value for key, value in family.items() if key in default_profile})
+            profile["family"] = family_name
+            for item_name in family.get("items", []):
+                if item_name in item_profiles:
+                    MessageLog.print_message(f"[WARNING] {item_name} is in both the {item_profiles[item_name]['family']} and {family_name} loot families. Using {family_name}.")
+                item_profiles[item_name] = profile
+
+        LootProfiles._default_profile = default_profile
+        LootProfiles._item_profiles = item_profiles
+
+        if Settings.debug_mode:
+            MessageLog.print_message(f"[DEBUG] Loaded the loot profiles of {len(item_profiles)} items.")
+
+        return None
+
+    @staticmethod
+    def get(item_name: str) -> Dict[str, Any]:
+        """Get the profile of the item.
+
+        Args:
+            item_name (str): Name of the item.
+
+        Returns:
+            (Dict[str, Any]): The profile with the confidence, cropOffset, cropSize and dedupRadius keys. Items without a family get the default profile.
+        """
+        if LootProfiles._item_profiles is None:
+            LootProfiles._load()
+
+        return LootProfiles._item_profiles.get(item_name, LootProfiles._default_profile)
+
+    @staticmethod
+    def get_default() -> Dict[str, Any]:
+        """Get the profile of items that are not in any family.
+
+        Returns:
+            (Dict[str, Any]): The default profile.
+        """
+        if LootProfiles._default_profile is None:
+            LootProfiles._load()
+
+        return LootProfiles._default_profile
+
+    @staticmethod
+    def deduplicate(locations: List[Tuple[int, ...]], radius: int) -> List[Tuple[int, ...]]:
+        """Remove the locations that are within the radius of an earlier location.
+
+        Locations are bucketed into a grid of cells that are as large as the radius so that each location is only compared against the locations in its neighbouring cells.
+
+        Args:
+            locations (List[Tuple[int, ...]]): The matched locations in the order that they were found.
+            radius (int): Locations this many pixels or fewer apart on both axes count as the same. A radius below 1 keeps every location.
+
+        Returns:
+            (List[Tuple[int, ...]]): The locations that were kept in their original order.
+        """
+        if radius < 1:
+            return list(locations)
+
+        cell_size = radius + 1
+        grid: Dict[Tuple[int, int], List[Tuple[int, ...]]] = {}
+        kept_locations: List[Tuple[int, ...]] = []
+        for location in locations:
+            cell_x, cell_y = location[0] // cell_size, location[1] // cell_size
+
+            is_duplicate = False
+            for neighbour_x in range(cell_x - 1, cell_x + 2):
+                for neighbour_y in range(cell_y - 1, cell_y + 2):
+                    for kept_location in grid.get((neighbour_x, neighbour_y), []):
+                        if abs(location[0] - kept_location[0]) <= radius and abs(location[1] - kept_location[1]) <= radius:
+                            is_duplicate = True
+                            break
+
+            if not is_duplicate:
+                grid.setdefault((cell_x, cell_y), []).append(location)
+                kept_locations.append(location)
+
+        return kept_locations
@@ -1,20 +1,122 @@
+import atexit
 import datetime
-from timeit import default_timer as timer
-import inspect
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from timeit import default_timer as timer
+from typing import Dict, Optional
+
+
+class _PassthroughQueueHandler(QueueHandler):
+    """
+    Puts records on the queue as they are so that all of the formatting happens on the writer thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """
+    Writes records to whatever sys.stdout currently is as the EasyOCR initialization can replace it, which the Tauri frontend then reads line by line.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    def emit(self, record: logging.LogRecord):
+        self.stream = sys.stdout
+        try:
+            message = self.format(record)
+            try:
+                self.stream.write(message + self.terminator)
+            except UnicodeEncodeError:
+                # Clean out any characters that the console cannot encode before printing.
+                encoding = getattr(self.stream, "encoding", None) or "utf-8"
+                self.stream.write(message.encode(encoding, "ignore").decode(encoding) + self.terminator)
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class _ConsoleFormatter(logging.Formatter):
+    """
+    Formats records like "00:01:23 [INFO] message" with the caller in front of the message if it was looked up.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        prefix = ""
+        if message.startswith("\n"):
+            prefix = "\n"
+            message = message[len("\n"):]
+
+        caller = f"[{record.caller}]" if record.caller else ""
+        return prefix + MessageLog._format_elapsed(record.elapsed) + " " + caller + message
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line for analyzing the log later.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(timespec = "milliseconds"),
+            "elapsed": round(record.elapsed, 3),
+            "level": record.levelname,
+            "caller": record.caller or None,
+            "message": record.getMessage().strip("\n")
+        }, ensure_ascii = False)
 
 
 class MessageLog:
     """
     Provides utility functions to print for the message log.
+
+    Messages are put on a queue and written out by a background thread so that printing never blocks the bot. Messages below the log level are dropped before any formatting.
     """
 
     _starting_time = timer()
 
     enable_inspect_caller = False
 
-    logging.basicConfig(format='%(message)s', level=logging.INFO, stream=sys.stdout)
+    # Messages that start with one of these tags are logged at its level and every other message is logged at INFO.
+    _tag_levels: Dict[str, int] = {
+        "[DEBUG]": logging.DEBUG,
+        "[WARNING]": logging.WARNING,
+        "[ERROR]": logging.ERROR
+    }
+    _level: int = logging.DEBUG
+
+    # Optional file that every message is also written to as JSON lines.
+    _json_path: Optional[str] = None
+
+    _logger = logging.getLogger("gbf_automation")
+    _logger.propagate = False
+    _logger.setLevel(logging.DEBUG)
+
+    # The writer thread is started on the first message of each process as a forked bot process does not inherit the thread of its parent.
+    _listener: QueueListener = None
+    _listener_pid: int = None
+    _listener_lock = threading.Lock()
+    _is_exit_registered: bool = False
+
+    @staticmethod
+    def _format_elapsed(elapsed: float) -> str:
+        """Formats the elapsed time into a readable, printable HH:MM:SS format using timedelta.
+
+        Args:
+            elapsed (float): Seconds since the bot started.
+
+        Returns:
+            str: A formatted string that displays the elapsed time.
+        """
+        return str(datetime.timedelta(seconds = elapsed)).split('.')[0]
 
     @staticmethod
     def _print_time():
@@ -23,7 +125,100 @@ class MessageLog:
         Returns:
             str: A formatted string that displays the elapsed time since the bot started.
         """
-        return str(datetime.timedelta(seconds = (timer() - MessageLog._starting_time))).split('.')[0]
+        return MessageLog._format_elapsed(timer() - MessageLog._starting_time)
+
+    @staticmethod
+    def _start():
+        """Start the writer thread for this process.
+
+        Returns:
+            None
+        """
+        with MessageLog._listener_lock:
+            if MessageLog._listener is not None and MessageLog._listener_pid == os.getpid():
+                return None
+
+            console_handler = _ConsoleHandler()
+            console_handler.setFormatter(_ConsoleFormatter())
+            handlers = [console_handler]
+            if MessageLog._json_path:
+                json_handler = logging.FileHandler(MessageLog._json_path, encoding = "utf-8")
+                json_handler.setFormatter(_JsonLinesFormatter())
+                handlers.append(json_handler)
+
+            message_queue = queue.SimpleQueue()
+            MessageLog._logger.handlers = [_PassthroughQueueHandler(message_queue)]
+            MessageLog._listener = QueueListener(message_queue, *handlers)
+            MessageLog._listener.start()
+            MessageLog._listener_pid = os.getpid()
+
+            if not MessageLog._is_exit_registered:
+                atexit.register(MessageLog.stop)
+                MessageLog._is_exit_registered = True
+
+        return None
+
+    @staticmethod
+    def stop():
+        """Write out every queued message and stop the writer thread. The next message starts it again.
+
+        Returns:
+            None
+        """
+        with MessageLog._listener_lock:
+            if MessageLog._listener is None or MessageLog._listener_pid != os.getpid():
+                return None
+
+            MessageLog._listener.stop()
+            for handler in MessageLog._listener.handlers:
+                handler.close()
+            MessageLog._listener = None
+
+        return None
+
+    @staticmethod
+    def set_level(level: int):
+        """Set the lowest level of messages that are printed.
+
+        Args:
+            level (int): The level like logging.INFO.
+
+        Returns:
+            None
+        """
+        MessageLog._level = level
+        return None
+
+    @staticmethod
+    def enable_json_sink(json_path: Optional[str]):
+        """Also write every message to the file as JSON lines, or stop doing so if the path is empty.
+
+        Args:
+            json_path (str, optional): The file path to append to.
+
+        Returns:
+            None
+        """
+        if json_path != MessageLog._json_path:
+            MessageLog.stop()
+            MessageLog._json_path = json_path or None
+
+        return None
+
+    @staticmethod
+    def _get_level(message: str) -> int:
+        """Get the level of the message from its tag.
+
+        Args:
+            message (str): The message.
+
+        Returns:
+            (int): The level of the message.
+        """
+        start = 1 if message.startswith("\n") else 0
+        if message.startswith("[", start):
+            return MessageLog._tag_levels.get(message[start:message.find("]", start) + 1], logging.INFO)
+        return logging.INFO
 
     @staticmethod
     def print_message(message: str):
@@ -32,23 +227,14 @@ class MessageLog:
         Returns:
             None
         """
-        # Loop until the status flag has been set to 1.
-        if message.startswith("\n"):
-            if MessageLog.enable_inspect_caller:
-                new_message = "\n" + MessageLog._print_time() + " " + f"[{inspect.stack()[1][3]}]" + message[len("\n"):]
-            else:
-                new_message = "\n" + MessageLog._print_time() + " " + message[len("\n"):]
-        else:
-            if MessageLog.enable_inspect_caller:
-                new_message = MessageLog._print_time() + " " + f"[{inspect.stack()[1][3]}]" + message
-            else:
-                new_message = MessageLog._print_time() + " " + message
+        level = MessageLog._get_level(message)
+        if level < MessageLog._level:
+            return None
 
-        try:
-            logging.info(new_message)
-        except UnicodeEncodeError:
-            # Clean out any non UTF-8 characters before printing.
-            new_message_decoded = new_message.encode("utf-8", "ignore")
-            logging.info(new_message_decoded)
+        caller = sys._getframe(1).f_code.co_name if MessageLog.enable_inspect_caller else ""
+
+        if MessageLog._listener is None or MessageLog._listener_pid != os.getpid():
+            MessageLog._start()
 
+        MessageLog._logger.log(level, message, extra = {"elapsed": timer() - MessageLog._starting_time, "caller": caller})
         return None
@@ -0,0 +1,108 @@
+from math import comb
+from typing import Tuple
+
+import numpy as np
+
+
+class MouseCurves:
+    """
+    Generates human-like paths for the cursor out of a pool of precomputed curve shapes.
+
+    Every shape is a Bezier curve with randomized inner knots that goes from (0, 0) to (1, 0), so the first axis runs along the line between the two points and the second axis
+    is the sideways offset relative to the distance. A path is made by picking a shape, mirroring it at random and transforming it onto the start and end points, which only takes
+    a few array operations instead of building a new curve for every move.
+    """
+
+    # Number of shapes in the pool and number of samples along each shape.
+    _pool_size: int = 64
+    _sample_count: int = 256
+
+    # Number of inner knots of each Bezier curve and how far they can be from the straight line as a fraction of the distance.
+    _knot_count: int = 2
+    _offset_boundary: float = 0.2
+
+    # Lazily built array of shape (pool size, sample count, 2).
+    _pool: np.ndarray = None
+
+    @staticmethod
+    def _bezier(control_points: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """Evaluate the Bezier curve at the parameters.
+
+        Args:
+            control_points (np.ndarray): The control points of shape (n, 2).
+            t (np.ndarray): The parameters between 0 and 1.
+
+        Returns:
+            (np.ndarray): The points of shape (len(t), 2).
+        """
+        degree = len(control_points) - 1
+        coefficients = np.array([comb(degree, i) for i in range(degree + 1)], dtype = np.float64)
+        i = np.arange(degree + 1)
+        basis = coefficients * (t[:, None] ** i) * ((1 - t[:, None]) ** (degree - i))
+        return basis @ control_points
+
+    @staticmethod
+    def _build_pool():
+        """Build the pool of normalized curve shapes.
+
+        Returns:
+            None
+        """
+        t = np.linspace(0.0, 1.0, MouseCurves._sample_count)
+        shapes = []
+        for _ in range(MouseCurves._pool_size):
+            knots = np.column_stack((
+                np.sort(np.random.uniform(0.0, 1.0, MouseCurves._knot_count)),
+                np.random.uniform(-MouseCurves._offset_boundary, MouseCurves._offset_boundary, MouseCurves._knot_count)
+            ))
+            control_points = np.vstack(([0.0, 0.0], knots, [1.0, 0.0]))
+            shapes.append(MouseCurves._bezier(control_points, t))
+
+        MouseCurves._pool = np.stack(shapes)
+        return None
+
+    @staticmethod
+    def _ease_out_quad(t: np.ndarray) -> np.ndarray:
+        """Slow down towards the end of the path like a hand settling on a target.
+
+        Args:
+            t (np.ndarray): The progress between 0 and 1.
+
+        Returns:
+            (np.ndarray): The eased progress between 0 and 1.
+        """
+        return t * (2 - t)
+
+    @staticmethod
+    def generate(start: Tuple[int, int], end: Tuple[int, int], point_count: int) -> np.ndarray:
+        """Generate the path of the cursor from the start to the end.
+
+        Args:
+            start (Tuple[int, int]): The current position of the cursor.
+            end (Tuple[int, int]): The position to move the cursor to.
+            point_count (int): Number of points along the path.
+
+        Returns:
+            (np.ndarray): The integer points of shape (point_count, 2) with the last point always being the end.
+        """
+        if MouseCurves._pool is None:
+            MouseCurves._build_pool()
+
+        point_count = max(2, point_count)
+        shape = MouseCurves._pool[np.random.randint(MouseCurves._pool_size)]
+
+        # Sample the shape at eased intervals so the cursor starts fast and slows down near the target.
+        progress = MouseCurves._ease_out_quad(np.linspace(0.0, 1.0, point_count)) * (MouseCurves._sample_count - 1)
+        samples = np.arange(MouseCurves._sample_count)
+        along = np.interp(progress, samples, shape[:, 0])
+        sideways = np.interp(progress, samples, shape[:, 1]) * np.random.choice((-1.0, 1.0))
+
+        # Map (along, sideways) onto the line from the start to the end and its perpendicular.
+        start_point = np.asarray(start, dtype = np.float64)
+        direction = np.asarray(end, dtype = np.float64) - start_point
+        normal = np.array([-direction[1], direction[0]])
+        points = start_point + along[:, None] * direction + sideways[:, None] * normal
+
+        points = np.rint(points).astype(int)
+        points[-1] = end
+        return points
@@ -1,12 +1,13 @@
 import random
-from typing import Optional
+from typing import List, Optional, Tuple
 
-import pyautogui
-import pyclick
 import pyperclip
 
 from utils.settings import Settings
 from utils.message_log import MessageLog
+from utils.input_driver import InputDriver, InputSequence
+from utils.mouse_curves import MouseCurves
+from utils.settle_detector import SettleDetector
 
 from time import sleep
 import numpy as np
@@ -18,57 +19,79 @@ class MouseUtils:
     Provides the utility functions needed to perform mouse-related actions.
     """
 
-    _hc = pyclick.HumanClicker()
-    # The lower the more smooth, the higher the more accurate to the speed
-    bezier_mouse_smoothness = max(0.01, Settings.mouse_smoothness / 100)
-    # 1000 to 3000 is tested
-    bezier_mouse_speed = max(1000.0, 1000.0 * Settings.custom_mouse_speed)
+    # Moves shorter than this many seconds jump straight to the point and the others are sent as a point every this many seconds when Bezier curves are disabled.
+    _minimum_duration: float = 0.1
+    _minimum_interval: float = 0.05
 
-    if Settings.enable_bezier_curve_mouse_movement is False:
-        pyautogui.MINIMUM_DURATION = 0.1
-        pyautogui.MINIMUM_SLEEP = 0.05
-        pyautogui.PAUSE = 0.25
+    # Seconds to pause after a scroll so that the page stops moving before the next match, or the most seconds to wait for it to settle with settle detection.
+    _scroll_pause: float = 0.25
+    _scroll_max_wait: float = 1.0
 
     @staticmethod
-    def move_to(x: int, y: int, custom_mouse_speed: float = 0.0):
-        """Move the cursor to the coordinates on the screen.
+    def _plan_move(start: Tuple[int, int], x: int, y: int, custom_mouse_speed: float = 0.0) -> Tuple[np.ndarray, float]:
+        """Plan the path of the cursor from the start to the coordinates on the screen.
 
         Args:
+            start (Tuple[int, int]): The position of the cursor before moving.
             x (int): X coordinate on the screen.
             y (int): Y coordinate on the screen.
             custom_mouse_speed (float, optional): Time in seconds it takes for the mouse to move to the specified point. Defaults to 0.0.
 
         Returns:
-            None
+            (Tuple[np.ndarray, float]): The points of the path and the time in seconds that the movement should take.
         """
         if Settings.enable_bezier_curve_mouse_movement:
             target_pos = (x, y)
-            current_pos = pyautogui.position()
+            current_pos = start
 
             # Estimate the mouse movement distance by calculating the Euclidean distance of the 2 points.
             vectors = [(a - b) ** 2 for a, b in zip(current_pos, target_pos)]
             dist = math.sqrt(sum(vectors))
 
-            # Further randomize the mouse speed.
-            new_mouse_speed = MouseUtils.bezier_mouse_speed - float(np.random.randint(0, 300))
+            # Further randomize the mouse speed. 1000 to 3000 is tested.
+            new_mouse_speed = max(1000.0, 1000.0 * Settings.custom_mouse_speed) - float(np.random.randint(0, 300))
+
+            # The lower the more smooth, the higher the more accurate to the speed. This is also the interval in seconds between the points along the curve.
+            bezier_mouse_smoothness = max(0.01, Settings.mouse_smoothness / 100)
 
             # Calculate the duration of the mouse movement and the amount of points along the path that the mouse will take.
             dur = 0.1 + dist / new_mouse_speed
-            target_point_cnt = int(dur / MouseUtils.bezier_mouse_smoothness)
+            target_point_cnt = int(dur / bezier_mouse_smoothness)
 
             if Settings.debug_mode:
                 MessageLog.print_message(f"[DEBUG] Duration: {dur}, Number of points: {target_point_cnt})")
 
             # Generate the curve that the mouse will follow by hitting each point along its path.
-            curve = pyclick.HumanCurve(current_pos, target_pos, targetPoints = target_point_cnt)
+            return MouseCurves.generate(current_pos, target_pos, target_point_cnt), dur
 
-            MouseUtils._hc.move((x, y), duration = dur, humanCurve = curve)
-        else:
-            if custom_mouse_speed <= 0.0:
-                custom_mouse_speed = Settings.custom_mouse_speed
+        if custom_mouse_speed <= 0.0:
+            custom_mouse_speed = Settings.custom_mouse_speed
 
-            pyautogui.moveTo(x, y, duration = custom_mouse_speed, tween = pyautogui.easeInOutQuad)
+        if custom_mouse_speed < MouseUtils._minimum_duration:
+            return np.array([(x, y)]), 0.0
 
+        # Ease in and out along the straight line to the point.
+        point_count = max(2, int(custom_mouse_speed / MouseUtils._minimum_interval))
+        t = np.linspace(0.0, 1.0, point_count)
+        progress = np.where(t < 0.5, 2 * t ** 2, -2 * t ** 2 + 4 * t - 1)
+        points = np.rint(np.asarray(start) + progress[:, None] * (np.asarray((x, y)) - np.asarray(start))).astype(int)
+        points[-1] = (x, y)
+        return points, custom_mouse_speed
+
+    @staticmethod
+    def move_to(x: int, y: int, custom_mouse_speed: float = 0.0):
+        """Move the cursor to the coordinates on the screen.
+
+        Args:
+            x (int): X coordinate on the screen.
+            y (int): Y coordinate on the screen.
+            custom_mouse_speed (float, optional): Time in seconds it takes for the mouse to move to the specified point. Defaults to 0.0.
+
+        Returns:
+            None
+        """
+        points, duration = MouseUtils._plan_move(InputDriver.position(), x, y, custom_mouse_speed)
+        InputDriver.play(InputSequence().move_along(points, duration))
         return None
 
     @staticmethod
@@ -81,11 +104,7 @@ class MouseUtils:
         Returns:
             None
         """
-        if not hold_time:
-            hold_time = np.random.uniform(0.02, 0.12)
-        pyautogui.mouseDown()
-        sleep(hold_time)
-        pyautogui.mouseUp()
+        InputDriver.click(hold_time)
 
     @staticmethod
     def move_and_click_point(x: int, y: int, image_name: str, custom_mouse_speed: float = 0.0, mouse_clicks: int = 1, custom_wait: Optional[float] = None):
@@ -110,18 +129,57 @@ class MouseUtils:
             MessageLog.print_message(f"[DEBUG] New coordinates: ({new_x}, {new_y})")
 
         MouseUtils.move_to(new_x,new_y, custom_mouse_speed=custom_mouse_speed)
-        
+
+        # The frame to compare against is grabbed after moving so that hover effects do not count as the reaction to the click.
+        baseline = SettleDetector.capture_baseline() if custom_wait is None else None
+
+        sequence = InputSequence()
         for i in range (mouse_clicks):
-            sleep(np.random.uniform(0.08,0.16))
-            MouseUtils.click()
+            sequence.pause(np.random.uniform(0.08,0.16)).click()
+        InputDriver.play(sequence)
 
         # This delay is necessary as ImageUtils will take the screenshot too fast and the bot will use the last frame before clicking to navigate.
         if custom_wait is not None:
             sleep(custom_wait)
             return
 
+        # Wait until the game reacted to the click and settled down with the old fixed delay as the upper bound.
         from bot.game import Game
-        Game.wait(1)
+        SettleDetector.wait(image_name, baseline, Game.reduce_delay(1))
+
+    @staticmethod
+    def move_and_click_chain(targets: List[Tuple[int, int, str]]):
+        """Click each of the points one after another as one timed input sequence, like selecting a Skill and then its target.
+
+        The paths between the points are all planned before the first move and the game is given the time to react after each click the same way as move_and_click_point().
+
+        Args:
+            targets (List[Tuple[int, int, str]]): The points to click as (x, y, image_name).
+
+        Returns:
+            None
+        """
+        from bot.game import Game
+
+        sequence = InputSequence()
+        position = InputDriver.position()
+        for x, y, image_name in targets:
+            new_x, new_y = MouseUtils._randomize_point(x, y, image_name)
+            if Settings.debug_mode:
+                MessageLog.print_message(f"[DEBUG] Queueing click on {image_name.upper()} at ({new_x}, {new_y})")
+
+            points, duration = MouseUtils._plan_move(position, new_x, new_y)
+            position = (new_x, new_y)
+
+            # Each click keeps its own baseline frame for the settle detection after it.
+            baseline = []
+            sequence.move_along(points, duration)
+            sequence.call(lambda baseline = baseline: baseline.append(SettleDetector.capture_baseline()))
+            sequence.pause(np.random.uniform(0.08, 0.16)).click()
+            sequence.call(lambda baseline = baseline, image_name = image_name: SettleDetector.wait(image_name, baseline[0], Game.reduce_delay(1)))
+
+        InputDriver.play(sequence)
+        return None
 
     @staticmethod
     def _randomize_point(x: int, y: int, image_name: str):
@@ -165,6 +223,28 @@ class MouseUtils:
 
         return new_x, new_y
 
+    @staticmethod
+    def _scroll(x: int, y: int, scroll_clicks: int):
+        """Scroll the screen from the coordinates and wait until the page stopped moving.
+
+        Args:
+            x (int): X coordinate on the screen.
+            y (int): Y coordinate on the screen.
+            scroll_clicks (int): How much to scroll the screen. Positive for scrolling up and negative for scrolling down.
+
+        Returns:
+            None
+        """
+        MouseUtils.move_to(x, y)
+
+        baseline = SettleDetector.capture_baseline()
+        InputDriver.scroll(scroll_clicks, x, y)
+
+        # Without settle detection this is the fixed pause that pyautogui used to make after every scroll.
+        SettleDetector.wait("scroll", baseline, MouseUtils._scroll_max_wait if baseline is not None else MouseUtils._scroll_pause)
+
+        return None
+
     @staticmethod
     def scroll_screen(x: int, y: int, scroll_clicks: int):
         """Attempt to scroll the screen to reveal more UI elements from the provided x and y coordinates.
@@ -180,13 +260,7 @@ class MouseUtils:
         if Settings.debug_mode:
             MessageLog.print_message(f"[DEBUG] Now scrolling the screen from ({x}, {y}) by {scroll_clicks} clicks...")
 
-        MouseUtils.move_to(x, y)
-
-        if Settings.enable_bezier_curve_mouse_movement:
-            # Reset the pause delay back to 0.25, primarily for ImageUtils' methods using pyautogui.
-            pyautogui.PAUSE = 0.25
-
-        pyautogui.scroll(scroll_clicks, x = x, y = y)
+        MouseUtils._scroll(x, y, scroll_clicks)
 
         return None
 
@@ -206,13 +280,7 @@ class MouseUtils:
         if Settings.debug_mode:
             MessageLog.print_message(f"[DEBUG] Now scrolling the screen from the \"Home\" button's coordinates at ({x}, {y}) by {scroll_clicks} clicks...")
 
-        MouseUtils.move_to(x, y)
-
-        if Settings.enable_bezier_curve_mouse_movement:
-            # Reset the pause delay back to 0.25, primarily for ImageUtils' methods using pyautogui.
-            pyautogui.PAUSE = 0.25
-
-        pyautogui.scroll(scroll_clicks, x = x, y = y)
+        MouseUtils._scroll(x, y, scroll_clicks)
 
         return None
 
@@ -223,10 +291,8 @@ class MouseUtils:
         Returns:
             None
         """
-        pyautogui.keyDown("ctrl")
-        pyautogui.press("a")
-        pyautogui.keyUp("ctrl")
-        pyautogui.press("del")
+        InputDriver.hotkey("ctrl", "a")
+        InputDriver.press("del")
         return None
 
     @staticmethod
@@ -250,5 +316,5 @@ class MouseUtils:
             None
         """
         message = pyperclip.paste()
-        pyautogui.write(message)
+        InputDriver.write(message)
         return None
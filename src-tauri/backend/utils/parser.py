@@ -1,161 +1,215 @@
-from typing import List, Tuple, Dict, Optional
+import re
+from typing import Iterable, List, Optional, Tuple
 from utils.settings import Settings
 from utils.message_log import MessageLog as Log
 from utils.debugger import Debugger as Debug
+from utils.combat_script import CombatScriptError
+
+
+# An action as the name of the CombatModeV2 function and its positional arguments like ("useskill", (0,)).
+Action = Tuple[str, tuple]
 
 
 class Parser:
     """
     Provides the utility functions for parsing user written combat script for \
     GenericV2
+
+    The script is read in a single pass line by line so it can be streamed straight from a file. Each battle is a URL line, a "supportSummon:" line and a
+    "repeat:" line followed by its actions. Malformed lines raise a CombatScriptError that points at the line and column.
     """
 
+    # Matches one call like "useskill(1)" or "attack" followed by a dot or the end of the line.
+    _call_pattern = re.compile(r"\s*([a-z0-9]+)\s*(?:\(\s*([^)]*?)\s*\))?\s*(?:\.|$)")
+
+    # Actions that take no arguments.
+    _simple_actions = frozenset(["attack", "enablefullauto", "enablesemiauto", "quicksummon", "back", "subback", "reload", "requestbackup", "tweetbackup"])
+
     @staticmethod
-    def pre_parse(text: List[str]) -> List[str]:
-        """ Remove all comment and empty line and lowercased result
+    def _tokenize(line: str, offset: int, line_number: int) -> List[Tuple[str, Optional[str], int, int]]:
+        """Split the line into its dotted calls.
+
+        Args:
+            line (str): The lowercased line without its surrounding whitespace.
+            offset (int): Number of characters that were stripped from the start of the line.
+            line_number (int): The line number for errors.
+
+        Returns:
+            (List[Tuple[str, Optional[str], int, int]]): The name, the argument and the 1-based columns of the name and of the argument of each call.
         """
-        result = []
-        for line in [line.strip().lower() for line in text]:
-            if line == "" or line.startswith("#") or line.startswith("/"):
-                continue
-            else:
-                result.append(line)
-        return result
+        calls = []
+        position = 0
+        while position < len(line):
+            match = Parser._call_pattern.match(line, position)
+            if match is None or match.end() == position:
+                raise CombatScriptError(f"Unable to read the action at \"{line[position:]}\"", line_number, line, offset + position + 1)
+
+            name_column = offset + match.start(1) + 1
+            argument_column = offset + match.start(2) + 1 if match.group(2) is not None else name_column
+            calls.append((match.group(1), match.group(2), name_column, argument_column))
+            position = match.end()
+        return calls
 
     @staticmethod
-    def _parse_summon(line: str) -> str:
+    def _to_index(argument: Optional[str], maximum: int, name: str, line_number: int, line: str, column: int) -> int:
+        """Parse the argument of the call as a number between 1 and the maximum.
+
+        Returns:
+            (int): The 0-based index.
+        """
+        if argument is None or not argument.isdigit() or not 1 <= int(argument) <= maximum:
+            raise CombatScriptError(f"{name} needs a number from 1 to {maximum}", line_number, line, column)
+        return int(argument) - 1
+
+    @staticmethod
+    def _parse_summon(line: str, line_number: int, offset: int) -> str:
         if not line.startswith("supportsummon:"):
-            raise RuntimeError(
-                f"[Pareser] Invalid summon: {line}")
-        return line.split(':')[1]
+            raise CombatScriptError("Expected the support summon like \"supportSummon:name\"", line_number, line, offset + 1)
+        summon = line[len("supportsummon:"):].strip()
+        if summon == "":
+            raise CombatScriptError("Missing the name of the support summon", line_number, line, offset + len(line) + 1)
+        return summon
 
     @staticmethod
-    def _parse_url(line: str) -> str:
+    def _parse_url(line: str, line_number: int, offset: int) -> str:
         if not line.startswith("http"):
-            raise RuntimeError(
-                f"[Pareser] Invalid Url: {line}")
+            raise CombatScriptError("Expected the URL of the battle", line_number, line, offset + 1)
         return line
 
     @staticmethod
-    def _parse_repeat(line: str) -> int:
+    def _parse_repeat(line: str, line_number: int, offset: int) -> int:
         if not line.startswith("repeat:"):
-            raise RuntimeError(
-                f"[Pareser] Invalid Url: {line}")
-        Settings.item_amount_to_farm
-        value = line.split(':')[1]
+            raise CombatScriptError("Expected the number of repeats like \"repeat:1\"", line_number, line, offset + 1)
+        value = line[len("repeat:"):].strip()
         if value == "default":
             return Settings.item_amount_to_farm
+        if not value.isdigit():
+            raise CombatScriptError("repeat needs a number or \"default\"", line_number, line, offset + line.index(":") + 2)
         return int(value)
 
     @staticmethod
-    def _parse_character(line: str, is_char_selected: bool) -> List[Tuple[str, Dict[str, int]]]:
-        """ Parse a line of character action
+    def _parse_action(line: str, offset: int, line_number: int, is_char_selected: bool, actions: List[Action]) -> bool:
+        """Parse a line of actions and append them to the actions of the battle.
+
+        Args:
+            line (str): The lowercased line without its surrounding whitespace.
+            offset (int): Number of characters that were stripped from the start of the line.
+            line_number (int): The line number for errors.
+            is_char_selected (bool): Whether a Character is selected before this line.
+            actions (List[Action]): The actions of the battle so far.
 
         Returns:
-            Same type as _parse_combact
+            (bool): Whether a Character is selected after this line.
         """
-        ret = []
-        is_skill_selected = False
-        chains = line.split('.')
-        char_idx = int(chains.pop(0)[-1])
-        if char_idx not in (1, 2, 3, 4):
-            raise ValueError(
-                f"[Parser] Invalid chracter number: {char_idx}")
-        if is_char_selected:
-            ret += [("changechar", {"idx": char_idx-1})]
+        calls = Parser._tokenize(line, offset, line_number)
+        name, argument, column, argument_column = calls[0]
+
+        if name.startswith("character") and argument is None:
+            char_idx = Parser._to_index(name[len("character"):] or None, 4, "character", line_number, line, column)
+            actions.append(("changechar" if is_char_selected else "selectchar", (char_idx,)))
+
+            is_skill_selected = False
+            for call_name, call_argument, call_column, call_argument_column in calls[1:]:
+                if call_name == "useskill":
+                    actions.append(("useskill", (Parser._to_index(call_argument, 4, "useSkill", line_number, line, call_argument_column),)))
+                    is_skill_selected = True
+                elif call_name == "target":
+                    if not is_skill_selected:
+                        raise CombatScriptError("Select a skill before picking a target", line_number, line, call_column)
+                    actions.append(("target", (Parser._to_index(call_argument, 6, "target", line_number, line, call_argument_column),)))
+                    is_skill_selected = False
+                else:
+                    raise CombatScriptError(f"Unexpected \"{call_name}\"", line_number, line, call_column)
+            return True
+
+        if len(calls) > 1:
+            raise CombatScriptError(f"Unexpected \"{calls[1][0]}\"", line_number, line, calls[1][2])
+
+        if name == "wait":
+            try:
+                seconds = float(argument)
+            except (TypeError, ValueError):
+                raise CombatScriptError("wait needs the number of seconds", line_number, line, argument_column) from None
+            actions.append(("wait", (seconds,)))
+        elif name == "summon":
+            if is_char_selected:
+                actions.append(("deselectchar", ()))
+                is_char_selected = False
+            actions.append(("usesummon", (Parser._to_index(argument, 6, "summon", line_number, line, argument_column),)))
+        elif name in Parser._simple_actions and not argument:
+            if name == "attack":
+                is_char_selected = False
+            elif name == "enablefullauto" and is_char_selected:
+                actions.append(("deselectchar", ()))
+                is_char_selected = False
+            actions.append((name, ()))
         else:
-            ret += [("selectchar", {"idx": char_idx-1})]
-
-        for cmd in chains:
-            if cmd.startswith('useskill'):
-                skill_idx = int(cmd[-2])
-                if skill_idx not in (1, 2, 3, 4):
-                    raise ValueError(
-                        f"[Parser] Invalid skill number: {skill_idx}")
-                ret += [("useskill", {"idx": skill_idx-1})]
-                is_skill_selected = True
-            elif cmd.startswith('target'):
-                target_idx = int(cmd[-2])
-                if target_idx not in (1, 2, 3, 4, 5, 6):
-                    raise ValueError(
-                        f"[Parser] Invalid skill target number: {target_idx}")
-                if not is_skill_selected:
-                    raise RuntimeError(
-                        f"[Parser] Select a skill before picking a target")
-                ret += [('target', {"idx": target_idx-1})]
-                is_skill_selected = False
-        return ret
+            raise CombatScriptError(f"Unknown action \"{name}\"", line_number, line, column)
+
+        return is_char_selected
 
     @staticmethod
-    def parse_battles(text: List[str]) -> List[Tuple[Tuple[str, str, int], ...]]:
+    def parse_battles(text: Iterable[str]) -> List[Tuple[Tuple[str, str, int], Tuple[Action, ...]]]:
         """ Parse list of battles into list
 
+        Args:
+            text (Iterable[str]): The lines of the script like a list or an open file.
+
         Returns:
-            list of battle informations (url, summon, repeats) and combact action
+            list of battle informations (url, summon, repeats) and the action table of each battle
         """
-        text = Parser.pre_parse(text)
-
-        url: str = Parser._parse_url(text.pop(0))
-        summon: str = Parser._parse_summon(text.pop(0))
-        repeat: int = Parser._parse_repeat(text.pop(0))
-        combact = []
         ret = []
+        config: List = []
+        actions: List[Action] = []
+        is_char_selected = False
+        line_number = 0
+        line = ""
+
+        def finish_battle():
+            # A battle without any actions simply enables Full Auto.
+            ret.append((tuple(config), tuple(actions) if len(actions) > 0 else (("enablefullauto", ()),)))
+
+        for line_number, raw_line in enumerate(text, start = 1):
+            stripped = raw_line.lstrip()
+            offset = len(raw_line) - len(stripped)
+            line = stripped.rstrip().lower()
+            if line == "" or line.startswith("#") or line.startswith("/"):
+                continue
 
-        while len(text) > 0:
-            line = text.pop(0)
-            if not line.startswith("http"):
-                combact.append(line)
+            if len(config) == 0:
+                config.append(Parser._parse_url(line, line_number, offset))
+            elif len(config) == 1:
+                config.append(Parser._parse_summon(line, line_number, offset))
+            elif len(config) == 2:
+                config.append(Parser._parse_repeat(line, line_number, offset))
+            elif line.startswith("http"):
+                finish_battle()
+                config = [line]
+                actions = []
+                is_char_selected = False
             else:
-                ret.append(
-                    ((url, summon, repeat), Parser._parse_combact(combact)))
-                url = line
-                summon = Parser._parse_summon(text.pop(0))
-                repeat: int = Parser._parse_repeat(text.pop(0))
-                combact = []
-        # end
-        ret.append(
-            ((url, summon, repeat), Parser._parse_combact(combact)))
+                is_char_selected = Parser._parse_action(line, offset, line_number, is_char_selected, actions)
+
+        if len(config) == 0:
+            raise CombatScriptError("The script is empty", max(1, line_number), line)
+        if len(config) < 3:
+            raise CombatScriptError(f"The script ended before the {'support summon' if len(config) == 1 else 'number of repeats'} of the last battle", line_number, line,
+                                    len(line) + 1)
+        finish_battle()
 
         if Settings.debug_mode:
             Debug.parser(ret)
         return ret
 
     @staticmethod
-    def _parse_combact(text: List[str]) -> List[Tuple[str, Dict[str, int]]]:
-        """Parse the combact action
+    def parse_file(file_path: str) -> List[Tuple[Tuple[str, str, int], Tuple[Action, ...]]]:
+        """Parse the battles of the script file while reading it.
+
+        Args:
+            file_path (str): Path to the script file.
 
         Returns:
-            list of function names and function param in combact mode
+            list of battle informations (url, summon, repeats) and the action table of each battle
         """
-        is_char_selected: bool = False
-        ret = []
-        for line in text:
-            if line.startswith('character'):
-                ret += Parser._parse_character(line, is_char_selected)
-                is_char_selected = True
-            elif line.startswith("wait"):
-                ret += [("wait", {"time": int(line[5:-1])})]
-            elif line.startswith("summon"):
-                idx = int(line[-2])
-                if idx not in (1,2,3,4,5,6):
-                    raise ValueError
-                if is_char_selected:
-                    ret += [("deselectchar", {})]
-                    is_char_selected = False
-                ret += [('usesummon', {'idx': idx-1})]
-            elif line == "attack":
-                is_char_selected = False
-                ret += [(line, {})]
-            elif line == "enablefullauto":
-                if is_char_selected:
-                    ret += [("deselectchar", {})]
-                    is_char_selected = False
-                ret += [(line, {})]
-
-            else:
-                ret.append((line, {}))
-
-        # finish
-        if len(ret) == 0:
-            ret += [("enablefullauto", {})]
-        return ret
+        with open(file_path, "r", encoding = "utf-8") as file:
+            return Parser.parse_battles(file)
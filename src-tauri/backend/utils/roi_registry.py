@@ -0,0 +1,134 @@
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+
+
+class RoiRegistry:
+    """
+    Keeps track of the region of interest of each template inside the calibrated window so that template matching can scan a small crop instead of the whole frame.
+
+    Regions are learned from past match locations and are stored in the images/roi.json sidecar keyed by the dimensions of the frame, as a region is only valid for the same window size.
+    Entries in the sidecar can also be written by hand as [left, top, right, bottom] to give hints for templates that were never matched before.
+    """
+
+    _sidecar_path: str = f"{os.getcwd()}/images/roi.json"
+
+    # Number of pixels that the region is padded by on each side to allow for small shifts of the UI.
+    _margin: int = 20
+
+    # Maps the frame dimensions to the regions of each template as [left, top, right, bottom] inside the frame.
+    _regions: Dict[str, Dict[str, List[int]]] = None
+    _is_dirty: bool = False
+
+    @staticmethod
+    def _load():
+        """Load the regions from the sidecar file if it exists.
+
+        Returns:
+            None
+        """
+        RoiRegistry._regions = {}
+        if os.path.exists(RoiRegistry._sidecar_path):
+            try:
+                with open(RoiRegistry._sidecar_path) as file:
+                    RoiRegistry._regions = json.load(file)
+            except (OSError, ValueError):
+                MessageLog.print_message(f"[WARNING] Failed to read the regions of interest from {RoiRegistry._sidecar_path}. Starting with no regions.")
+
+        return None
+
+    @staticmethod
+    def _make_keys(image_path: str, frame_shape: Tuple[int, ...]) -> Tuple[str, str]:
+        """Create the keys for the frame dimensions and the template.
+
+        Args:
+            image_path (str): The file path of the template image.
+            frame_shape (Tuple[int, ...]): The shape of the source frame.
+
+        Returns:
+            (Tuple[str, str]): The frame key like "500x1080" and the template key like "buttons/attack".
+        """
+        folder_name = os.path.basename(os.path.dirname(image_path))
+        template_name = os.path.splitext(os.path.basename(image_path))[0]
+        return f"{frame_shape[1]}x{frame_shape[0]}", f"{folder_name}/{template_name}"
+
+    @staticmethod
+    def get(image_path: str, frame_shape: Tuple[int, ...]) -> Optional[Tuple[int, int, int, int]]:
+        """Get the padded region of interest of the template for the frame.
+
+        Args:
+            image_path (str): The file path of the template image.
+            frame_shape (Tuple[int, ...]): The shape of the source frame.
+
+        Returns:
+            (Tuple[int, int, int, int]): The region as (left, top, right, bottom) clamped to the frame or None if there is no region yet.
+        """
+        if RoiRegistry._regions is None:
+            RoiRegistry._load()
+
+        frame_key, template_key = RoiRegistry._make_keys(image_path, frame_shape)
+        region = RoiRegistry._regions.get(frame_key, {}).get(template_key)
+        if region is None:
+            return None
+
+        left = max(0, region[0] - RoiRegistry._margin)
+        top = max(0, region[1] - RoiRegistry._margin)
+        right = min(frame_shape[1], region[2] + RoiRegistry._margin)
+        bottom = min(frame_shape[0], region[3] + RoiRegistry._margin)
+        return left, top, right, bottom
+
+    @staticmethod
+    def record(image_path: str, frame_shape: Tuple[int, ...], location: Tuple[int, int], width: int, height: int):
+        """Grow the region of interest of the template to include the new match.
+
+        Args:
+            image_path (str): The file path of the template image.
+            frame_shape (Tuple[int, ...]): The shape of the source frame.
+            location (Tuple[int, int]): The top-left corner of the match inside the frame.
+            width (int): Width of the matched template.
+            height (int): Height of the matched template.
+
+        Returns:
+            None
+        """
+        if RoiRegistry._regions is None:
+            RoiRegistry._load()
+
+        frame_key, template_key = RoiRegistry._make_keys(image_path, frame_shape)
+        frame_regions = RoiRegistry._regions.setdefault(frame_key, {})
+        new_region = [int(location[0]), int(location[1]), int(location[0] + width), int(location[1] + height)]
+
+        region = frame_regions.get(template_key)
+        if region is None:
+            frame_regions[template_key] = new_region
+            RoiRegistry._is_dirty = True
+        elif new_region[0] < region[0] or new_region[1] < region[1] or new_region[2] > region[2] or new_region[3] > region[3]:
+            frame_regions[template_key] = [min(region[0], new_region[0]), min(region[1], new_region[1]), max(region[2], new_region[2]), max(region[3], new_region[3])]
+            RoiRegistry._is_dirty = True
+
+        return None
+
+    @staticmethod
+    def save():
+        """Save the learned regions into the sidecar file so that the next session can use them right away.
+
+        Returns:
+            None
+        """
+        if not RoiRegistry._is_dirty:
+            return None
+
+        try:
+            with open(RoiRegistry._sidecar_path, "w") as file:
+                json.dump(RoiRegistry._regions, file, indent = 4, sort_keys = True)
+            RoiRegistry._is_dirty = False
+
+            if Settings.debug_mode:
+                MessageLog.print_message(f"[DEBUG] Saved the regions of interest to {RoiRegistry._sidecar_path}.")
+        except OSError:
+            MessageLog.print_message(f"[WARNING] Failed to save the regions of interest to {RoiRegistry._sidecar_path}.")
+
+        return None
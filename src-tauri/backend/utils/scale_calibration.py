@@ -0,0 +1,187 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy
+import pyautogui
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+from utils.image_utils import ImageUtils
+
+
+class ScaleCalibration:
+    """
+    Finds the scale that each template family needs to match the game on this device and keeps it in a profile so that image matching does not need to try a range of scales.
+
+    Profiles are stored in scale_profiles.json next to settings.json and are keyed by the screen resolution and the browser zoom as both of them change the size of the game.
+    """
+
+    _profile_path: str = f"{os.getcwd()}/backend/scale_profiles.json" if os.path.isdir(f"{os.getcwd()}/backend") else f"{os.getcwd()}/scale_profiles.json"
+
+    # The template families are the folders inside /images/. Families without a representative template that is visible on the Home screen use the scale of the buttons.
+    _families: List[str] = ["buttons", "headers", "items", "summons"]
+    _representatives: Dict[str, List[str]] = {
+        "buttons": ["home", "quests", "menu"],
+        "headers": ["home_header"]
+    }
+
+    # The coarse sweep covers the range that the old Test Mode swept through and the fine sweep narrows it down around the best coarse scale.
+    _coarse_scales: List[float] = [round(float(scale), 2) for scale in numpy.arange(0.30, 1.51, 0.02)]
+    _fine_step: float = 0.005
+
+    @staticmethod
+    def _profile_key() -> str:
+        """Create the key of the profile for the current screen resolution and browser zoom.
+
+        Returns:
+            (str): The profile key like "1920x1080@100%".
+        """
+        screen_width, screen_height = pyautogui.size()
+        return f"{screen_width}x{screen_height}@{Settings.browser_zoom}%"
+
+    @staticmethod
+    def _read_profiles() -> Dict[str, Dict[str, float]]:
+        """Read every saved profile.
+
+        Returns:
+            (Dict[str, Dict[str, float]]): The profiles keyed by the screen resolution and browser zoom.
+        """
+        if not os.path.exists(ScaleCalibration._profile_path):
+            return {}
+
+        try:
+            with open(ScaleCalibration._profile_path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            MessageLog.print_message(f"[WARNING] Failed to read the scale profiles from {ScaleCalibration._profile_path}.")
+            return {}
+
+    @staticmethod
+    def _apply(profile: Dict[str, float]):
+        """Make image matching use the scales of the profile.
+
+        Args:
+            profile (Dict[str, float]): The scale of each template family.
+
+        Returns:
+            None
+        """
+        ImageUtils._family_scales = dict(profile)
+        ImageUtils._custom_scale = profile["buttons"]
+        ImageUtils._template_scales.clear()
+        return None
+
+    @staticmethod
+    def _score_scale(frames: List[numpy.ndarray], image_paths: List[str], scale: float) -> float:
+        """Score how well the templates match the frames at the given scale.
+
+        Args:
+            frames (List[numpy.ndarray]): The grayscale frames to match against.
+            image_paths (List[str]): The file paths of the template images.
+            scale (float): The scale to test.
+
+        Returns:
+            (float): The average of the best score of each template in each frame.
+        """
+        scores = []
+        for image_path in image_paths:
+            template_array = ImageUtils._load_template(image_path, scale)
+            for frame in frames:
+                if template_array.shape[0] > frame.shape[0] or template_array.shape[1] > frame.shape[1]:
+                    scores.append(-1.0)
+                else:
+                    scores.append(ImageUtils._best_match(frame, template_array)[0])
+
+        return sum(scores) / len(scores)
+
+    @staticmethod
+    def _sweep(frames: List[numpy.ndarray], image_paths: List[str]) -> Tuple[float, float]:
+        """Find the scale where the templates match the frames best by sweeping coarsely over the whole range using the first frame and then finely around the best coarse scale using every frame.
+
+        Args:
+            frames (List[numpy.ndarray]): The grayscale frames to match against.
+            image_paths (List[str]): The file paths of the template images.
+
+        Returns:
+            (Tuple[float, float]): The best scale and its score.
+        """
+        best_scale = max(ScaleCalibration._coarse_scales, key = lambda scale: ScaleCalibration._score_scale(frames[:1], image_paths, scale))
+        best_score = ScaleCalibration._score_scale(frames, image_paths, best_scale)
+
+        coarse_step = ScaleCalibration._coarse_scales[1] - ScaleCalibration._coarse_scales[0]
+        fine_scales = numpy.arange(best_scale - coarse_step, best_scale + coarse_step + ScaleCalibration._fine_step, ScaleCalibration._fine_step)
+        for scale in fine_scales:
+            scale = round(float(scale), 3)
+            score = ScaleCalibration._score_scale(frames, image_paths, scale)
+            if score > best_score:
+                best_scale, best_score = scale, score
+
+        return best_scale, best_score
+
+    @staticmethod
+    def load() -> bool:
+        """Load the profile for the current screen resolution and browser zoom if it was calibrated before.
+
+        Returns:
+            (bool): True if a profile was loaded.
+        """
+        profile_key = ScaleCalibration._profile_key()
+        profile = ScaleCalibration._read_profiles().get(profile_key)
+        if profile is None or "buttons" not in profile:
+            MessageLog.print_message(f"[INFO] No scale profile found for {profile_key}. Using the custom scale of {ImageUtils._custom_scale:.2f} instead.")
+            return False
+
+        ScaleCalibration._apply(profile)
+        MessageLog.print_message(f"[INFO] Loaded the scale profile for {profile_key}: {profile}")
+        return True
+
+    @staticmethod
+    def calibrate(frame_count: int = 3, frame_interval: float = 0.5) -> Optional[Dict[str, float]]:
+        """Find the scale of each template family using a few frames of the Home screen and save them as the profile for the current screen resolution and browser zoom.
+
+        Args:
+            frame_count (int, optional): Number of frames to capture. Defaults to 3.
+            frame_interval (float, optional): Seconds to wait between captured frames. Defaults to 0.5.
+
+        Returns:
+            (Dict[str, float]): The scale of each template family or None if the calibration failed.
+        """
+        profile_key = ScaleCalibration._profile_key()
+        MessageLog.print_message(f"\n[INFO] Now calibrating the scales for {profile_key} using {frame_count} frames of the Home screen...")
+        start_time = time.time()
+
+        frames = []
+        for _ in range(frame_count):
+            frames.append(ImageUtils._capture())
+            time.sleep(frame_interval)
+
+        profile: Dict[str, float] = {}
+        for family, names in ScaleCalibration._representatives.items():
+            image_paths = [f"{ImageUtils._current_dir}/images/{family}/{name}.jpg" for name in names]
+            scale, score = ScaleCalibration._sweep(frames, image_paths)
+            if score >= Settings.confidence:
+                MessageLog.print_message(f"[SUCCESS] Found the scale {scale:.3f} for {family} with a score of {score:.4f}.")
+                profile[family] = scale
+            else:
+                MessageLog.print_message(f"[WARNING] Failed to find a scale for {family}. The best was {scale:.3f} with a score of {score:.4f}.")
+
+        if "buttons" not in profile:
+            MessageLog.print_message(f"[WARNING] Calibration failed as the buttons could not be found. Make sure that the Home screen is fully visible.")
+            return None
+
+        for family in ScaleCalibration._families:
+            profile.setdefault(family, profile["buttons"])
+
+        profiles = ScaleCalibration._read_profiles()
+        profiles[profile_key] = profile
+        try:
+            with open(ScaleCalibration._profile_path, "w") as file:
+                json.dump(profiles, file, indent = 4, sort_keys = True)
+        except OSError:
+            MessageLog.print_message(f"[WARNING] Failed to save the scale profile to {ScaleCalibration._profile_path}.")
+
+        ScaleCalibration._apply(profile)
+        MessageLog.print_message(f"[INFO] Calibration finished in {time.time() - start_time:.2f} seconds and saved the scale profile for {profile_key}: {profile}")
+        return profile
@@ -0,0 +1,105 @@
+import hashlib
+import json
+from typing import Callable, Dict, List, Tuple
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+from utils.combat_script import CombatScript, Instruction
+from utils.parser import Parser
+
+
+class ScriptCache:
+    """
+    Keeps the compiled form of every combat script keyed by the hash of its content so that Combat Mode, Combat Mode V2, GenericV2 and the Scheduler compile each
+    script only once and every run after that reuses the same compiled plan.
+
+    The compiled plans are shared between callers so they must be treated as read-only.
+    """
+
+    # Compiled plans keyed by (kind, content hash).
+    _entries: Dict[Tuple[str, str], object] = {}
+    hits: int = 0
+    misses: int = 0
+
+    @staticmethod
+    def _hash(lines: List[str]) -> str:
+        """Hash the content of the script.
+
+        Args:
+            lines (List[str]): The lines of the script.
+
+        Returns:
+            (str): The hex digest of the lines.
+        """
+        digest = hashlib.sha256()
+        for line in lines:
+            digest.update(line.encode("utf-8"))
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    @staticmethod
+    def _get(kind: str, lines: List[str], compile_script: Callable[[List[str]], object]) -> object:
+        """Get the compiled plan of the script, compiling it if its content was not seen before.
+
+        Args:
+            kind (str): The kind of compiled plan as scripts can be compiled in more than one way.
+            lines (List[str]): The lines of the script.
+            compile_script (Callable[[List[str]], object]): Compiles the lines into the plan.
+
+        Returns:
+            (object): The compiled plan.
+        """
+        key = (kind, ScriptCache._hash(lines))
+        plan = ScriptCache._entries.get(key)
+        if plan is not None:
+            ScriptCache.hits += 1
+            return plan
+
+        ScriptCache.misses += 1
+        plan = compile_script(lines)
+        ScriptCache._entries[key] = plan
+        if Settings.debug_mode:
+            MessageLog.print_message(f"[DEBUG] Compiled {kind} script {key[1][:12]} with {len(lines)} lines.")
+        return plan
+
+    @staticmethod
+    def combat_script(lines: List[str]) -> Tuple[Instruction, ...]:
+        """Get the instructions of a combat script for Combat Mode.
+
+        Args:
+            lines (List[str]): The lines of the script.
+
+        Returns:
+            (Tuple[Instruction, ...]): The instructions in order.
+        """
+        return ScriptCache._get("combat", lines, CombatScript.compile)
+
+    @staticmethod
+    def battles(lines: List[str]) -> Tuple[Tuple[Tuple[str, str, int], Tuple[Tuple[str, tuple], ...]], ...]:
+        """Get the battles of a GenericV2 script.
+
+        Args:
+            lines (List[str]): The lines of the script.
+
+        Returns:
+            (Tuple[Tuple[Tuple[str, str, int], Tuple[Tuple[str, tuple], ...]], ...]): The (url, summon, repeat) and the action table of each battle.
+        """
+        return ScriptCache._get("battles", lines, lambda script: tuple(Parser.parse_battles(script)))
+
+    @staticmethod
+    def schedule(lines: List[str]) -> Tuple[Dict, ...]:
+        """Get the entries of a Scheduler script with the combat script of every entry compiled as well.
+
+        Args:
+            lines (List[str]): The lines of the JSON script.
+
+        Returns:
+            (Tuple[Dict, ...]): The entries of the schedule.
+        """
+        def compile_schedule(script: List[str]) -> Tuple[Dict, ...]:
+            entries = tuple(json.loads("".join(script)))
+            for entry in entries:
+                ScriptCache.combat_script(entry.get("combat_script") or [])
+            return entries
+
+        return ScriptCache._get("schedule", lines, compile_schedule)
@@ -1,230 +1,453 @@
 import json
 import os
 import sys
-from typing import List, Tuple
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from dictor import dictor
 
 from utils.message_log import MessageLog
 
 
-class Settings:
+class _Field:
+    """
+    A setting that is read from settings.json.
+    """
+
+    __slots__ = ("name", "path", "default", "kind", "is_required", "is_hot", "convert")
+
+    def __init__(self, name: str, path: Union[str, Tuple[str, ...]], default: Any = None, kind: Optional[type] = None, is_required: bool = False, is_hot: bool = False,
+                 convert: Callable[[Any], Any] = None):
+        """Declare the setting.
+
+        Args:
+            name (str): Name of the attribute on Settings.
+            path (Union[str, Tuple[str, ...]]): The dotted path inside settings.json. A tuple of paths reads a list with one value from each.
+            default (Any, optional): Value to use if the path is missing or its value has the wrong type. Defaults to None.
+            kind (type, optional): The type that the value must have. Defaults to None which accepts any value.
+            is_required (bool, optional): Raise an error if the path is missing instead of using the default. Defaults to False.
+            is_hot (bool, optional): Pick up changes to the value while the bot is running. Defaults to False.
+            convert (Callable[[Any], Any], optional): Applied to the value after it was validated. Defaults to None.
+        """
+        self.name = name
+        self.path = path
+        self.default = default
+        self.kind = kind
+        self.is_required = is_required
+        self.is_hot = is_hot
+        self.convert = convert
+
+    def _validate(self, path: str, value: Any) -> Any:
+        """Check the type of the value read from the path.
+
+        Args:
+            path (str): The dotted path inside settings.json.
+            value (Any): The value that was read.
+
+        Returns:
+            (Any): The value or the default if it has the wrong type.
+        """
+        if self.kind is None or value is None and self.default is None:
+            return value
+
+        # Numbers from the frontend can come back as either integers or floats.
+        if self.kind in (int, float) and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value) if self.kind is float else value
+
+        if not isinstance(value, self.kind):
+            MessageLog.print_message(f"[WARNING] Expected {path} in settings.json to be a {self.kind.__name__} but it was {value!r}. Using the default of {self.default!r} instead.")
+            return self.default
+
+        return value
+
+    def read(self, data: Dict[str, Any]) -> Any:
+        """Read the value of the setting.
+
+        Args:
+            data (Dict[str, Any]): The contents of settings.json.
+
+        Returns:
+            (Any): The validated value.
+        """
+        if isinstance(self.path, tuple):
+            value = [self._validate(path, dictor(data, path, self.default)) for path in self.path]
+        else:
+            value = self._validate(self.path, dictor(data, self.path, self.default, checknone = self.is_required))
+
+        if self.convert is not None:
+            value = self.convert(value)
+
+        return value
+
+
+class _Settings:
+    """
+    The settings of the bot. Its single instance is Settings and every setting from settings.json is a slot on it that is filled in on the first access of any of them
+    instead of when the module is imported.
+    """
+
     ######################################################
     # ################## settings.json ###################
-    # Read from settings.json and populate the class variables.
-    try:
-        _file = open(f"{os.getcwd()}/backend/settings.json")
-    except FileNotFoundError:
-        try:
-            _file = open(f"{os.getcwd()}/settings.json")
-        except FileNotFoundError:
-            print("[ERROR] Failed to find settings.json. Exiting now...")
-            sys.exit(1)
-
-    _data = json.load(_file)
-
-    combat_script_name: str = dictor(_data, "game.combatScriptName", "")
-    combat_script: List[str] = dictor(_data, "game.combatScript", [])
-    combat_elapsed_time: float = 0.0
-    farming_mode: str = dictor(_data, "game.farmingMode", checknone = True)
-    item_name: str = dictor(_data, "game.item", checknone = True)
-    map_name: str = dictor(_data, "game.map", checknone = True)
-    mission_name: str = dictor(_data, "game.mission", checknone = True)
-    item_amount_to_farm: int = dictor(_data, "game.itemAmount", 1)
-    item_amount_farmed: int = 0
-    amount_of_runs_finished: int = 0
-    summon_element_list: List[str] = dictor(_data, "game.summonElements", [])
-    summon_list: List[str] = dictor(_data, "game.summons", [])
-    group_number: int = dictor(_data, "game.groupNumber", 1)
-    party_number: int = dictor(_data, "game.partyNumber", 1)
-    debug_mode: bool = dictor(_data, "game.debugMode", False)
-
-    # #### twitter ####
-    twitter_use_version2: bool = dictor(_data, "twitter.twitterUseVersion2", False)
-    twitter_keys_tokens: List[str] = [dictor(_data, "twitter.twitterAPIKey", ""),
-                                      dictor(_data, "twitter.twitterAPIKeySecret", ""),
-                                      dictor(_data, "twitter.twitterAccessToken", ""),
-                                      dictor(_data, "twitter.twitterAccessTokenSecret", "")]
-    twitter_bearer_token: str = dictor(_data, "twitter.twitterBearerToken", "")
-    # #### end of twitter ####
-
-    # #### discord ####
-    enable_discord: bool = dictor(_data, "discord.enableDiscordNotifications", False)
-    discord_token: str = dictor(_data, "discord.discordToken", "")
-    user_id: int = dictor(_data, "discord.discordUserID", "")
-    # #### end of discord ####
-
-    # #### api ####
-    enable_opt_in_api: bool = dictor(_data, "api.enableOptInAPI", False)
-    # #### end of api ####
-
-    # #### configuration ####
-    reduce_delay_seconds: float = dictor(_data, "configuration.reduceDelaySeconds", 0.0)
-    enable_bezier_curve_mouse_movement: bool = dictor(_data, "configuration.enableBezierCurveMouseMovement", True)
-    custom_mouse_speed: float = float(dictor(_data, "configuration.mouseSpeed", 1.5))
-    mouse_smoothness: float = float(dictor(_data, "configuration.mouseSmoothness", 2))
-    enable_delay_between_runs: bool = dictor(_data, "configuration.enableDelayBetweenRuns", False)
-    delay_in_seconds: int = dictor(_data, "configuration.delayBetweenRuns", 15)
-    enable_randomized_delay_between_runs: bool = dictor(_data, "configuration.enableRandomizedDelayBetweenRuns", False)
-    delay_in_seconds_lower_bound: int = dictor(_data, "configuration.delayBetweenRunsLowerBound", 15)
-    delay_in_seconds_upper_bound: int = dictor(_data, "configuration.delayBetweenRunsUpperBound", 60)
-    enable_refresh_during_combat: bool = dictor(_data, "configuration.enableRefreshDuringCombat", True)
-    enable_auto_quick_summon: bool = dictor(_data, "configuration.enableAutoQuickSummon", False)
-    enable_bypass_reset_summon: bool = dictor(_data, "configuration.enableBypassResetSummon", False)
-    static_window: bool = dictor(_data, "configuration.staticWindow", True)
-    enable_mouse_security_attempt_bypass: bool = dictor(_data, "configuration.enableMouseSecurityAttemptBypass", True)
-    # #### end of configuration ####
-
-    # #### nightmare ####
-    enable_nightmare: bool = dictor(_data, "nightmare.enableNightmare", False)
-    _enable_custom_nightmare_settings: bool = dictor(_data, "nightmare.enableCustomNightmareSettings", False)
-    nightmare_combat_script_name: str = dictor(_data, "nightmare.nightmareCombatScriptName", "")
-    nightmare_combat_script: List[str] = dictor(_data, "nightmare.nightmareCombatScript", [])
-    nightmare_summon_list: List[str] = dictor(_data, "nightmare.nightmareSummons", [])
-    nightmare_summon_elements_list: List[str] = dictor(_data, "nightmare.nightmareSummonElements", [])
-    nightmare_group_number: int = dictor(_data, "nightmare.nightmareGroupNumber", 1)
-    nightmare_party_number: int = dictor(_data, "nightmare.nightmarePartyNumber", 1)
+    # Every setting read from settings.json. They are populated as slots of Settings on the first access of any of them.
+    _schema: Tuple[_Field, ...] = (
+        _Field("combat_script_name", "game.combatScriptName", "", kind = str),
+        _Field("combat_script", "game.combatScript", [], kind = list),
+        _Field("farming_mode", "game.farmingMode", kind = str, is_required = True),
+        _Field("item_name", "game.item", kind = str, is_required = True),
+        _Field("map_name", "game.map", kind = str, is_required = True),
+        _Field("mission_name", "game.mission", kind = str, is_required = True),
+        _Field("item_amount_to_farm", "game.itemAmount", 1, kind = int),
+        _Field("summon_element_list", "game.summonElements", [], kind = list),
+        _Field("summon_list", "game.summons", [], kind = list),
+        _Field("group_number", "game.groupNumber", 1, kind = int),
+        _Field("party_number", "game.partyNumber", 1, kind = int),
+        _Field("debug_mode", "game.debugMode", False, kind = bool),
 
-    _farming_modes_with_nightmares = ["Event", "Event (Token Drawboxes)", "Rise of the Beasts"]
+        # #### twitter ####
+        _Field("twitter_use_version2", "twitter.twitterUseVersion2", False, kind = bool),
+        _Field("twitter_keys_tokens", ("twitter.twitterAPIKey", "twitter.twitterAPIKeySecret", "twitter.twitterAccessToken", "twitter.twitterAccessTokenSecret"), "", kind = str),
+        _Field("twitter_bearer_token", "twitter.twitterBearerToken", "", kind = str),
 
-    if enable_nightmare and ((farming_mode == "Special" and mission_name == "VH Angel Halo") or _farming_modes_with_nightmares.__contains__(mission_name)):
-        MessageLog.print_message(f"\n[NIGHTMARE] Initializing settings for {farming_mode}'s Nightmare...")
+        # #### discord ####
+        _Field("enable_discord", "discord.enableDiscordNotifications", False, kind = bool),
+        _Field("discord_token", "discord.discordToken", "", kind = str),
+        _Field("user_id", "discord.discordUserID", "", kind = None),
 
-        if _enable_custom_nightmare_settings:
-            # Start checking for validity and if not, default back to the settings for Farming Mode.
-            if len(nightmare_combat_script) == 0:
-                MessageLog.print_message(f"[NIGHTMARE] Combat Script for {farming_mode}'s Nightmare will reuse the one for Farming Mode.")
-                nightmare_combat_script = combat_script
+        # #### api ####
+        _Field("enable_opt_in_api", "api.enableOptInAPI", False, kind = bool),
 
-            if len(nightmare_summon_list) == 0:
-                MessageLog.print_message(f"[NIGHTMARE] Summons for {farming_mode}'s Nightmare will reuse the ones for Farming Mode.")
-                nightmare_summon_list = summon_list
+        # #### configuration ####
+        _Field("reduce_delay_seconds", "configuration.reduceDelaySeconds", 0.0, kind = float, is_hot = True),
+        _Field("enable_bezier_curve_mouse_movement", "configuration.enableBezierCurveMouseMovement", True, kind = bool),
+        _Field("custom_mouse_speed", "configuration.mouseSpeed", 1.5, kind = float),
+        _Field("mouse_smoothness", "configuration.mouseSmoothness", 2, kind = float),
+        _Field("enable_delay_between_runs", "configuration.enableDelayBetweenRuns", False, kind = bool, is_hot = True),
+        _Field("delay_in_seconds", "configuration.delayBetweenRuns", 15, kind = int, is_hot = True),
+        _Field("enable_randomized_delay_between_runs", "configuration.enableRandomizedDelayBetweenRuns", False, kind = bool, is_hot = True),
+        _Field("delay_in_seconds_lower_bound", "configuration.delayBetweenRunsLowerBound", 15, kind = int, is_hot = True),
+        _Field("delay_in_seconds_upper_bound", "configuration.delayBetweenRunsUpperBound", 60, kind = int, is_hot = True),
+        _Field("enable_refresh_during_combat", "configuration.enableRefreshDuringCombat", True, kind = bool),
+        _Field("enable_auto_quick_summon", "configuration.enableAutoQuickSummon", False, kind = bool),
+        _Field("enable_bypass_reset_summon", "configuration.enableBypassResetSummon", False, kind = bool),
+        _Field("static_window", "configuration.staticWindow", True, kind = bool),
+        _Field("enable_mouse_security_attempt_bypass", "configuration.enableMouseSecurityAttemptBypass", True, kind = bool),
+        _Field("log_json_path", "configuration.logJsonPath", "", kind = str),
 
-            if len(nightmare_summon_elements_list) == 0:
-                MessageLog.print_message(f"[NIGHTMARE] Summon Elements for {farming_mode}'s Nightmare will reuse the ones for Farming Mode.")
-                nightmare_summon_elements_list = summon_element_list
+        # #### nightmare ####
+        _Field("enable_nightmare", "nightmare.enableNightmare", False, kind = bool),
+        _Field("_enable_custom_nightmare_settings", "nightmare.enableCustomNightmareSettings", False, kind = bool),
+        _Field("nightmare_combat_script_name", "nightmare.nightmareCombatScriptName", "", kind = str),
+        _Field("nightmare_combat_script", "nightmare.nightmareCombatScript", [], kind = list),
+        _Field("nightmare_summon_list", "nightmare.nightmareSummons", [], kind = list),
+        _Field("nightmare_summon_elements_list", "nightmare.nightmareSummonElements", [], kind = list),
+        _Field("nightmare_group_number", "nightmare.nightmareGroupNumber", 1, kind = int),
+        _Field("nightmare_party_number", "nightmare.nightmarePartyNumber", 1, kind = int),
 
-            if nightmare_group_number < 1 or nightmare_group_number > 7:
-                MessageLog.print_message(f"[NIGHTMARE] Group Number for {farming_mode}'s Nightmare will reuse the one for Farming Mode.")
-                nightmare_group_number = group_number
+        # #### sandbox defender ####
+        _Field("enable_defender", "sandbox.enableDefender", False, kind = bool),
+        _Field("enable_herald", "sandbox.enableHerald", False, kind = bool),
+        _Field("enable_gold_chest", "sandbox.enableGoldChest", False, kind = bool),
+        _Field("_enable_custom_defender_settings", "sandbox.enableCustomDefenderSettings", False, kind = bool),
+        _Field("defender_combat_script_name", "sandbox.defenderCombatScriptName", "", kind = str),
+        _Field("defender_combat_script", "sandbox.defenderCombatScript", [], kind = list),
+        _Field("number_of_defenders", "sandbox.numberOfDefenders", 1, kind = int),
+        _Field("number_of_heralds", "sandbox.numberOfHeralds", 1, kind = int),
+        _Field("defender_group_number", "sandbox.defenderGroupNumber", 1, kind = int),
+        _Field("defender_party_number", "sandbox.defenderPartyNumber", 1, kind = int),
+        _Field("herald_group_number", "sandbox.heraldGroupNumber", 1, kind = int),
+        _Field("herald_party_number", "sandbox.heraldPartyNumber", 1, kind = int),
 
-            if nightmare_party_number < 1 or nightmare_party_number > 6:
-                MessageLog.print_message(f"[NIGHTMARE] Party Number for {farming_mode}'s Nightmare will reuse the one for Farming Mode.")
-                nightmare_party_number = party_number
-        else:
-            MessageLog.print_message(f"[NIGHTMARE] Reusing settings from Farming Mode for Nightmare...")
-            nightmare_combat_script = combat_script
-            nightmare_summon_list = summon_list
-            nightmare_summon_elements_list = summon_element_list
-            nightmare_group_number = group_number
-            nightmare_party_number = party_number
-
-        MessageLog.print_message(f"[NIGHTMARE] Settings initialized for {farming_mode}'s Nightmare...")
-    # #### end of nightmare ####
-
-    # #### sandbox defender #### #
-    enable_defender: bool = dictor(_data, "sandbox.enableDefender", False)
-    enable_herald: bool = dictor(_data, "sandbox.enableHerald", False)
-    enable_gold_chest: bool = dictor(_data, "sandbox.enableGoldChest", False)
-    _enable_custom_defender_settings: bool = dictor(_data, "sandbox.enableCustomDefenderSettings", False)
-    defender_combat_script_name: str = dictor(_data, "sandbox.defenderCombatScriptName", "")
-    defender_combat_script: List[str] = dictor(_data, "sandbox.defenderCombatScript", [])
-    number_of_defenders: int = dictor(_data, "sandbox.numberOfDefenders", 1)
-    number_of_heralds: int = dictor(_data, "sandbox.numberOfHeralds",1)
-    defender_group_number: int = dictor(_data, "sandbox.defenderGroupNumber", 1)
-    defender_party_number: int = dictor(_data, "sandbox.defenderPartyNumber", 1)
-    herald_group_number: int = dictor(_data, "sandbox.heraldGroupNumber", 1)
-    herald_party_number: int = dictor(_data, "sandbox.heraldPartyNumber", 1)
-    number_of_defeated_defenders: int = 0
-    number_of_defeated_heralds: int = 0
-    engaged_defender_battle: bool = False
-    engaged_herald_battle: bool = False
-    # #### end of sandbox defender #### #
-
-    # #### raid ####
-    enable_auto_exit_raid: bool = dictor(_data, "raid.enableAutoExitRaid", False)
-    time_allowed_until_auto_exit_raid: int = dictor(_data, "raid.timeAllowedUntilAutoExitRaid", 10) * 60
-    enable_no_timeout: bool = dictor(_data, "raid.enableNoTimeout", False)
-    # #### end of raid ####
-
-    # #### event ####
-    event_enable_new_position: bool = dictor(_data, "event.enableNewPosition", False)
-    event_new_position: int = dictor(_data, "event.newPosition", 0)
-    enable_event_location_incrementation_by_one: bool = dictor(_data, "event.enableLocationIncrementByOne", False)
-    enable_select_bottom_category: bool = dictor(_data, "event.selectBottomCategory", False)
-    # #### end of event ####
-
-    # #### arcarum ####
-    enable_stop_on_arcarum_boss: bool = dictor(_data, "arcarum.enableStopOnArcarumBoss", True)
-    # #### end of arcarum ####
-
-    # #### generic ####
-    enable_force_reload: bool = dictor(_data, "generic.enableForceReload", False)
-    # #### end of generic ####
-
-    # #### proving grounds ####
-    proving_grounds_enable_new_position: bool = dictor(_data, "provingGrounds.enableNewPosition", False)
-    proving_grounds_new_position: int = dictor(_data, "provingGrounds.newPosition", 0)
-    # #### end of proving grounds ####
-
-    # #### guild wars ####
-    guild_wars_enable_new_position: bool = dictor(_data, "guildWars.enableNewPosition", False)
-    guild_wars_new_position: int = dictor(_data, "guildWars.newPosition", 0)
-    # #### end of guild wars ####
-
-    # #### rotb ####
-    rotb_enable_new_position: bool = dictor(_data, "rotb.enableNewPosition", False)
-    rotb_new_position: int = dictor(_data, "rotb.newPosition", 0)
-    # #### end of rotb ####
-
-    # #### adjustment ####
-    enable_calibration_adjustment: bool = dictor(_data, "adjustment.enableCalibrationAdjustment", False)
-    adjust_calibration: int = dictor(_data, "adjustment.adjustCalibration", 5)
-    enable_general_adjustment: bool = dictor(_data, "adjustment.enableGeneralAdjustment", False)
-    adjust_button_search_general: int = dictor(_data, "adjustment.adjustButtonSearchGeneral", 5)
-    adjust_header_search_general: int = dictor(_data, "adjustment.adjustHeaderSearchGeneral", 5)
-    enable_pending_battles_adjustment: bool = dictor(_data, "adjustment.enableForceReload", False)
-    adjust_before_pending_battle: int = dictor(_data, "adjustment.adjustBeforePendingBattle", 1)
-    adjust_pending_battle: int = dictor(_data, "adjustment.adjustPendingBattle", 2)
-    enable_captcha_adjustment: bool = dictor(_data, "adjustment.enableCaptchaAdjustment", False)
-    adjust_captcha: int = dictor(_data, "adjustment.adjustCaptcha", 5)
-    enable_support_summon_selection_screen_adjustment: bool = dictor(_data, "adjustment.enableSupportSummonSelectionScreenAdjustment", False)
-    adjust_support_summon_selection_screen: int = dictor(_data, "adjustment.adjustSupportSummonSelectionScreen", 30)
-    enable_combat_mode_adjustment: bool = dictor(_data, "adjustment.enableCombatModeAdjustment", False)
-    adjust_combat_start: int = dictor(_data, "adjustment.adjustCombatStart", 50)
-    adjust_dialog: int = dictor(_data, "adjustment.adjustDialog", 2)
-    adjust_skill_usage: int = dictor(_data, "adjustment.adjustSkillUsage", 5)
-    adjust_summon_usage: int = dictor(_data, "adjustment.adjustSummonUsage", 5)
-    adjust_waiting_for_reload: int = dictor(_data, "adjustment.adjustWaitingForReload", 3)
-    adjust_waiting_for_attack: int = dictor(_data, "adjustment.adjustWaitingForAttack", 100)
-    adjust_check_for_no_loot_screen: int = dictor(_data, "adjustment.adjustCheckForNoLootScreen", 1)
-    adjust_check_for_battle_concluded_popup: int = dictor(_data, "adjustment.adjustCheckForBattleConcludedPopup", 1)
-    adjust_check_for_exp_gained_popup: int = dictor(_data, "adjustment.adjustCheckForExpGainedPopup", 1)
-    adjust_check_for_loot_collection_screen: int = dictor(_data, "adjustment.adjustCheckForLootCollectionScreen", 1)
-    enable_arcarum_adjustment: bool = dictor(_data, "adjustment.enableArcarumAdjustment", False)
-    adjust_arcarum_action: int = dictor(_data, "adjustment.adjustArcarumAction", 3)
-    adjust_arcarum_stage_effect: int = dictor(_data, "adjustment.adjustArcarumStageEffect", 10)
-    # #### end of adjustment ####
-
-    # #### device ####
-    use_first_notch: bool = dictor(_data, "device.useFirstNotch", False)
-    confidence: float = dictor(_data, "device.confidence", 0.8)
-    confidence_all: float = dictor(_data, "device.confidenceAll", 0.8)
-    custom_scale: float = dictor(_data, "device.customScale", 1.0)
-    enable_test_for_home_screen = dictor(_data, "device.enableTestForHomeScreen", False)
-    # #### end of device ####
+        # #### raid ####
+        _Field("enable_auto_exit_raid", "raid.enableAutoExitRaid", False, kind = bool),
+        _Field("time_allowed_until_auto_exit_raid", "raid.timeAllowedUntilAutoExitRaid", 10, kind = int, convert = lambda minutes: minutes * 60),
+        _Field("enable_no_timeout", "raid.enableNoTimeout", False, kind = bool),
+
+        # #### event ####
+        _Field("event_enable_new_position", "event.enableNewPosition", False, kind = bool),
+        _Field("event_new_position", "event.newPosition", 0, kind = int),
+        _Field("enable_event_location_incrementation_by_one", "event.enableLocationIncrementByOne", False, kind = bool),
+        _Field("enable_select_bottom_category", "event.selectBottomCategory", False, kind = bool),
+
+        # #### arcarum ####
+        _Field("enable_stop_on_arcarum_boss", "arcarum.enableStopOnArcarumBoss", True, kind = bool),
+
+        # #### generic ####
+        _Field("enable_force_reload", "generic.enableForceReload", False, kind = bool),
+
+        # #### proving grounds ####
+        _Field("proving_grounds_enable_new_position", "provingGrounds.enableNewPosition", False, kind = bool),
+        _Field("proving_grounds_new_position", "provingGrounds.newPosition", 0, kind = int),
+
+        # #### guild wars ####
+        _Field("guild_wars_enable_new_position", "guildWars.enableNewPosition", False, kind = bool),
+        _Field("guild_wars_new_position", "guildWars.newPosition", 0, kind = int),
+
+        # #### rotb ####
+        _Field("rotb_enable_new_position", "rotb.enableNewPosition", False, kind = bool),
+        _Field("rotb_new_position", "rotb.newPosition", 0, kind = int),
+
+        # #### adjustment ####
+        _Field("enable_calibration_adjustment", "adjustment.enableCalibrationAdjustment", False, kind = bool, is_hot = True),
+        _Field("adjust_calibration", "adjustment.adjustCalibration", 5, kind = int, is_hot = True),
+        _Field("enable_general_adjustment", "adjustment.enableGeneralAdjustment", False, kind = bool, is_hot = True),
+        _Field("adjust_button_search_general", "adjustment.adjustButtonSearchGeneral", 5, kind = int, is_hot = True),
+        _Field("adjust_header_search_general", "adjustment.adjustHeaderSearchGeneral", 5, kind = int, is_hot = True),
+        _Field("enable_pending_battles_adjustment", "adjustment.enableForceReload", False, kind = bool, is_hot = True),
+        _Field("adjust_before_pending_battle", "adjustment.adjustBeforePendingBattle", 1, kind = int, is_hot = True),
+        _Field("adjust_pending_battle", "adjustment.adjustPendingBattle", 2, kind = int, is_hot = True),
+        _Field("enable_captcha_adjustment", "adjustment.enableCaptchaAdjustment", False, kind = bool, is_hot = True),
+        _Field("adjust_captcha", "adjustment.adjustCaptcha", 5, kind = int, is_hot = True),
+        _Field("enable_support_summon_selection_screen_adjustment", "adjustment.enableSupportSummonSelectionScreenAdjustment", False, kind = bool, is_hot = True),
+        _Field("adjust_support_summon_selection_screen", "adjustment.adjustSupportSummonSelectionScreen", 30, kind = int, is_hot = True),
+        _Field("enable_combat_mode_adjustment", "adjustment.enableCombatModeAdjustment", False, kind = bool, is_hot = True),
+        _Field("adjust_combat_start", "adjustment.adjustCombatStart", 50, kind = int, is_hot = True),
+        _Field("adjust_dialog", "adjustment.adjustDialog", 2, kind = int, is_hot = True),
+        _Field("adjust_skill_usage", "adjustment.adjustSkillUsage", 5, kind = int, is_hot = True),
+        _Field("adjust_summon_usage", "adjustment.adjustSummonUsage", 5, kind = int, is_hot = True),
+        _Field("adjust_waiting_for_reload", "adjustment.adjustWaitingForReload", 3, kind = int, is_hot = True),
+        _Field("adjust_waiting_for_attack", "adjustment.adjustWaitingForAttack", 100, kind = int, is_hot = True),
+        _Field("adjust_check_for_no_loot_screen", "adjustment.adjustCheckForNoLootScreen", 1, kind = int, is_hot = True),
+        _Field("adjust_check_for_battle_concluded_popup", "adjustment.adjustCheckForBattleConcludedPopup", 1, kind = int, is_hot = True),
+        _Field("adjust_check_for_exp_gained_popup", "adjustment.adjustCheckForExpGainedPopup", 1, kind = int, is_hot = True),
+        _Field("adjust_check_for_loot_collection_screen", "adjustment.adjustCheckForLootCollectionScreen", 1, kind = int, is_hot = True),
+        _Field("enable_arcarum_adjustment", "adjustment.enableArcarumAdjustment", False, kind = bool, is_hot = True),
+        _Field("adjust_arcarum_action", "adjustment.adjustArcarumAction", 3, kind = int, is_hot = True),
+        _Field("adjust_arcarum_stage_effect", "adjustment.adjustArcarumStageEffect", 10, kind = int, is_hot = True),
+
+        # #### device ####
+        _Field("use_first_notch", "device.useFirstNotch", False, kind = bool),
+        _Field("confidence", "device.confidence", 0.8, kind = float),
+        _Field("confidence_all", "device.confidenceAll", 0.8, kind = float),
+        _Field("custom_scale", "device.customScale", 1.0, kind = float),
+        _Field("enable_test_for_home_screen", "device.enableTestForHomeScreen", False, kind = bool),
+        _Field("enable_template_preload", "device.enableTemplatePreload", True, kind = bool),
+        _Field("template_cache_budget", "device.templateCacheBudget", 256, kind = float),
+        _Field("wait_fps", "device.waitFps", 10, kind = float),
+        _Field("enable_scale_profile", "device.enableScaleProfile", True, kind = bool),
+        _Field("browser_zoom", "device.browserZoom", 100, kind = int),
+        _Field("capture_backend", "device.captureBackend", "auto", kind = str),
+        _Field("input_backend", "device.inputBackend", "auto", kind = str),
+        _Field("capture_buffer_size", "device.captureBufferSize", 4, kind = int),
+        _Field("frame_cache_ttl", "device.frameCacheTtl", 75, kind = float),
+        _Field("enable_easyocr_fallback", "device.enableEasyOcrFallback", False, kind = bool),
+        _Field("enable_settle_detection", "device.enableSettleDetection", True, kind = bool),
+        _Field("settle_stable_time", "device.settleStableTime", 150, kind = float),
+    )
+
+    _field_names = frozenset(field.name for field in _schema)
+    _lock = threading.RLock()
+    _stop_watching = threading.Event()
+
+    _farming_modes_with_nightmares = ["Event", "Event (Token Drawboxes)", "Rise of the Beasts"]
 
     # ################## end of settings.json ###################
     #############################################################
 
-    # ################## Window Dimensions ###################
-    window_left: int = None
-    window_top: int = None
-    window_width: int = None
-    window_height: int = None
-    home_button_location: Tuple[int, int] = None
-    calibration_complete: bool = False
-    additional_calibration_required: bool = False
-    party_selection_first_run: bool = False
-    no_party_selection: bool = False
-    # ################## end of Window Dimensions ###################
+    __slots__ = tuple(field.name for field in _schema) + (
+        "_settings_path", "_settings_mtime", "_is_loaded", "_watcher",
+        "combat_elapsed_time", "item_amount_farmed", "amount_of_runs_finished",
+        "number_of_defeated_defenders", "number_of_defeated_heralds", "engaged_defender_battle", "engaged_herald_battle",
+        "window_left", "window_top", "window_width", "window_height", "home_button_location", "calibration_complete", "additional_calibration_required",
+        "party_selection_first_run", "no_party_selection",
+    )
+
+    def __init__(self):
+        self._settings_path: str = None
+        self._settings_mtime: float = None
+        self._is_loaded: bool = False
+        self._watcher: threading.Thread = None
+
+        self.combat_elapsed_time: float = 0.0
+        self.item_amount_farmed: int = 0
+        self.amount_of_runs_finished: int = 0
+
+        # #### sandbox defender #### #
+        self.number_of_defeated_defenders: int = 0
+        self.number_of_defeated_heralds: int = 0
+        self.engaged_defender_battle: bool = False
+        self.engaged_herald_battle: bool = False
+        # #### end of sandbox defender #### #
+
+        # ################## Window Dimensions ###################
+        self.window_left: int = None
+        self.window_top: int = None
+        self.window_width: int = None
+        self.window_height: int = None
+        self.home_button_location: Tuple[int, int] = None
+        self.calibration_complete: bool = False
+        self.additional_calibration_required: bool = False
+        self.party_selection_first_run: bool = False
+        self.no_party_selection: bool = False
+        # ################## end of Window Dimensions ###################
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for slots that are not filled in yet, which is every setting from settings.json until the first one is accessed.
+        if name.startswith("__") or name not in _Settings._field_names or self._is_loaded:
+            raise AttributeError(f"'Settings' object has no attribute '{name}'")
+
+        self.load()
+        return object.__getattribute__(self, name)
+
+    @staticmethod
+    def _find_settings_path() -> str:
+        """Find settings.json in either the /backend/ folder or the current folder.
+
+        Returns:
+            (str): The file path of settings.json.
+        """
+        for settings_path in [f"{os.getcwd()}/backend/settings.json", f"{os.getcwd()}/settings.json"]:
+            if os.path.exists(settings_path):
+                return settings_path
+
+        print("[ERROR] Failed to find settings.json. Exiting now...")
+        sys.exit(1)
+
+    @staticmethod
+    def _read() -> Dict[str, Any]:
+        """Read settings.json and remember when it was last modified.
+
+        Returns:
+            (Dict[str, Any]): The contents of settings.json.
+        """
+        Settings._settings_mtime = os.stat(Settings._settings_path).st_mtime
+        with open(Settings._settings_path) as file:
+            return json.load(file)
+
+    @staticmethod
+    def load():
+        """Read settings.json, populate every setting and validate the Nightmare settings. Only the first call does anything.
+
+        Returns:
+            None
+        """
+        with Settings._lock:
+            if Settings._is_loaded:
+                return None
+
+            Settings._settings_path = Settings._find_settings_path()
+            data = Settings._read()
+            for field in Settings._schema:
+                setattr(Settings, field.name, field.read(data))
+
+            Settings._is_loaded = True
+            Settings._validate_nightmare()
+
+        return None
+
+    @staticmethod
+    def _validate_nightmare():
+        """Fall back to the settings for Farming Mode for any Nightmare setting that is not valid.
+
+        Returns:
+            None
+        """
+        farming_mode = Settings.farming_mode
+        if Settings.enable_nightmare and ((farming_mode == "Special" and Settings.mission_name == "VH Angel Halo") or Settings._farming_modes_with_nightmares.__contains__(Settings.mission_name)):
+            MessageLog.print_message(f"\n[NIGHTMARE] Initializing settings for {farming_mode}'s Nightmare...")
+
+            if Settings._enable_custom_nightmare_settings:
+                # Start checking for validity and if not, default back to the settings for Farming Mode.
+                if len(Settings.nightmare_combat_script) == 0:
+                    MessageLog.print_message(f"[NIGHTMARE] Combat Script for {farming_mode}'s Nightmare will reuse the one for Farming Mode.")
+                    Settings.nightmare_combat_script = Settings.combat_script
+
+                if len(Settings.nightmare_summon_list) == 0:
+                    MessageLog.print_message(f"[NIGHTMARE] Summons for {farming_mode}'s Nightmare will reuse the ones for Farming Mode.")
+                    Settings.nightmare_summon_list = Settings.summon_list
+
+                if len(Settings.nightmare_summon_elements_list) == 0:
+                    MessageLog.print_message(f"[NIGHTMARE] Summon Elements for {farming_mode}'s Nightmare will reuse the ones for Farming Mode.")
+                    Settings.nightmare_summon_elements_list = Settings.summon_element_list
+
+                if Settings.nightmare_group_number < 1 or Settings.nightmare_group_number > 7:
+                    MessageLog.print_message(f"[NIGHTMARE] Group Number for {farming_mode}'s Nightmare will reuse the one for Farming Mode.")
+                    Settings.nightmare_group_number = Settings.group_number
+
+                if Settings.nightmare_party_number < 1 or Settings.nightmare_party_number > 6:
+                    MessageLog.print_message(f"[NIGHTMARE] Party Number for {farming_mode}'s Nightmare will reuse the one for Farming Mode.")
+                    Settings.nightmare_party_number = Settings.party_number
+            else:
+                MessageLog.print_message(f"[NIGHTMARE] Reusing settings from Farming Mode for Nightmare...")
+                Settings.nightmare_combat_script = Settings.combat_script
+                Settings.nightmare_summon_list = Settings.summon_list
+                Settings.nightmare_summon_elements_list = Settings.summon_element_list
+                Settings.nightmare_group_number = Settings.group_number
+                Settings.nightmare_party_number = Settings.party_number
+
+            MessageLog.print_message(f"[NIGHTMARE] Settings initialized for {farming_mode}'s Nightmare...")
+
+        return None
+
+    @staticmethod
+    def reload_if_changed() -> List[str]:
+        """Re-read settings.json if it was modified since it was last read and apply the new values of the delays and adjustments.
+
+        The other settings are left alone as the bot has already acted on them.
+
+        Returns:
+            (List[str]): The names of the settings that changed.
+        """
+        with Settings._lock:
+            if not Settings._is_loaded:
+                Settings.load()
+                return []
+
+            try:
+                if os.stat(Settings._settings_path).st_mtime == Settings._settings_mtime:
+                    return []
+                data = Settings._read()
+            except (OSError, ValueError):
+                # The frontend could be in the middle of writing the file so try again on the next check.
+                return []
+
+            changed_names = []
+            for field in Settings._schema:
+                if field.is_hot:
+                    value = field.read(data)
+                    if value != getattr(Settings, field.name):
+                        setattr(Settings, field.name, value)
+                        changed_names.append(field.name)
+
+        if len(changed_names) != 0:
+            MessageLog.print_message(f"[INFO] Reloaded settings.json with new values for: {', '.join(changed_names)}")
+
+        return changed_names
+
+    @staticmethod
+    def start_watching(interval: float = 2.0):
+        """Start checking settings.json for changes on a background thread so that delays and adjustments can be changed without restarting the bot.
+
+        Args:
+            interval (float, optional): Seconds between checks. Defaults to 2.0.
+
+        Returns:
+            None
+        """
+        if Settings._watcher is not None and Settings._watcher.is_alive():
+            return None
+
+        def watch():
+            while not Settings._stop_watching.wait(interval):
+                Settings.reload_if_changed()
+
+        Settings._stop_watching.clear()
+        Settings._watcher = threading.Thread(target = watch, name = "settings-watcher", daemon = True)
+        Settings._watcher.start()
+        return None
+
+    @staticmethod
+    def stop_watching():
+        """Stop checking settings.json for changes.
+
+        Returns:
+            None
+        """
+        Settings._stop_watching.set()
+        if Settings._watcher is not None:
+            Settings._watcher.join(timeout = 5)
+            Settings._watcher = None
+
+        return None
+
+
+Settings = _Settings()
@@ -0,0 +1,140 @@
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+from utils.capture import Capture
+
+
+class SettleDetector:
+    """
+    Waits after a click until the game window has reacted to it and stopped changing, instead of always waiting a fixed amount of time.
+
+    A baseline frame is grabbed right before the click. After the click, frames are compared against the baseline until enough pixels changed and then against each other
+    until they stay the same for device.settleStableTime milliseconds. The fixed wait that was used before is kept as the upper bound, so clicks that do not visibly change
+    anything wait exactly as long as they used to.
+    """
+
+    # Frames are compared at this fraction of their size to keep each comparison cheap.
+    _step: int = 4
+
+    # A pixel changed if its gray level moved by more than this and the frame changed if more than this fraction of its pixels did.
+    _pixel_threshold: int = 24
+    _change_ratio: float = 0.002
+
+    # Seconds between grabbed frames.
+    _poll_interval: float = 0.03
+
+    # The latency in seconds of the last clicks on each button and whether the upper bound was reached.
+    _stats: Dict[str, Deque[Tuple[float, bool]]] = {}
+    _stats_size: int = 200
+
+    @staticmethod
+    def _grab() -> numpy.ndarray:
+        """Grab a downscaled grayscale frame of the game window.
+
+        Returns:
+            (numpy.ndarray): The frame.
+        """
+        from utils.image_utils import ImageUtils
+        frame = Capture.grab_gray(region = ImageUtils._get_window_region(), use_cache = False)
+        return frame[::SettleDetector._step, ::SettleDetector._step]
+
+    @staticmethod
+    def _has_changed(frame: numpy.ndarray, other: numpy.ndarray) -> bool:
+        """Check if enough pixels changed between the two frames.
+
+        Args:
+            frame (numpy.ndarray): The frame.
+            other (numpy.ndarray): The frame to compare with.
+
+        Returns:
+            (bool): True if the frames differ.
+        """
+        if frame.shape != other.shape:
+            return True
+
+        changed = numpy.abs(frame.astype(numpy.int16) - other.astype(numpy.int16)) > SettleDetector._pixel_threshold
+        return numpy.count_nonzero(changed) > changed.size * SettleDetector._change_ratio
+
+    @staticmethod
+    def capture_baseline() -> Optional[numpy.ndarray]:
+        """Grab the frame to compare against right before clicking.
+
+        Returns:
+            (numpy.ndarray): The baseline frame or None if settle detection is disabled.
+        """
+        if not Settings.enable_settle_detection:
+            return None
+
+        return SettleDetector._grab()
+
+    @staticmethod
+    def wait(image_name: str, baseline: Optional[numpy.ndarray], max_wait: float) -> float:
+        """Wait until the game window reacted to the click and settled down.
+
+        Args:
+            image_name (str): Name of the clicked button for the statistics.
+            baseline (numpy.ndarray, optional): The frame grabbed right before the click. None falls back to sleeping for max_wait.
+            max_wait (float): The most seconds to wait.
+
+        Returns:
+            (float): Seconds waited.
+        """
+        if baseline is None:
+            time.sleep(max_wait)
+            return max_wait
+
+        stable_time = Settings.settle_stable_time / 1000
+        start_time = time.perf_counter()
+        deadline = start_time + max_wait
+
+        has_reacted = False
+        stable_since = None
+        previous = baseline
+        is_settled = False
+        while time.perf_counter() < deadline:
+            time.sleep(min(SettleDetector._poll_interval, max(0.0, deadline - time.perf_counter())))
+            frame = SettleDetector._grab()
+            now = time.perf_counter()
+
+            if not has_reacted:
+                has_reacted = SettleDetector._has_changed(frame, baseline)
+                stable_since = now
+            elif SettleDetector._has_changed(frame, previous):
+                stable_since = now
+            elif now - stable_since >= stable_time:
+                is_settled = True
+                break
+
+            previous = frame
+
+        elapsed = time.perf_counter() - start_time
+        SettleDetector._stats.setdefault(image_name, deque(maxlen = SettleDetector._stats_size)).append((elapsed, not is_settled))
+
+        if Settings.debug_mode:
+            MessageLog.print_message(f"[DEBUG] Settled after clicking {image_name.upper()} in {elapsed:.3f} seconds{'' if is_settled else ' by reaching the upper bound'}.")
+
+        return elapsed
+
+    @staticmethod
+    def log_summary():
+        """Print the settle latencies of every clicked button to help tune the waits.
+
+        Returns:
+            None
+        """
+        if len(SettleDetector._stats) == 0:
+            return None
+
+        MessageLog.print_message("\n[INFO] Settle latencies after clicking each button:")
+        for image_name, stats in sorted(SettleDetector._stats.items()):
+            latencies = numpy.array([latency for latency, _ in stats])
+            timeouts = sum(1 for _, is_timeout in stats if is_timeout)
+            MessageLog.print_message(f"[INFO] {image_name.upper()}: {len(latencies)} clicks, median {numpy.median(latencies):.3f}s, 90th percentile {numpy.percentile(latencies, 90):.3f}s, "
+                                     f"{timeouts} reached the upper bound")
+
+        return None
@@ -0,0 +1,157 @@
+import os
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy
+
+from utils.settings import Settings
+from utils.message_log import MessageLog
+
+
+class TemplateCache:
+    """
+    Keeps decoded and rescaled grayscale template arrays in memory so that template matching does not read and decode the same image files on every try.
+    """
+
+    # The folders inside /images/ that get preloaded on startup.
+    _folders: List[str] = ["buttons", "headers", "items", "summons"]
+
+    # Least recently used entries are at the front and get evicted first once the memory budget is exceeded.
+    _cache: "OrderedDict[Tuple[str, float], numpy.ndarray]" = OrderedDict()
+    _memory_used: int = 0
+    # The memory budget in bytes which is read from the settings on first use.
+    _memory_budget: int = None
+
+    hits: int = 0
+    misses: int = 0
+
+    @staticmethod
+    def _get_memory_budget() -> int:
+        """Get the memory budget of the cache.
+
+        Returns:
+            (int): The memory budget in bytes.
+        """
+        if TemplateCache._memory_budget is None:
+            TemplateCache._memory_budget = int(Settings.template_cache_budget * 1024 * 1024)
+        return TemplateCache._memory_budget
+
+    @staticmethod
+    def _make_key(image_path: str, scale: float) -> Tuple[str, float]:
+        """Create the cache key for the template and scale. The scale is rounded to avoid floating point noise from the scale ladder.
+
+        Args:
+            image_path (str): The file path of the template image.
+            scale (float): The factor the template is scaled by.
+
+        Returns:
+            (Tuple[str, float]): The cache key.
+        """
+        return os.path.normpath(image_path), round(scale, 4)
+
+    @staticmethod
+    def _insert(key: Tuple[str, float], template: numpy.ndarray):
+        """Insert the template into the cache and evict the least recently used templates until it fits inside the memory budget.
+
+        Args:
+            key (Tuple[str, float]): The cache key.
+            template (numpy.ndarray): The grayscale template array.
+
+        Returns:
+            None
+        """
+        TemplateCache._cache[key] = template
+        TemplateCache._memory_used += template.nbytes
+
+        while TemplateCache._memory_used > TemplateCache._get_memory_budget() and len(TemplateCache._cache) > 1:
+            evicted_key, evicted = TemplateCache._cache.popitem(last = False)
+            TemplateCache._memory_used -= evicted.nbytes
+            if Settings.debug_mode:
+                MessageLog.print_message(f"[DEBUG] Evicted {evicted_key} from the template cache.")
+
+        return None
+
+    @staticmethod
+    def get(image_path: str, scale: float = 1.0) -> Optional[numpy.ndarray]:
+        """Get the grayscale template array at the given scale, loading it from disk if it is not in memory yet.
+
+        Args:
+            image_path (str): The file path of the template image.
+            scale (float, optional): The factor to scale the template by. Defaults to 1.0.
+
+        Returns:
+            (numpy.ndarray): The grayscale template array or None if the image could not be read.
+        """
+        key = TemplateCache._make_key(image_path, scale)
+        template = TemplateCache._cache.get(key)
+        if template is not None:
+            TemplateCache._cache.move_to_end(key)
+            TemplateCache.hits += 1
+            return template
+
+        TemplateCache.misses += 1
+
+        # Rescaled templates are derived from the original template instead of decoding the image file again.
+        if key[1] != 1.0:
+            original = TemplateCache.get(image_path, 1.0)
+            if original is None:
+                return None
+
+            height, width = original.shape[:2]
+            template = cv2.resize(original, (int(width * scale), int(height * scale)), interpolation = cv2.INTER_CUBIC)
+        else:
+            template = cv2.imread(image_path, 0)
+            if template is None:
+                return None
+
+        # Prevent accidental modifications to the shared array.
+        template.setflags(write = False)
+        TemplateCache._insert(key, template)
+        return template
+
+    @staticmethod
+    def preload(scales: List[float]):
+        """Load every template inside the image folders into memory for each of the given scales until the memory budget is reached.
+
+        Args:
+            scales (List[float]): The scales to preload each template at.
+
+        Returns:
+            None
+        """
+        MessageLog.print_message(f"\n[INFO] Preloading templates into memory using scales: {[round(scale, 2) for scale in scales]}...")
+        start_time = time.time()
+        loaded = 0
+
+        for folder_name in TemplateCache._folders:
+            folder = f"{os.getcwd()}/images/{folder_name}"
+            if not os.path.exists(folder):
+                continue
+
+            for file_name in sorted(os.listdir(folder)):
+                if not file_name.endswith(".jpg"):
+                    continue
+
+                for scale in scales:
+                    if TemplateCache.get(f"{folder}/{file_name}", scale) is not None:
+                        loaded += 1
+
+                    if TemplateCache._memory_used >= TemplateCache._get_memory_budget():
+                        MessageLog.print_message(f"[WARNING] Template cache reached its memory budget of {Settings.template_cache_budget} MB. Remaining templates will be loaded lazily.")
+                        return None
+
+        MessageLog.print_message(f"[INFO] Preloaded {loaded} templates ({TemplateCache._memory_used / (1024 * 1024):.2f} MB) in {time.time() - start_time:.2f} seconds.")
+        return None
+
+    @staticmethod
+    def clear():
+        """Remove every template from the cache.
+
+        Returns:
+            None
+        """
+        TemplateCache._cache.clear()
+        TemplateCache._memory_used = 0
+        return None
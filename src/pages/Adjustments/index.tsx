@@ -296,7 +296,7 @@ const Adjustments = () => {
                                     onChange={(value) => bsc.setSettings({ ...bsc.settings, adjustment: { ...bsc.settings.adjustment, adjustWaitingForAttack: value } })}
                                     min={1}
                                     max={999}
-                                    description="Set the default number of tries for checking when an attack is finished after the Attack button is pressed."
+                                    description="Set the default number of seconds for checking when an attack is finished after the Attack button is pressed."
                                 />
                             </Grid.Col>
                             <Grid.Col span={6}>